@@ -5,19 +5,91 @@ DIAGRAMA DO ECOSSISTEMA INVISTTO
 Visualização interativa de todos os projetos ativos e seus relacionamentos.
 
 Execução:
-    python3 DIAGRAMA-ECOSSISTEMA.py
+    python3 DIAGRAMA-ECOSSISTEMA.py [--html [DESTINO]] [--png [DESTINO]]
+        [--json [DESTINO]] [--columnar [DIRETORIO]] [--summary] [--out-dir DIR]
+        [--no-open] [--force]
 
-Dependências:
-    pip install matplotlib networkx
+    Sem seletores, gera todos os artefatos e imprime o resumo. Cada seletor
+    carrega só o que precisa: matplotlib/numpy apenas com --png.
+
+    Grafos grandes: --large-graph on|off|auto (padrão auto, acima de
+    LIMIAR_GRAFO_GRANDE nós) gera a página em canvas com grupos por tipo.
+
+    Headless (CI, lotes): --out-dir troca o diretório de saída e --no-open
+    não abre o navegador. DESTINO '-' manda o artefato para o stdout, ex.:
+        python3 DIAGRAMA-ECOSSISTEMA.py --json - --no-open | jq keys
+
+    Artefatos cujas entradas (PROJETOS, templates, versão do gerador) não
+    mudaram são pulados; --force regera tudo.
+
+    Análise do grafo (ecossistema.analise): raio de impacto, ciclos,
+    pontos únicos de falha e intermediação de cada projeto vão para o JSON
+    ("analise" em cada projeto), para o tooltip do HTML e para o resumo.
+
+    PROJETOS é validado inteiro antes de gerar qualquer artefato
+    (ecossistema.modelo): todos os campos ausentes ou inválidos são listados
+    de uma vez e o script sai com código 1.
+
+    Estado ao vivo: --probe sonda todos os nós com porta ao mesmo tempo
+    (ecossistema.sonda, asyncio) em --probe-host, cada um com prazo de
+    --probe-timeout segundos. O anel de cada nó no HTML e no PNG ganha a cor
+    do estado (ok, lento, degradado, fora) e o JSON recebe "sonda".
+
+    Tráfego real: --access-log LOG (repetível, texto ou .gz) lê access logs
+    do nginx em stream e memória constante (ecossistema.trafego). Arestas e
+    nós no HTML e no PNG engrossam com as requisições; req/s, bytes e
+    p50/p99 do upstream vão para o tooltip e para o JSON ("trafego").
+
+    Runtime: --pm2 SNAPSHOT (repetível; arquivo ou diretório de `pm2 jlist`)
+    reduz a série com NumPy (ecossistema.pm2) e junta cada app ao projeto
+    por nome e porta: o nó cresce com o RSS p95 e a cor segue a CPU p95;
+    reinícios e uptime vão para o tooltip e para o JSON ("pm2").
+
+    Rastro: --trace ARQUIVO grava o tempo de cada etapa e renderizador
+    (ecossistema.rastro) como trace do Chrome, ou do speedscope se o nome
+    contiver "speedscope"; --trace-profile roda cada etapa sob cProfile.
+
+Dependências (só para o PNG; numpy também para --pm2):
+    pip install matplotlib numpy
 
 Saída:
     - DIAGRAMA-ECOSSISTEMA.png (imagem estática)
     - DIAGRAMA-ECOSSISTEMA-INTERATIVO.html (versão web interativa)
+    - DIAGRAMA-ECOSSISTEMA-DATA.json (PROJETOS com a análise de cada projeto)
+    - DIAGRAMA-ECOSSISTEMA.colunar/ (nós e arestas em .npy, ver ecossistema.colunar)
 """
 
+import argparse
+import io
 import json
+import os
+import sys
+from collections import Counter
 from datetime import datetime
 
+from ecossistema.build import ManifestoBuild, hash_entradas
+from ecossistema import colunar, rastro, saida
+from ecossistema.analise import analisar
+from ecossistema.grafo import compilar_grafo
+from ecossistema.layout import CACHE_ARQUIVO
+from ecossistema.modelo import ErroValidacao
+
+# Versão do gerador: entra no hash do cache de build (mudou o código, mude aqui)
+GERADOR_VERSAO = "9"
+
+OUTPUT_DIR = "/home/robson/Documentos/projetos/codigo-fonte"
+HTML_ARQUIVO = "DIAGRAMA-ECOSSISTEMA-INTERATIVO.html"
+PNG_ARQUIVO = "DIAGRAMA-ECOSSISTEMA.png"
+JSON_ARQUIVO = "DIAGRAMA-ECOSSISTEMA-DATA.json"
+COLUNAR_ARQUIVO = "DIAGRAMA-ECOSSISTEMA.colunar"
+
+# Acima deste número de nós o HTML usa o modo grafo grande (canvas + grupos)
+LIMIAR_GRAFO_GRANDE = 2000
+
+# Acima destes tamanhos o PNG troca setas por linhas e omite os rótulos
+LIMIAR_SETAS = 2000
+LIMIAR_ROTULOS = 1500
+
 # ==============================================================================
 # DADOS DOS PROJETOS ATIVOS
 # ==============================================================================
@@ -254,37 +326,9 @@ PROJETOS = {
 # GERAÇÃO DO HTML INTERATIVO (D3.js)
 # ==============================================================================
 
-def gerar_html_interativo():
-    """Gera visualização interativa com D3.js"""
-
-    # Preparar nodes e links para D3
-    nodes = []
-    links = []
-    node_ids = {}
-
-    for i, (key, proj) in enumerate(PROJETOS.items()):
-        node_ids[key] = i
-        nodes.append({
-            "id": i,
-            "name": proj["nome"],
-            "key": key,
-            "type": proj["tipo"],
-            "port": proj.get("porta", ""),
-            "desc": proj["descricao"],
-            "stack": proj.get("stack", ""),
-            "color": proj["cor"],
-            "path": proj.get("path_prod", "")
-        })
-
-    for key, proj in PROJETOS.items():
-        for target in proj.get("conecta", []):
-            if target in node_ids:
-                links.append({
-                    "source": node_ids[key],
-                    "target": node_ids[target]
-                })
-
-    html = f'''<!DOCTYPE html>
+# Página D3 dividida em trechos estáticos; os arrays JSON de nós e links são
+# escritos entre eles por escrever_html_interativo, em blocos.
+HTML_INICIO = '''<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
     <meta charset="UTF-8">
@@ -293,13 +337,13 @@ def gerar_html_interativo():
     <script src="https://d3js.org/d3.v7.min.js"></script>
     <script src="https://cdn.tailwindcss.com"></script>
     <style>
-        body {{ margin: 0; overflow: hidden; font-family: system-ui, -apple-system, sans-serif; }}
-        #graph {{ width: 100vw; height: 100vh; background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); }}
-        .node {{ cursor: pointer; }}
-        .node circle {{ stroke: #fff; stroke-width: 2px; }}
-        .node text {{ fill: white; font-size: 10px; font-weight: 500; }}
-        .link {{ stroke: #475569; stroke-opacity: 0.6; stroke-width: 1.5px; }}
-        .tooltip {{
+        body { margin: 0; overflow: hidden; font-family: system-ui, -apple-system, sans-serif; }
+        #graph { width: 100vw; height: 100vh; background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); }
+        .node { cursor: pointer; }
+        .node circle { stroke: #fff; stroke-width: 2px; }
+        .node text { fill: white; font-size: 10px; font-weight: 500; }
+        .link { stroke: #475569; stroke-opacity: 0.6; stroke-width: 1.5px; }
+        .tooltip {
             position: absolute;
             background: rgba(15, 23, 42, 0.95);
             border: 1px solid #3b82f6;
@@ -311,11 +355,11 @@ def gerar_html_interativo():
             z-index: 1000;
             max-width: 280px;
             box-shadow: 0 10px 40px rgba(0,0,0,0.3);
-        }}
-        .tooltip h3 {{ margin: 0 0 8px 0; color: #60a5fa; font-size: 14px; }}
-        .tooltip p {{ margin: 4px 0; color: #94a3b8; }}
-        .tooltip .port {{ color: #10b981; font-family: monospace; }}
-        .legend {{
+        }
+        .tooltip h3 { margin: 0 0 8px 0; color: #60a5fa; font-size: 14px; }
+        .tooltip p { margin: 4px 0; color: #94a3b8; }
+        .tooltip .port { color: #10b981; font-family: monospace; }
+        .legend {
             position: absolute;
             bottom: 20px;
             left: 20px;
@@ -323,33 +367,33 @@ def gerar_html_interativo():
             border-radius: 8px;
             padding: 16px;
             color: white;
-        }}
-        .legend-item {{ display: flex; align-items: center; gap: 8px; margin: 6px 0; }}
-        .legend-dot {{ width: 12px; height: 12px; border-radius: 50%; }}
-        .header {{
+        }
+        .legend-item { display: flex; align-items: center; gap: 8px; margin: 6px 0; }
+        .legend-dot { width: 12px; height: 12px; border-radius: 50%; }
+        .header {
             position: absolute;
             top: 20px;
             left: 20px;
             color: white;
-        }}
-        .header h1 {{ font-size: 24px; margin: 0; }}
-        .header p {{ color: #94a3b8; margin: 4px 0 0 0; font-size: 12px; }}
-        .stats {{
+        }
+        .header h1 { font-size: 24px; margin: 0; }
+        .header p { color: #94a3b8; margin: 4px 0 0 0; font-size: 12px; }
+        .stats {
             position: absolute;
             top: 20px;
             right: 20px;
             display: flex;
             gap: 12px;
-        }}
-        .stat {{
+        }
+        .stat {
             background: rgba(15, 23, 42, 0.9);
             border-radius: 8px;
             padding: 12px 16px;
             color: white;
             text-align: center;
-        }}
-        .stat-value {{ font-size: 24px; font-weight: bold; color: #3b82f6; }}
-        .stat-label {{ font-size: 10px; color: #94a3b8; text-transform: uppercase; }}
+        }
+        .stat-value { font-size: 24px; font-weight: bold; color: #3b82f6; }
+        .stat-label { font-size: 10px; color: #94a3b8; text-transform: uppercase; }
     </style>
 </head>
 <body>
@@ -388,8 +432,60 @@ def gerar_html_interativo():
     <div id="tooltip" class="tooltip" style="display: none;"></div>
 
     <script>
-        const nodes = {json.dumps(nodes)};
-        const links = {json.dumps(links)};
+        // Linhas da análise do grafo no tooltip (ver ecossistema.analise)
+        function analiseHtml(d) {
+            let html = "";
+            if (d.impact) {
+                html += `<p>Impacto: ${d.impact} nós dependem deste</p>`;
+                if (d.nbreaks) {
+                    const resto = d.nbreaks > d.breaks.length ? ` e mais ${d.nbreaks - d.breaks.length}` : "";
+                    html += `<p>Frontends afetados: ${d.breaks.join(", ")}${resto}</p>`;
+                }
+            }
+            if (d.domina) html += `<p>Único acesso (a partir das entradas) a ${d.domina} nós</p>`;
+            if (d.cycle !== null) html += `<p>⚠️ Dependência circular (ciclo ${d.cycle + 1})</p>`;
+            html += `<p>Intermediação: ${d.rank}º</p>`;
+            return html;
+        }
+
+        // Estado ao vivo no tooltip (só com --probe, ver ecossistema.sonda)
+        function sondaHtml(d) {
+            if (!d.live) return "";
+            const v = d.live;
+            const detalhe = v.latencia_ms !== null ? `${v.latencia_ms} ms` : v.erro;
+            const codigo = v.codigo ? ` (HTTP ${v.codigo})` : "";
+            return `<p style="color: ${v.cor}">● ${v.estado}: ${detalhe}${codigo}</p>`;
+        }
+
+        // Tráfego real no tooltip (só com --access-log, ver ecossistema.trafego)
+        function trafegoHtml(d) {
+            if (!d.traffic) return "";
+            const t = d.traffic;
+            let html = `<p>Tráfego: ${t.requisicoes} req`;
+            if (t.req_s !== null) html += ` (${t.req_s}/s)`;
+            html += `, ${(t.bytes / 1048576).toFixed(1)} MB</p>`;
+            if (t.p50_ms !== null) html += `<p>Upstream p50 ${t.p50_ms} ms, p99 ${t.p99_ms} ms</p>`;
+            return html;
+        }
+
+        // Runtime do PM2 no tooltip (só com --pm2, ver ecossistema.pm2)
+        function runtimeHtml(d) {
+            if (!d.runtime) return "";
+            const m = d.runtime;
+            let html = `<p>PM2 ${m.processo} [${m.status}]: CPU p95 ${m.cpu_p95}%, RSS p95 ${m.rss_p95_mb} MB</p>`;
+            html += `<p>Reinícios: ${m.reinicios} (+${m.reinicios_janela} na série), uptime ${(m.uptime_s / 3600).toFixed(1)} h</p>`;
+            return html;
+        }
+
+        // Escala do raio: tráfego (--access-log) e memória do PM2 (--pm2)
+        const escala = d => (d.traffic ? d.traffic.escala : 1) * (d.runtime ? d.runtime.escala : 1);
+
+        const nodes = '''
+
+HTML_MEIO = ''';
+        const links = '''
+
+HTML_FIM = ''';
 
         const width = window.innerWidth;
         const height = window.innerHeight;
@@ -425,6 +521,7 @@ def gerar_html_interativo():
             .data(links)
             .enter().append("line")
             .attr("class", "link")
+            .style("stroke-width", d => d.width ? d.width + "px" : null)
             .attr("marker-end", "url(#arrowhead)");
 
         // Nodes
@@ -438,23 +535,25 @@ def gerar_html_interativo():
                 .on("drag", dragged)
                 .on("end", dragended));
 
+        // Raio por tipo, escalado por tráfego e memória quando houver
+        const raio = d => {
+            let r = 20;
+            if (d.type === "database") r = 25;
+            else if (d.type === "external") r = 15;
+            else if (d.key === "invistto-hub") r = 30;
+            return r * escala(d);
+        };
+
         // Círculos dos nodes
         node.append("circle")
-            .attr("r", d => {{
-                if (d.type === "database") return 25;
-                if (d.type === "external") return 15;
-                if (d.key === "invistto-hub") return 30;
-                return 20;
-            }})
-            .attr("fill", d => d.color);
+            .attr("r", raio)
+            .attr("fill", d => d.runtime && d.runtime.cor ? d.runtime.cor : d.color)
+            .style("stroke", d => d.live ? d.live.cor : null)
+            .style("stroke-width", d => d.live ? "4px" : null);
 
         // Labels
         node.append("text")
-            .attr("dy", d => {{
-                if (d.type === "database") return 40;
-                if (d.key === "invistto-hub") return 45;
-                return 35;
-            }})
+            .attr("dy", d => raio(d) + (d.type === "external" ? 20 : 15))
             .attr("text-anchor", "middle")
             .text(d => d.name);
 
@@ -470,85 +569,520 @@ def gerar_html_interativo():
         // Tooltip
         const tooltip = d3.select("#tooltip");
 
-        node.on("mouseover", function(event, d) {{
-            let content = `<h3>${{d.name}}</h3>`;
-            content += `<p>${{d.desc}}</p>`;
-            if (d.port) content += `<p class="port">Porta: :${{d.port}}</p>`;
-            if (d.stack) content += `<p>Stack: ${{d.stack}}</p>`;
-            if (d.path) content += `<p>Prod: ${{d.path}}</p>`;
+        node.on("mouseover", function(event, d) {
+            let content = `<h3>${d.name}</h3>`;
+            content += `<p>${d.desc}</p>`;
+            if (d.port) content += `<p class="port">Porta: :${d.port}</p>`;
+            if (d.stack) content += `<p>Stack: ${d.stack}</p>`;
+            if (d.path) content += `<p>Prod: ${d.path}</p>`;
+            content += analiseHtml(d) + sondaHtml(d) + trafegoHtml(d) + runtimeHtml(d);
 
             tooltip.html(content)
                 .style("display", "block")
                 .style("left", (event.pageX + 15) + "px")
                 .style("top", (event.pageY - 10) + "px");
-        }})
-        .on("mouseout", function() {{
+        })
+        .on("mouseout", function() {
             tooltip.style("display", "none");
-        }});
+        });
 
         // Atualização da simulação
-        simulation.on("tick", () => {{
+        simulation.on("tick", () => {
             link
                 .attr("x1", d => d.source.x)
                 .attr("y1", d => d.source.y)
                 .attr("x2", d => d.target.x)
                 .attr("y2", d => d.target.y);
 
-            node.attr("transform", d => `translate(${{d.x}},${{d.y}})`);
-        }});
+            node.attr("transform", d => `translate(${d.x},${d.y})`);
+        });
 
-        function dragstarted(event, d) {{
+        function dragstarted(event, d) {
             if (!event.active) simulation.alphaTarget(0.3).restart();
             d.fx = d.x;
             d.fy = d.y;
-        }}
+        }
 
-        function dragged(event, d) {{
+        function dragged(event, d) {
             d.fx = event.x;
             d.fy = event.y;
-        }}
+        }
 
-        function dragended(event, d) {{
+        function dragended(event, d) {
             if (!event.active) simulation.alphaTarget(0);
             d.fx = null;
             d.fy = null;
-        }}
+        }
     </script>
 </body>
 </html>'''
 
-    return html
+# Modo grafo grande: mesmo cabeçalho (HTML_INICIO/HTML_MEIO), depois os
+# grupos por tipo e um script que desenha em <canvas> com nível de detalhe
+HTML_GRANDE_MEIO = ''';
+        const grupos = '''
+
+HTML_GRANDE_LIGACOES = ''';
+        const ligacoesGrupos = '''
+
+HTML_GRANDE_FIM = ''';
+
+        // Zoom a partir do qual os nomes dos nós são desenhados
+        const LIMIAR_ROTULOS = 1.5;
+
+        const width = window.innerWidth;
+        const height = window.innerHeight;
+        const dpr = window.devicePixelRatio || 1;
+
+        const canvas = d3.select("#graph")
+            .append("canvas")
+            .attr("width", width * dpr)
+            .attr("height", height * dpr)
+            .style("width", width + "px")
+            .style("height", height + "px");
+        const ctx = canvas.node().getContext("2d");
+
+        document.querySelector(".header p").textContent =
+            `Modo grafo grande (${nodes.length} nós) - clique em um grupo para expandir; shift+clique em um nó recolhe o grupo`;
+
+        const raio = d => {
+            if (d.grupo) return 20 + 4 * Math.sqrt(d.n);
+            let r = 20;
+            if (d.type === "database") r = 25;
+            else if (d.type === "external") r = 15;
+            else if (d.key === "invistto-hub") r = 30;
+            return r * escala(d);
+        };
+
+        // Grupos (um por tipo) começam recolhidos
+        const membros = d3.group(nodes, d => d.type);
+        const porTipo = new Map();
+        for (const g of grupos) {
+            g.grupo = true;
+            g.name = `${g.tipo} (${g.n})`;
+            porTipo.set(g.tipo, g);
+        }
+        const expandidos = new Set();
+
+        let transform = d3.zoomIdentity;
+        let visiveis = [];
+        let arestas = [];
+
+        const simulation = d3.forceSimulation()
+            .force("link", d3.forceLink().distance(l => l.source.grupo && l.target.grupo ? 300 : 80))
+            .force("charge", d3.forceManyBody()
+                .strength(d => d.grupo ? -3000 : -60)
+                .theta(0.9)
+                .distanceMax(1500))
+            .force("center", d3.forceCenter(width / 2, height / 2))
+            .on("tick", agendar);
+
+        // Recalcula nós e arestas visíveis a partir dos grupos expandidos.
+        // Arestas com uma ponta recolhida são somadas na aresta do grupo.
+        function reconstruir() {
+            visiveis = [];
+            for (const g of grupos) {
+                if (!expandidos.has(g.tipo)) {
+                    visiveis.push(g);
+                    continue;
+                }
+                const lista = membros.get(g.tipo);
+                const espalhamento = raio(g) * 3 / Math.sqrt(lista.length);
+                lista.forEach((d, i) => {
+                    if (d.x === undefined) {
+                        // Filotaxia ao redor do grupo: nascem espalhados, sem sobreposição
+                        const r = espalhamento * Math.sqrt(i + 0.5);
+                        const a = i * Math.PI * (3 - Math.sqrt(5));
+                        d.x = g.x + r * Math.cos(a);
+                        d.y = g.y + r * Math.sin(a);
+                    }
+                    visiveis.push(d);
+                });
+            }
+
+            arestas = [];
+            const somadas = new Map();
+            const somar = (s, t, n) => {
+                const ponta = d => d.grupo ? "g:" + d.tipo : d.id;
+                const chave = ponta(s) + ">" + ponta(t);
+                const aresta = somadas.get(chave);
+                if (aresta) aresta.n += n;
+                else somadas.set(chave, {source: s, target: t, n: n});
+            };
+            for (const l of ligacoesGrupos) {
+                if (!expandidos.has(l.source) && !expandidos.has(l.target)) {
+                    somar(porTipo.get(l.source), porTipo.get(l.target), l.n);
+                }
+            }
+            if (expandidos.size) {
+                for (const l of links) {
+                    const a = nodes[l.source];
+                    const b = nodes[l.target];
+                    const ea = expandidos.has(a.type);
+                    const eb = expandidos.has(b.type);
+                    if (ea && eb) arestas.push({source: a, target: b, n: 1, width: l.width});
+                    else if (ea) somar(a, porTipo.get(b.type), 1);
+                    else if (eb) somar(porTipo.get(a.type), b, 1);
+                }
+            }
+            for (const aresta of somadas.values()) {
+                if (aresta.source !== aresta.target) arestas.push(aresta);
+            }
+
+            simulation.nodes(visiveis);
+            simulation.force("link").links(arestas);
+            simulation.alpha(0.5).restart();
+        }
+
+        // Um quadro por requestAnimationFrame, no máximo
+        let pendente = false;
+        function agendar() {
+            if (!pendente) {
+                pendente = true;
+                requestAnimationFrame(desenhar);
+            }
+        }
+
+        function desenhar() {
+            pendente = false;
+            const k = transform.k;
+            ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+            ctx.clearRect(0, 0, width, height);
+            ctx.translate(transform.x, transform.y);
+            ctx.scale(k, k);
+
+            // Janela visível em coordenadas do grafo (o que está fora não é desenhado)
+            const x0 = -transform.x / k, y0 = -transform.y / k;
+            const x1 = x0 + width / k, y1 = y0 + height / k;
+            const dentro = (d, r) => d.x + r >= x0 && d.x - r <= x1 && d.y + r >= y0 && d.y - r <= y1;
+
+            // Arestas simples em um único path; as somadas com espessura pelo
+            // total e as com tráfego (--access-log) pela largura calculada
+            ctx.strokeStyle = "rgba(71, 85, 105, 0.6)";
+            ctx.lineWidth = 1.5 / k;
+            ctx.beginPath();
+            for (const e of arestas) {
+                if (e.n > 1 || e.width) continue;
+                ctx.moveTo(e.source.x, e.source.y);
+                ctx.lineTo(e.target.x, e.target.y);
+            }
+            ctx.stroke();
+            for (const e of arestas) {
+                if (e.n <= 1 && !e.width) continue;
+                ctx.lineWidth = (e.width || 1.5 + 2 * Math.log2(e.n)) / k;
+                ctx.beginPath();
+                ctx.moveTo(e.source.x, e.source.y);
+                ctx.lineTo(e.target.x, e.target.y);
+                ctx.stroke();
+            }
+
+            // Nós agrupados por cor: um path e um fill por cor
+            const porCor = new Map();
+            for (const d of visiveis) {
+                const r = raio(d);
+                if (!dentro(d, r)) continue;
+                const cor = (d.runtime && d.runtime.cor) || d.color || d.cor;
+                let path = porCor.get(cor);
+                if (!path) porCor.set(cor, path = new Path2D());
+                path.moveTo(d.x + r, d.y);
+                path.arc(d.x, d.y, r, 0, 2 * Math.PI);
+            }
+            ctx.lineWidth = 2 / Math.max(k, 1);
+            ctx.strokeStyle = "#fff";
+            for (const [cor, path] of porCor) {
+                ctx.fillStyle = cor;
+                ctx.fill(path);
+                if (k >= LIMIAR_ROTULOS / 2) ctx.stroke(path);
+            }
+
+            // Anel do estado ao vivo (--probe), também um path por cor
+            const porEstado = new Map();
+            for (const d of visiveis) {
+                if (!d.live) continue;
+                const r = raio(d) + 2 / k;
+                if (!dentro(d, r)) continue;
+                let path = porEstado.get(d.live.cor);
+                if (!path) porEstado.set(d.live.cor, path = new Path2D());
+                path.moveTo(d.x + r, d.y);
+                path.arc(d.x, d.y, r, 0, 2 * Math.PI);
+            }
+            ctx.lineWidth = 3 / k;
+            for (const [cor, path] of porEstado) {
+                ctx.strokeStyle = cor;
+                ctx.stroke(path);
+            }
+
+            // Rótulos: grupos sempre; nós só acima do limiar de zoom
+            ctx.fillStyle = "white";
+            ctx.textAlign = "center";
+            for (const d of visiveis) {
+                if (!d.grupo && k < LIMIAR_ROTULOS) continue;
+                const r = raio(d);
+                if (!dentro(d, r)) continue;
+                ctx.font = d.grupo ? `bold ${12 / Math.min(k, 1)}px system-ui` : "500 10px system-ui";
+                ctx.fillText(d.name, d.x, d.y + r + 14);
+                if (!d.grupo && d.port) {
+                    ctx.font = "8px system-ui";
+                    ctx.fillText(":" + d.port, d.x, d.y + 3);
+                }
+            }
+        }
+
+        // Nó sob o ponteiro (coordenadas da tela → do grafo)
+        function noEm(event) {
+            const [x, y] = transform.invert(d3.pointer(event, canvas.node()));
+            return simulation.find(x, y, 40 / Math.min(transform.k, 1)) || null;
+        }
+
+        const tooltip = d3.select("#tooltip");
+
+        canvas
+            .call(d3.drag()
+                .subject(event => {
+                    // Sujeito em coordenadas da tela; o nó vai junto
+                    const d = noEm(event.sourceEvent);
+                    return d && {no: d, x: transform.applyX(d.x), y: transform.applyY(d.y)};
+                })
+                .on("start", event => {
+                    if (!event.active) simulation.alphaTarget(0.3).restart();
+                    event.subject.no.fx = transform.invertX(event.x);
+                    event.subject.no.fy = transform.invertY(event.y);
+                })
+                .on("drag", event => {
+                    event.subject.no.fx = transform.invertX(event.x);
+                    event.subject.no.fy = transform.invertY(event.y);
+                })
+                .on("end", event => {
+                    if (!event.active) simulation.alphaTarget(0);
+                    event.subject.no.fx = null;
+                    event.subject.no.fy = null;
+                }))
+            .call(d3.zoom()
+                .scaleExtent([0.02, 8])
+                .on("zoom", event => { transform = event.transform; agendar(); }))
+            .on("dblclick.zoom", null)
+            .on("click", event => {
+                const d = noEm(event);
+                if (!d) return;
+                if (d.grupo) {
+                    expandidos.add(d.tipo);
+                } else if (event.shiftKey) {
+                    // Recolhe: o grupo volta para o centro dos membros
+                    const g = porTipo.get(d.type);
+                    const lista = membros.get(d.type);
+                    g.x = d3.mean(lista, m => m.x);
+                    g.y = d3.mean(lista, m => m.y);
+                    expandidos.delete(d.type);
+                } else {
+                    return;
+                }
+                tooltip.style("display", "none");
+                reconstruir();
+            })
+            .on("mousemove", event => {
+                const d = noEm(event);
+                if (!d) {
+                    tooltip.style("display", "none");
+                    return;
+                }
+                let content = `<h3>${d.name}</h3>`;
+                if (d.grupo) {
+                    content += `<p>${d.n} nós - clique para expandir</p>`;
+                } else {
+                    content += `<p>${d.desc}</p>`;
+                    if (d.port) content += `<p class="port">Porta: :${d.port}</p>`;
+                    if (d.stack) content += `<p>Stack: ${d.stack}</p>`;
+                    if (d.path) content += `<p>Prod: ${d.path}</p>`;
+                    content += analiseHtml(d) + sondaHtml(d) + trafegoHtml(d) + runtimeHtml(d);
+                }
+                tooltip.html(content)
+                    .style("display", "block")
+                    .style("left", (event.pageX + 15) + "px")
+                    .style("top", (event.pageY - 10) + "px");
+            });
+
+        reconstruir();
+    </script>
+</body>
+</html>'''
+
+
+def _nos_d3(grafo, analise, sondagem=None, trafego=None, runtime=None):
+    """Nós no formato esperado pelo D3, um por vez (com a análise para o tooltip)"""
+    escalas = trafego.escalas_nos() if trafego else {}
+    escalas_pm2 = runtime.escalas_nos() if runtime else {}
+    cores_pm2 = runtime.cores_nos() if runtime else {}
+    for i, (key, proj) in enumerate(zip(grafo.chaves, grafo.projetos)):
+        a = analise[key]
+        no = {
+            "id": i,
+            "name": proj.nome,
+            "key": key,
+            "type": proj.tipo,
+            "port": proj.porta,
+            "desc": proj.descricao,
+            "stack": proj.stack,
+            "color": proj.cor,
+            "path": proj.path_prod,
+            "impact": a["impacto"],
+            "breaks": [grafo.projetos[grafo.id(k)].nome for k in a["quebra"][:5]],
+            "nbreaks": a["frontends_afetados"],
+            "domina": a["domina"],
+            "cycle": a["ciclo"],
+            "rank": a["ranking"],
+        }
+        if sondagem and key in sondagem:
+            r = sondagem[key]
+            no["live"] = {**r.para_dict(), "cor": r.cor}
+        if key in escalas:
+            no["traffic"] = {**trafego.nos[key].para_dict(trafego.duracao),
+                             "escala": round(escalas[key], 3)}
+        if runtime and key in runtime.nos:
+            no["runtime"] = {**runtime.nos[key], "escala": round(escalas_pm2.get(key, 1), 3),
+                             "cor": cores_pm2.get(key)}
+        yield no
+
+
+def _links_d3(grafo, trafego=None):
+    larguras = trafego.larguras_arestas() if trafego else {}
+    for origem, destino in grafo.arestas():
+        link = {"source": origem, "target": destino}
+        if (origem, destino) in larguras:
+            link["width"] = round(larguras[(origem, destino)], 2)
+        yield link
+
+
+def _escrever_array_json(f, itens, bloco):
+    """Escreve um array JSON item a item, descarregando a cada `bloco` itens"""
+    f.write("[")
+    pendentes = []
+    primeiro = True
+    for item in itens:
+        pendentes.append(json.dumps(item))
+        if len(pendentes) >= bloco:
+            if not primeiro:
+                f.write(", ")
+            f.write(", ".join(pendentes))
+            pendentes.clear()
+            primeiro = False
+    if pendentes:
+        if not primeiro:
+            f.write(", ")
+        f.write(", ".join(pendentes))
+    f.write("]")
+
+
+def _grupos_d3(grafo):
+    """Um grupo por tipo, com a cor mais comum entre os membros"""
+    for tipo, ids in grafo.por_tipo.items():
+        cores = Counter(grafo.projetos[i].cor for i in ids)
+        yield {"tipo": tipo, "n": len(ids), "cor": cores.most_common(1)[0][0]}
+
+
+def _ligacoes_grupos_d3(grafo):
+    """Arestas somadas entre tipos (as internas a um tipo não entram)"""
+    tipos = grafo.tipos
+    contagem = Counter((tipos[origem], tipos[destino]) for origem, destino in grafo.arestas())
+    for (origem, destino), n in contagem.items():
+        if origem != destino:
+            yield {"source": origem, "target": destino, "n": n}
+
+
+def modo_grande(grafo, grande=None):
+    """Decide o modo grafo grande: explícito ou pelo LIMIAR_GRAFO_GRANDE"""
+    if grande is None:
+        return len(grafo) > LIMIAR_GRAFO_GRANDE
+    return grande
+
+
+def escrever_html_interativo(grafo, f, bloco=1000, grande=None, analise=None, sondagem=None,
+                             trafego=None, runtime=None):
+    """Escreve o HTML interativo direto no arquivo, em blocos (memória constante)
+
+    No modo grafo grande (automático acima de LIMIAR_GRAFO_GRANDE nós) a
+    página desenha em canvas, começa com um nó por tipo que expande no
+    clique e só mostra nomes acima de um nível de zoom. `analise` é o
+    resultado de analisar(grafo)[0]; calculado aqui se não vier pronto.
+    `sondagem` ({chave: sonda.Resultado}) pinta o anel de cada nó sondado;
+    `trafego` (trafego.Trafego) engrossa arestas e nós pelo volume real;
+    `runtime` (pm2.Runtime) dá tamanho pela memória e cor pela CPU.
+    """
+    if analise is None:
+        analise = analisar(grafo)[0]
+    f.write(HTML_INICIO)
+    with rastro.intervalo("nos_d3", nos=len(grafo)):
+        _escrever_array_json(f, _nos_d3(grafo, analise, sondagem, trafego, runtime), bloco)
+    f.write(HTML_MEIO)
+    with rastro.intervalo("links_d3"):
+        _escrever_array_json(f, _links_d3(grafo, trafego), bloco)
+    if not modo_grande(grafo, grande):
+        f.write(HTML_FIM)
+        return
+    f.write(HTML_GRANDE_MEIO)
+    with rastro.intervalo("grupos_d3"):
+        _escrever_array_json(f, _grupos_d3(grafo), bloco)
+        f.write(HTML_GRANDE_LIGACOES)
+        _escrever_array_json(f, _ligacoes_grupos_d3(grafo), bloco)
+    f.write(HTML_GRANDE_FIM)
+
+
+def gerar_html_interativo(grafo=None, grande=None):
+    """Gera visualização interativa com D3.js (documento inteiro em memória)"""
+    if grafo is None:
+        grafo = compilar_grafo(PROJETOS)
+
+    buffer = io.StringIO()
+    escrever_html_interativo(grafo, buffer, grande=grande)
+    return buffer.getvalue()
 
 
 # ==============================================================================
 # GERAÇÃO DO PNG ESTÁTICO (matplotlib)
 # ==============================================================================
 
-def gerar_png_estatico():
-    """Gera imagem PNG estática usando matplotlib"""
+def dependencias_png():
+    """True se matplotlib e numpy importam (sem carregar o pyplot)"""
     try:
-        import matplotlib.pyplot as plt
-        import matplotlib.patches as mpatches
-        import networkx as nx
-
-        # Criar grafo
-        G = nx.DiGraph()
+        import matplotlib  # noqa: F401
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def gerar_png_estatico(grafo=None, output_path=None, caminho_cache=None, sondagem=None,
+                       trafego=None, runtime=None):
+    """Gera imagem PNG estática usando matplotlib
+
+    `output_path` pode ser um caminho ou um arquivo binário aberto (ex.: o
+    stdout); o cache de layout fica em `caminho_cache` ou ao lado do PNG.
+    Com `sondagem`, a borda de cada nó sondado ganha a cor do estado; com
+    `trafego`, arestas e nós crescem com o volume real de requisições; com
+    `runtime` (PM2), o nó cresce com a memória e a cor segue a CPU.
+    """
+    if grafo is None:
+        grafo = compilar_grafo(PROJETOS)
+    if output_path is None:
+        output_path = os.path.join(OUTPUT_DIR, PNG_ARQUIVO)
+    try:
+        with rastro.intervalo("importar"):
+            import matplotlib.pyplot as plt
+            import matplotlib.patches as mpatches
+            import numpy as np
+            from matplotlib.collections import LineCollection
+            from matplotlib.patches import FancyArrowPatch
 
-        # Adicionar nodes
-        for key, proj in PROJETOS.items():
-            G.add_node(key,
-                       label=proj["nome"],
-                       tipo=proj["tipo"],
-                       cor=proj["cor"])
+            from ecossistema.layout import layout_incremental
 
-        # Adicionar edges
-        for key, proj in PROJETOS.items():
-            for target in proj.get("conecta", []):
-                if target in PROJETOS:
-                    G.add_edge(key, target)
+        chaves = grafo.chaves
+        projetos = grafo.projetos
 
-        # Layout
-        pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
+        # Layout (cache ao lado do PNG: só relaxa o que mudou desde a última vez)
+        if caminho_cache is None and isinstance(output_path, str):
+            caminho_cache = os.path.join(os.path.dirname(os.path.abspath(output_path)), CACHE_ARQUIVO)
+        with rastro.intervalo("layout", nos=len(grafo)):
+            pos = layout_incremental(grafo, caminho_cache, k=2, iteracoes=50, seed=42)
+        xy = np.array([pos[chave] for chave in chaves], dtype=float).reshape(-1, 2)
 
         # Figura
         fig, ax = plt.subplots(1, 1, figsize=(20, 14))
@@ -571,61 +1105,78 @@ def gerar_png_estatico():
         }
 
         node_colors = []
-        for node in G.nodes():
-            if node in cores_especiais:
-                node_colors.append(cores_especiais[node])
-            else:
-                tipo = PROJETOS[node]["tipo"]
-                node_colors.append(cores_tipo.get(tipo, "#94a3b8"))
-
-        # Desenhar edges
-        nx.draw_networkx_edges(G, pos, ax=ax,
-                               edge_color='#475569',
-                               arrows=True,
-                               arrowsize=15,
-                               arrowstyle='-|>',
-                               alpha=0.6,
-                               width=1.5)
-
-        # Desenhar nodes
         node_sizes = []
-        for node in G.nodes():
-            if node == "invistto-hub":
+        for chave, proj in zip(chaves, projetos):
+            if chave in cores_especiais:
+                node_colors.append(cores_especiais[chave])
+            else:
+                node_colors.append(cores_tipo.get(proj.tipo, "#94a3b8"))
+
+            if chave == "invistto-hub":
                 node_sizes.append(3000)
-            elif PROJETOS[node]["tipo"] == "database":
+            elif proj.tipo == "database":
                 node_sizes.append(2500)
-            elif PROJETOS[node]["tipo"] == "external":
+            elif proj.tipo == "external":
                 node_sizes.append(1000)
             else:
                 node_sizes.append(2000)
 
-        nx.draw_networkx_nodes(G, pos, ax=ax,
-                               node_color=node_colors,
-                               node_size=node_sizes,
-                               alpha=0.9,
-                               edgecolors='white',
-                               linewidths=2)
-
-        # Labels
-        labels = {node: PROJETOS[node]["nome"] for node in G.nodes()}
-        nx.draw_networkx_labels(G, pos, labels, ax=ax,
-                                font_size=8,
-                                font_color='white',
-                                font_weight='bold')
-
-        # Portas como labels secundários
-        port_labels = {}
-        port_pos = {}
-        for node, (x, y) in pos.items():
-            porta = PROJETOS[node].get("porta", "")
-            if porta:
-                port_labels[node] = f":{porta}"
-                port_pos[node] = (x, y - 0.08)
-
-        nx.draw_networkx_labels(G, port_pos, port_labels, ax=ax,
-                                font_size=6,
-                                font_color='#60a5fa',
-                                font_family='monospace')
+        # Tráfego real: a área cresce com o quadrado da escala do raio no HTML
+        escalas = trafego.escalas_nos() if trafego else {}
+        larguras = trafego.larguras_arestas() if trafego else {}
+        escalas_pm2 = runtime.escalas_nos() if runtime else {}
+        cores_pm2 = runtime.cores_nos() if runtime else {}
+        for i, chave in enumerate(chaves):
+            if chave in escalas:
+                node_sizes[i] *= escalas[chave] ** 2
+            if chave in escalas_pm2:
+                node_sizes[i] *= escalas_pm2[chave] ** 2
+            if chave in cores_pm2:
+                node_colors[i] = cores_pm2[chave]
+
+        # Desenhar edges: setas individuais em grafos pequenos; acima de
+        # LIMIAR_SETAS, uma única LineCollection (milhares de patches travam)
+        arestas = list(grafo.arestas())
+        if len(arestas) <= LIMIAR_SETAS:
+            for origem, destino in arestas:
+                ax.add_patch(FancyArrowPatch(
+                    tuple(xy[origem]), tuple(xy[destino]),
+                    arrowstyle='-|>', mutation_scale=15,
+                    color='#475569', alpha=0.6,
+                    linewidth=larguras.get((origem, destino), 1.5),
+                    shrinkA=node_sizes[origem] ** 0.5 / 2,
+                    shrinkB=node_sizes[destino] ** 0.5 / 2,
+                    zorder=1))
+        elif arestas:
+            indices = np.array(arestas)
+            ax.add_collection(LineCollection(
+                np.stack([xy[indices[:, 0]], xy[indices[:, 1]]], axis=1),
+                colors='#475569', alpha=0.6,
+                linewidths=[larguras.get(a, 0.5) for a in arestas],
+                zorder=1))
+
+        # Desenhar nodes (borda na cor do estado ao vivo, se sondados)
+        sondagem = sondagem or {}
+        bordas = [sondagem[c].cor if c in sondagem else 'white' for c in chaves]
+        largura = 2 if len(chaves) <= LIMIAR_ROTULOS else 0
+        ax.scatter(xy[:, 0], xy[:, 1],
+                   c=node_colors,
+                   s=node_sizes if len(chaves) <= LIMIAR_ROTULOS else 20,
+                   alpha=0.9,
+                   edgecolors=bordas,
+                   linewidths=[4 if c in sondagem else largura for c in chaves],
+                   zorder=2)
+
+        # Labels e portas (como labels secundários); omitidos em grafos grandes
+        if len(chaves) <= LIMIAR_ROTULOS:
+            for (x, y), proj in zip(xy, projetos):
+                ax.text(x, y, proj.nome,
+                        fontsize=8, color='white', fontweight='bold',
+                        ha='center', va='center', zorder=3)
+                if proj.porta:
+                    ax.text(x, y - 0.08, f":{proj.porta}",
+                            fontsize=6, color='#60a5fa', family='monospace',
+                            ha='center', va='center', zorder=3)
 
         # Título
         ax.set_title("Ecossistema Invistto - Mapa de Arquitetura",
@@ -648,16 +1199,16 @@ def gerar_png_estatico():
         ax.axis('off')
         plt.tight_layout()
 
-        output_path = "/home/robson/Documentos/projetos/codigo-fonte/DIAGRAMA-ECOSSISTEMA.png"
-        plt.savefig(output_path, dpi=150, facecolor='#0f172a',
-                    edgecolor='none', bbox_inches='tight')
+        with rastro.intervalo("savefig"):
+            plt.savefig(output_path, format='png', dpi=150, facecolor='#0f172a',
+                        edgecolor='none', bbox_inches='tight')
         plt.close()
 
         return output_path
 
     except ImportError:
-        print("⚠️  matplotlib/networkx não instalados. Execute:")
-        print("    pip install matplotlib networkx")
+        print("⚠️  matplotlib/numpy não instalados. Execute:", file=sys.stderr)
+        print("    pip install matplotlib numpy", file=sys.stderr)
         return None
 
 
@@ -665,61 +1216,293 @@ def gerar_png_estatico():
 # MAIN
 # ==============================================================================
 
-def main():
-    print("=" * 60)
-    print("DIAGRAMA DO ECOSSISTEMA INVISTTO")
-    print("=" * 60)
-    print()
+def imprimir_resumo(grafo, log=None, analise=None):
+    """Resumo dos projetos por tipo (e, se houver, da análise) no terminal"""
+    log = log or sys.stdout
+    print(file=log)
+    print("=" * 60, file=log)
+    print("RESUMO DOS PROJETOS ATIVOS", file=log)
+    print("=" * 60, file=log)
+    print(file=log)
+
+    for tipo, ids in grafo.por_tipo.items():
+        print(f"\n📁 {tipo.upper()} ({len(ids)})", file=log)
+        for i in ids:
+            p = grafo.projetos[i]
+            porta = f":{p.porta}" if p.porta else ""
+            print(f"   • {p.nome:<20} {porta:<8} {p.descricao}", file=log)
+
+    if analise is None:
+        return
+    nos, resumo = analise
+    print("\n🧭 ANÁLISE DE DEPENDÊNCIAS", file=log)
+    ciclos = [" → ".join(c) for c in resumo["ciclos"]]
+    print(f"   🔁 Ciclos: {'; '.join(ciclos) if ciclos else 'nenhum'}", file=log)
+    for chave in resumo["maior_impacto"][:5]:
+        a = nos[chave]
+        print(f"   💥 {chave:<20} {a['impacto']} dependentes, "
+              f"{a['frontends_afetados']} frontends", file=log)
+    for chave in resumo["pontos_unicos"][:5]:
+        print(f"   🎯 {chave:<20} ponto único de falha: derruba "
+              f"{nos[chave]['frontends_afetados']} frontends", file=log)
+    print(f"   🔀 Intermediação: {', '.join(resumo['intermediacao'][:5]) or 'nenhuma'}", file=log)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gera o diagrama do ecossistema Invistto",
+        epilog="Sem seletores, gera todos os artefatos e o resumo.")
+    saida.adicionar_seletor(parser, "html", "gera o HTML interativo")
+    saida.adicionar_seletor(parser, "png", "gera o PNG estático (requer matplotlib e numpy)")
+    saida.adicionar_seletor(parser, "json", "exporta PROJETOS em JSON")
+    parser.add_argument("--columnar", nargs="?", const=saida.PADRAO, default=None,
+                        metavar="DIRETORIO",
+                        help="exporta o grafo em colunas .npy (numpy.load com mmap_mode)")
+    parser.add_argument("--large-graph", choices=("auto", "on", "off"), default="auto",
+                        help="HTML em canvas com grupos por tipo "
+                             f"(auto: acima de {LIMIAR_GRAFO_GRANDE} nós)")
+    parser.add_argument("--summary", action="store_true", help="imprime o resumo por tipo")
+    parser.add_argument("--probe", action="store_true",
+                        help="sonda os serviços e colore os nós pelo estado ao vivo")
+    parser.add_argument("--probe-host", default="localhost",
+                        help="host dos serviços sondados (padrão: %(default)s)")
+    parser.add_argument("--probe-timeout", type=float, default=None, metavar="S",
+                        help="prazo de cada verificação em segundos (padrão: sonda.TIMEOUT_S)")
+    parser.add_argument("--access-log", action="append", default=[], metavar="LOG",
+                        help="access log do nginx (texto ou .gz; repetível) para pesar "
+                             "arestas e nós pelo tráfego real")
+    parser.add_argument("--pm2", action="append", default=[], metavar="SNAPSHOT",
+                        help="saída salva de `pm2 jlist` (arquivo ou diretório; repetível) "
+                             "para CPU/memória nos nós (requer numpy)")
+    saida.adicionar_opcoes(parser, OUTPUT_DIR)
+    parser.add_argument("--force", action="store_true",
+                        help="regera todos os artefatos, ignorando o cache de build")
+    rastro.adicionar_opcoes(parser)
+    args = parser.parse_args(argv)
+    rastro.validar(parser, args)
+
+    # Sem seletores: tudo, como antes. Só o PNG carrega matplotlib/numpy.
+    exigidos = {nome for nome in ("html", "png", "json", "columnar")
+                if getattr(args, nome) is not None}
+    if (args.html is None and args.png is None and args.json is None and args.columnar is None
+            and not args.summary):
+        args.html = args.png = args.json = args.columnar = saida.PADRAO
+        args.summary = True
+
+    destinos = {
+        nome: saida.destino(valor, args.out_dir, arquivo)
+        for nome, valor, arquivo in (("html", args.html, HTML_ARQUIVO),
+                                     ("png", args.png, PNG_ARQUIVO),
+                                     ("json", args.json, JSON_ARQUIVO),
+                                     ("columnar", args.columnar, COLUNAR_ARQUIVO))
+        if valor is not None
+    }
+    saida.validar(parser, destinos)
+    if saida.eh_stdout(destinos.get("columnar")):
+        parser.error("--columnar grava um diretório e não pode ir para o stdout")
+    log = saida.log(destinos)
+
+    with rastro.sessao(args.trace, args.trace_format, args.trace_profile,
+                       "DIAGRAMA-ECOSSISTEMA", log):
+        return gerar(args, destinos, log, exigidos)
+
+
+def gerar(args, destinos, log, exigidos=()):
+    """Gera os artefatos de `destinos` com as opções já validadas por main()
+
+    Devolve 1 se algum artefato de `exigidos` (pedidos explicitamente, não
+    pelo padrão "tudo") não pôde ser gerado.
+    """
+    print("=" * 60, file=log)
+    print("DIAGRAMA DO ECOSSISTEMA INVISTTO", file=log)
+    print("=" * 60, file=log)
+    print(file=log)
+
+    # Índice único consumido por todos os renderizadores; PROJETOS é validado
+    # inteiro antes de qualquer artefato ser aberto
+    try:
+        with rastro.intervalo("compilar_grafo", projetos=len(PROJETOS)):
+            grafo = compilar_grafo(PROJETOS)
+    except ErroValidacao as e:
+        print(f"❌ PROJETOS inválido ({len(e.erros)} erros):", file=sys.stderr)
+        for erro in e.erros:
+            print(f"   • {erro}", file=sys.stderr)
+        return 1
+    grande = modo_grande(grafo, {"auto": None, "on": True, "off": False}[args.large_graph])
+
+    # Estado ao vivo: uma varredura só, compartilhada por todos os artefatos
+    sondagem = None
+    if args.probe:
+        from ecossistema import sonda
+
+        timeout = args.probe_timeout if args.probe_timeout is not None else sonda.TIMEOUT_S
+        with rastro.intervalo("sonda"):
+            sondagem = sonda.sondar(sonda.alvos_do_grafo(grafo, args.probe_host), timeout)
+        total = sonda.contagem(sondagem)
+        print(f"📡 Sonda ({len(sondagem)} alvos em {args.probe_host}): "
+              + ", ".join(f"{n} {estado}" for estado, n in total.items()), file=log)
+    vivo = sondagem and {chave: r.para_dict() for chave, r in sondagem.items()}
+
+    # Tráfego real: uma passada pelos logs, agregada por projeto e aresta
+    trafego = None
+    if args.access_log:
+        from ecossistema import trafego as ingestao
+
+        try:
+            with rastro.intervalo("trafego", logs=len(args.access_log)):
+                trafego = ingestao.ingerir(args.access_log, grafo)
+        except OSError as e:
+            print(f"❌ Access log ilegível: {e}", file=sys.stderr)
+            return 1
+        print(f"📈 Tráfego: {trafego.linhas} linhas, {len(trafego.nos)} projetos, "
+              f"{len(trafego.arestas)} arestas com requisições", file=log)
+    volume = trafego and trafego.para_dict()
+
+    # Runtime do PM2: série reduzida com NumPy (cache .npz no out-dir)
+    runtime = None
+    if args.pm2:
+        from ecossistema import pm2
+
+        cache = None if args.force else os.path.join(args.out_dir, pm2.CACHE_ARQUIVO)
+        try:
+            with rastro.intervalo("pm2", snapshots=len(args.pm2)):
+                runtime = pm2.ingerir(args.pm2, grafo, cache)
+        except ImportError:
+            print("❌ --pm2 requer numpy: pip install numpy", file=sys.stderr)
+            return 1
+        except (OSError, ValueError) as e:
+            print(f"❌ Snapshot do PM2 ilegível: {e}", file=sys.stderr)
+            return 1
+        print(f"🧮 PM2: {len(runtime.nos)} apps ligados a projetos"
+              + (f", sem projeto: {', '.join(sorted(runtime.sem_projeto))}"
+                 if runtime.sem_projeto else ""), file=log)
+    carga = runtime and runtime.para_dict()
+
+    # Análise (impacto, ciclos, dominadores): uma vez, só se algo a usar
+    resultado = []
+
+    def analise():
+        if not resultado:
+            with rastro.intervalo("analise"):
+                resultado.append(analisar(grafo))
+        return resultado[0]
+
+    # Artefatos cujas entradas não mudaram desde a última execução são
+    # pulados; o que vai para o stdout é sempre gerado
+    manifesto = ManifestoBuild(args.out_dir, "DIAGRAMA-ECOSSISTEMA", forcar=args.force)
+    chaves = {
+        "html": hash_entradas("html", GERADOR_VERSAO, PROJETOS, HTML_INICIO, HTML_MEIO, HTML_FIM,
+                              grande and [HTML_GRANDE_MEIO, HTML_GRANDE_LIGACOES, HTML_GRANDE_FIM],
+                              vivo, volume, carga),
+        "png": hash_entradas("png", GERADOR_VERSAO, PROJETOS, vivo, volume, carga),
+        "json": hash_entradas("json", GERADOR_VERSAO, PROJETOS, vivo, volume, carga),
+        "columnar": hash_entradas("columnar", GERADOR_VERSAO, colunar.VERSAO, PROJETOS),
+    }
+    arquivos = {"html": HTML_ARQUIVO, "png": PNG_ARQUIVO, "json": JSON_ARQUIVO,
+                "columnar": COLUNAR_ARQUIVO}
+
+    def atualizado(nome):
+        caminho = destinos[nome]
+        if saida.eh_stdout(caminho):
+            return False
+        artefato = saida.artefato_manifesto(arquivos[nome], caminho, args.out_dir)
+        return manifesto.atualizado(artefato, chaves[nome], caminho)
+
+    def registrar(nome):
+        caminho = destinos[nome]
+        if not saida.eh_stdout(caminho):
+            artefato = saida.artefato_manifesto(arquivos[nome], caminho, args.out_dir)
+            manifesto.registrar(artefato, chaves[nome])
+
+    # Artefatos pedidos que não puderam ser gerados (código de saída 1)
+    falhas = []
 
     # 1. Gerar HTML interativo
-    html = gerar_html_interativo()
-    html_path = "/home/robson/Documentos/projetos/codigo-fonte/DIAGRAMA-ECOSSISTEMA-INTERATIVO.html"
-    with open(html_path, "w", encoding="utf-8") as f:
-        f.write(html)
-    print(f"✅ HTML Interativo: {html_path}")
+    if "html" in destinos:
+        html_path = destinos["html"]
+        if atualizado("html"):
+            print(f"⏭️  HTML Interativo inalterado: {html_path}", file=log)
+        else:
+            nos = analise()[0]
+            with rastro.intervalo("html", grande=grande), saida.abrir(html_path) as f:
+                escrever_html_interativo(grafo, f, grande=grande, analise=nos,
+                                         sondagem=sondagem, trafego=trafego, runtime=runtime)
+            registrar("html")
+            print(f"✅ HTML Interativo: {html_path}", file=log)
 
     # 2. Tentar gerar PNG
-    png_path = gerar_png_estatico()
-    if png_path:
-        print(f"✅ PNG Estático: {png_path}")
-    else:
-        print("⚠️  PNG não gerado (dependências faltando)")
+    if "png" in destinos:
+        png_path = destinos["png"]
+        if atualizado("png"):
+            print(f"⏭️  PNG Estático inalterado: {png_path}", file=log)
+        elif not dependencias_png():
+            # Checado antes de abrir o destino: o PNG anterior fica intacto
+            print("⚠️  PNG não gerado: matplotlib/numpy não instalados "
+                  "(pip install matplotlib numpy)", file=sys.stderr)
+            if "png" in exigidos:
+                falhas.append("png")
+        else:
+            cache = os.path.join(args.out_dir, CACHE_ARQUIVO)
+            with rastro.intervalo("png"), saida.abrir(png_path, binario=True) as f:
+                gerar_png_estatico(grafo, f, caminho_cache=cache, sondagem=sondagem,
+                                   trafego=trafego, runtime=runtime)
+            registrar("png")
+            print(f"✅ PNG Estático: {png_path}", file=log)
 
     # 3. Exportar JSON
-    json_path = "/home/robson/Documentos/projetos/codigo-fonte/DIAGRAMA-ECOSSISTEMA-DATA.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(PROJETOS, f, indent=2, ensure_ascii=False)
-    print(f"✅ JSON Data: {json_path}")
-
-    print()
-    print("=" * 60)
-    print("RESUMO DOS PROJETOS ATIVOS")
-    print("=" * 60)
-    print()
-
-    # Resumo por tipo
-    tipos = {}
-    for key, proj in PROJETOS.items():
-        tipo = proj["tipo"]
-        if tipo not in tipos:
-            tipos[tipo] = []
-        tipos[tipo].append(proj)
-
-    for tipo, projs in tipos.items():
-        print(f"\n📁 {tipo.upper()} ({len(projs)})")
-        for p in projs:
-            porta = f":{p.get('porta', '-')}" if p.get('porta') else ""
-            print(f"   • {p['nome']:<20} {porta:<8} {p['descricao']}")
-
-    print()
-    print("=" * 60)
-    print(f"Gerado em: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print("=" * 60)
+    if "json" in destinos:
+        json_path = destinos["json"]
+        if atualizado("json"):
+            print(f"⏭️  JSON Data inalterado: {json_path}", file=log)
+        else:
+            nos = analise()[0]
+            dados = {chave: {**proj, "analise": nos[chave]} for chave, proj in PROJETOS.items()}
+            for chave, r in (vivo or {}).items():
+                dados[chave]["sonda"] = r
+            if volume:
+                for chave, m in volume["nos"].items():
+                    dados[chave]["trafego"] = {**m, "para": {}}
+                for aresta in volume["arestas"]:
+                    origem, destino = aresta.pop("origem"), aresta.pop("destino")
+                    dados[origem]["trafego"]["para"][destino] = aresta
+            for chave, m in (carga or {"nos": {}})["nos"].items():
+                dados[chave]["pm2"] = m
+            with rastro.intervalo("json"), saida.abrir(json_path) as f:
+                json.dump(dados, f, indent=2, ensure_ascii=False)
+            registrar("json")
+            print(f"✅ JSON Data: {json_path}", file=log)
+
+    # 4. Exportação colunar (.npy por coluna, sem numpy para gravar)
+    if "columnar" in destinos:
+        colunar_path = destinos["columnar"]
+        if atualizado("columnar"):
+            print(f"⏭️  Colunar inalterado: {colunar_path}", file=log)
+        else:
+            nos = analise()[0]
+            with rastro.intervalo("columnar"):
+                colunar.exportar(grafo, colunar_path, nos)
+            registrar("columnar")
+            print(f"✅ Colunar: {colunar_path}", file=log)
+
+    # Manifesto só quando algo foi para arquivo (no stdout puro nada é gravado)
+    if any(not saida.eh_stdout(caminho) for caminho in destinos.values()):
+        os.makedirs(args.out_dir, exist_ok=True)
+        manifesto.salvar()
+
+    if args.summary:
+        imprimir_resumo(grafo, log, analise())
+
+    print(file=log)
+    print("=" * 60, file=log)
+    print(f"Gerado em: {datetime.now().strftime('%Y-%m-%d %H:%M')}", file=log)
+    print("=" * 60, file=log)
 
     # Abrir HTML no navegador
-    import webbrowser
-    webbrowser.open(f"file://{html_path}")
+    saida.abrir_navegador(destinos.get("html"), args)
+    if falhas:
+        print(f"❌ Não gerados: {', '.join(falhas)}", file=sys.stderr)
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -4,13 +4,56 @@ ECOSSISTEMA INVISTTO - Diagrama de Arquitetura
 Gerado em: 2026-01-24
 Autor: Claude (análise automatizada)
 
-Execução: python3 ECOSSISTEMA-INVISTTO.py
-Saída: ECOSSISTEMA-INVISTTO.html (abre automaticamente no navegador)
+Execução: python3 ECOSSISTEMA-INVISTTO.py [--html [DESTINO]] [--json [DESTINO]]
+          [--out-dir DIR] [--no-open] [--force] [--diagram mermaid|svg]
+          [--scan RAIZ [--workers N] [--watch]]
+Saída: ECOSSISTEMA-INVISTTO.html (abre automaticamente no navegador, exceto
+       com --no-open) e ECOSSISTEMA-INVISTTO.json; DESTINO '-' = stdout
+
+--scan: extrai portas, versões, endpoints, modelos e exports do código-fonte
+em RAIZ (ecossistema.varredura) e mescla sobre ECOSYSTEM_DATA. Os fatos de
+cada arquivo ficam em cache (.ECOSSISTEMA-INVISTTO.varredura.sqlite, em
+--out-dir) e só o que mudou é relido; --watch regera a cada arquivo salvo.
+
+O diagrama de arquitetura é gerado dos dados (ecossistema.fluxograma), com
+camadas grandes recolhidas num nó; --diagram svg entrega o layout já
+calculado, sem rodar o Mermaid no navegador.
+
+--trace ARQUIVO grava o tempo de cada etapa (varredura, validação, contexto,
+template, JSON) como trace do Chrome ou do speedscope (ecossistema.rastro);
+--trace-profile roda cada etapa sob cProfile.
+
+ECOSYSTEM_DATA é validado inteiro antes de gerar qualquer artefato
+(ecossistema.modelo): todos os campos ausentes ou inválidos são listados de
+uma vez e o script sai com código 1.
+
+Lote (um JSON por cliente): python3 -m ecossistema.lote <dir> --out-dir <saida>
+Diferenças entre dois JSONs: python3 -m ecossistema.diff ANTIGO.json NOVO.json [--html]
 """
 
+import argparse
+import html
 import json
+import os
+import sys
+import time
 from datetime import datetime
 
+from ecossistema import fluxograma, modelo, portas, prisma, rastro, rotas, saida
+from ecossistema.build import ManifestoBuild, hash_entradas
+from ecossistema.template import compile_template
+
+# Versão do gerador: entra no hash do cache de build (mudou o código, mude aqui)
+GENERATOR_VERSION = "7"
+
+OUTPUT_DIR = "/home/robson/Documentos/projetos/codigo-fonte"
+HTML_FILENAME = "ECOSSISTEMA-INVISTTO.html"
+JSON_FILENAME = "ECOSSISTEMA-INVISTTO.json"
+SCAN_CACHE_FILENAME = ".ECOSSISTEMA-INVISTTO.varredura.sqlite"
+
+# Intervalo (s) entre as verificações do --watch
+WATCH_INTERVAL_S = 0.2
+
 # ============================================================================
 # DADOS DO ECOSSISTEMA (extraídos via análise rigorosa)
 # ============================================================================
@@ -30,6 +73,7 @@ ECOSYSTEM_DATA = {
     "frontends": {
         "invistto-hub": {
             "name": "Invistto Hub",
+            "tier": "hub",
             "description": "Central Hub - SSO Gateway para todos os apps",
             "port": 5173,
             "production_path": "/hub/",
@@ -49,6 +93,7 @@ ECOSYSTEM_DATA = {
         },
         "admin-panel-v2": {
             "name": "Admin Panel",
+            "package": "@admin-panel/web",
             "description": "Painel administrativo - Gestão de usuários, bases, roles",
             "port": 5173,
             "production_path": "/admin/",
@@ -140,6 +185,7 @@ ECOSYSTEM_DATA = {
             "name": "Auth API",
             "description": "Autenticação centralizada - JWT, SSO, password reset",
             "port": 3001,
+            "tier": "auth",
             "framework": "NestJS 10.x",
             "orm": "MySQL2 (raw queries)",
             "database": "MySQL (painel.invistto.com:3305/invistto)",
@@ -159,6 +205,7 @@ ECOSYSTEM_DATA = {
         },
         "admin-panel-api": {
             "name": "Admin Panel API",
+            "package": "@admin-panel/api",
             "description": "Backend do painel administrativo",
             "port": 3002,
             "framework": "NestJS 10.x",
@@ -440,12 +487,12 @@ HTML_TEMPLATE = """
     <script src="https://cdn.tailwindcss.com"></script>
     <script src="https://unpkg.com/mermaid@10/dist/mermaid.min.js"></script>
     <style>
-        .card {{ transition: all 0.3s ease; }}
-        .card:hover {{ transform: translateY(-2px); box-shadow: 0 10px 40px rgba(0,0,0,0.1); }}
-        .mermaid {{ background: #f8fafc; border-radius: 8px; padding: 20px; }}
-        details summary {{ cursor: pointer; }}
-        details summary::-webkit-details-marker {{ display: none; }}
-        .port-badge {{ font-family: monospace; }}
+        .card { transition: all 0.3s ease; }
+        .card:hover { transform: translateY(-2px); box-shadow: 0 10px 40px rgba(0,0,0,0.1); }
+        .mermaid { background: #f8fafc; border-radius: 8px; padding: 20px; }
+        details summary { cursor: pointer; }
+        details summary::-webkit-details-marker { display: none; }
+        .port-badge { font-family: monospace; }
     </style>
 </head>
 <body class="bg-gray-50 min-h-screen">
@@ -453,19 +500,19 @@ HTML_TEMPLATE = """
         <!-- Header -->
         <header class="text-center mb-12">
             <h1 class="text-4xl font-bold text-gray-900 mb-2">🏗️ Ecossistema Invistto</h1>
-            <p class="text-gray-600">Mapa completo de arquitetura - Gerado em {generated_at}</p>
+            <p class="text-gray-600">Mapa completo de arquitetura - Gerado em {{generated_at}}</p>
             <div class="flex justify-center gap-4 mt-4">
                 <span class="bg-blue-100 text-blue-800 px-3 py-1 rounded-full text-sm">
-                    {total_projects} Projetos
+                    {{total_projects}} Projetos
                 </span>
                 <span class="bg-green-100 text-green-800 px-3 py-1 rounded-full text-sm">
-                    {active_projects} Ativos
+                    {{active_projects}} Ativos
                 </span>
                 <span class="bg-purple-100 text-purple-800 px-3 py-1 rounded-full text-sm">
-                    {databases} Bancos de Dados
+                    {{databases}} Bancos de Dados
                 </span>
                 <span class="bg-orange-100 text-orange-800 px-3 py-1 rounded-full text-sm">
-                    ~{total_tables} Tabelas
+                    ~{{total_tables}} Tabelas
                 </span>
             </div>
         </header>
@@ -474,79 +521,7 @@ HTML_TEMPLATE = """
         <section class="mb-12">
             <h2 class="text-2xl font-bold text-gray-800 mb-4">📊 Diagrama de Arquitetura</h2>
             <div class="bg-white rounded-xl shadow-lg p-6 overflow-x-auto">
-                <div class="mermaid">
-flowchart TB
-    subgraph HUB["🏠 INVISTTO HUB (SSO Gateway)"]
-        HUB_WEB["Web :5173"]
-        HUB_DESK["Desktop (Tauri)"]
-        HUB_MOB["Mobile (Capacitor)"]
-    end
-
-    subgraph AUTH["🔐 AUTH API :3001"]
-        AUTH_JWT["JWT + Cookies"]
-        AUTH_SSO["SSO (30s codes)"]
-    end
-
-    subgraph FRONTENDS["🖥️ APLICAÇÕES FRONTEND"]
-        ADMIN["Admin Panel\\n:5173 → /admin/"]
-        COURIER["Courier Analytics\\n:3008 → /courier/"]
-        BI["Invistto BI\\n:3007 → /bi/"]
-        ZEISS_F["Zeiss Client\\n:3006 → /zeiss/"]
-        LENS_F["OlhoVivo Lens\\n:3009 → /lentes/"]
-    end
-
-    subgraph BACKENDS["⚙️ APIS BACKEND"]
-        ADMIN_API["Admin API\\n:3002"]
-        COURIER_API["Courier API\\n:3333"]
-        ARI["ARI Analytics\\n:3010"]
-        ZEISS_B["Zeiss API\\n:3005"]
-        LENS_B["Lens API\\n:3015"]
-        SALES["Sales API\\n:3011"]
-    end
-
-    subgraph SERVICES["🔧 SERVIÇOS AUXILIARES"]
-        AI["AI Service\\n:3003"]
-        AI_BILL["AI Billing\\n:3004"]
-        WA["WhatsApp\\n:3007"]
-        MCP["ServerMCP\\n:3002"]
-    end
-
-    subgraph DATA["💾 DADOS"]
-        MYSQL[("MySQL\\npainel.invistto.com:3305")]
-        FB[("Firebird\\nERPs Legados")]
-        REDIS[("Redis\\nlocalhost:6379")]
-    end
-
-    HUB --> AUTH
-    FRONTENDS --> AUTH
-
-    ADMIN --> ADMIN_API
-    COURIER --> COURIER_API
-    BI --> ARI
-    ZEISS_F --> ZEISS_B
-    LENS_F --> LENS_B
-
-    BACKENDS --> MYSQL
-    BACKENDS --> FB
-
-    AI --> AI_BILL
-    MCP --> ARI
-    WA --> REDIS
-
-    classDef hub fill:#3b82f6,stroke:#1d4ed8,color:#fff
-    classDef auth fill:#ef4444,stroke:#dc2626,color:#fff
-    classDef frontend fill:#10b981,stroke:#059669,color:#fff
-    classDef backend fill:#8b5cf6,stroke:#7c3aed,color:#fff
-    classDef service fill:#f59e0b,stroke:#d97706,color:#fff
-    classDef data fill:#6366f1,stroke:#4f46e5,color:#fff
-
-    class HUB_WEB,HUB_DESK,HUB_MOB hub
-    class AUTH_JWT,AUTH_SSO auth
-    class ADMIN,COURIER,BI,ZEISS_F,LENS_F frontend
-    class ADMIN_API,COURIER_API,ARI,ZEISS_B,LENS_B,SALES backend
-    class AI,AI_BILL,WA,MCP service
-    class MYSQL,FB,REDIS data
-                </div>
+                {{architecture_diagram}}
             </div>
         </section>
 
@@ -554,7 +529,7 @@ flowchart TB
         <section class="mb-12">
             <h2 class="text-2xl font-bold text-gray-800 mb-4">🖥️ Aplicações Frontend</h2>
             <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-                {frontend_cards}
+                {{frontend_cards}}
             </div>
         </section>
 
@@ -562,7 +537,7 @@ flowchart TB
         <section class="mb-12">
             <h2 class="text-2xl font-bold text-gray-800 mb-4">⚙️ APIs Backend</h2>
             <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-                {backend_cards}
+                {{backend_cards}}
             </div>
         </section>
 
@@ -570,7 +545,7 @@ flowchart TB
         <section class="mb-12">
             <h2 class="text-2xl font-bold text-gray-800 mb-4">🔧 Serviços Auxiliares</h2>
             <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
-                {service_cards}
+                {{service_cards}}
             </div>
         </section>
 
@@ -578,15 +553,15 @@ flowchart TB
         <section class="mb-12">
             <h2 class="text-2xl font-bold text-gray-800 mb-4">💾 Bancos de Dados</h2>
             <div class="grid grid-cols-1 md:grid-cols-3 gap-6">
-                {database_cards}
+                {{database_cards}}
             </div>
-        </section>
+        </section>{{schema_section}}
 
         <!-- Pacotes Compartilhados -->
         <section class="mb-12">
             <h2 class="text-2xl font-bold text-gray-800 mb-4">📦 Pacotes Compartilhados</h2>
             <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
-                {package_cards}
+                {{package_cards}}
             </div>
         </section>
 
@@ -595,7 +570,7 @@ flowchart TB
             <h2 class="text-2xl font-bold text-gray-800 mb-4">🔌 Mapa de Portas</h2>
             <div class="bg-white rounded-xl shadow-lg p-6">
                 <div class="grid grid-cols-2 md:grid-cols-4 lg:grid-cols-6 gap-3">
-                    {port_badges}
+                    {{port_badges}}
                 </div>
             </div>
         </section>
@@ -607,28 +582,28 @@ flowchart TB
             <div class="space-y-4">
                 <details class="bg-red-50 rounded-xl p-4 border border-red-200">
                     <summary class="font-bold text-red-800 flex items-center gap-2">
-                        🔴 Críticos ({critical_count})
+                        🔴 Críticos ({{critical_count}})
                     </summary>
                     <div class="mt-4 space-y-3">
-                        {critical_issues}
+                        {{critical_issues}}
                     </div>
                 </details>
 
                 <details class="bg-yellow-50 rounded-xl p-4 border border-yellow-200">
                     <summary class="font-bold text-yellow-800 flex items-center gap-2">
-                        🟡 Avisos ({warning_count})
+                        🟡 Avisos ({{warning_count}})
                     </summary>
                     <div class="mt-4 space-y-3">
-                        {warning_issues}
+                        {{warning_issues}}
                     </div>
                 </details>
 
                 <details class="bg-blue-50 rounded-xl p-4 border border-blue-200">
                     <summary class="font-bold text-blue-800 flex items-center gap-2">
-                        🔵 Melhorias ({improvement_count})
+                        🔵 Melhorias ({{improvement_count}})
                     </summary>
                     <div class="mt-4 space-y-3">
-                        {improvement_issues}
+                        {{improvement_issues}}
                     </div>
                 </details>
             </div>
@@ -674,181 +649,473 @@ flowchart TB
         <!-- Footer -->
         <footer class="text-center text-gray-500 py-8 border-t">
             <p>Gerado automaticamente por Claude Code</p>
-            <p class="text-sm mt-1">Última atualização: {generated_at}</p>
+            <p class="text-sm mt-1">Última atualização: {{generated_at}}</p>
         </footer>
     </div>
 
     <script>
-        mermaid.initialize({{{{ startOnLoad: true, theme: 'default' }}}});
+        mermaid.initialize({ startOnLoad: true, theme: 'default' });
     </script>
 </body>
 </html>
 """
 
-def generate_frontend_cards(frontends):
-    cards = []
-    for key, app in frontends.items():
-        platforms = ", ".join(app.get("platforms", ["Web"]))
-        card = f"""
+# Trechos repetidos por item; compilados uma única vez no carregamento
+FRONTEND_CARD = """
         <div class="card bg-white rounded-xl shadow-lg p-6 border-l-4 border-green-500">
             <div class="flex justify-between items-start mb-3">
-                <h3 class="font-bold text-lg text-gray-800">{app['name']}</h3>
-                <span class="port-badge bg-green-100 text-green-800 px-2 py-1 rounded text-sm">:{app['port']}</span>
+                <h3 class="font-bold text-lg text-gray-800">{{name}}</h3>
+                <span class="port-badge bg-green-100 text-green-800 px-2 py-1 rounded text-sm">:{{port}}</span>
             </div>
-            <p class="text-gray-600 text-sm mb-3">{app['description']}</p>
+            <p class="text-gray-600 text-sm mb-3">{{description}}</p>
             <div class="space-y-1 text-xs text-gray-500">
-                <p><strong>React:</strong> {app['react_version']}</p>
-                <p><strong>State:</strong> {app['state_management']}</p>
-                <p><strong>Path:</strong> {app.get('production_path', '/')}</p>
-                <p><strong>Plataformas:</strong> {platforms}</p>
+                <p><strong>React:</strong> {{react_version}}</p>
+                <p><strong>State:</strong> {{state_management}}</p>
+                <p><strong>Path:</strong> {{production_path}}</p>
+                <p><strong>Plataformas:</strong> {{platforms}}</p>
             </div>
         </div>
         """
-        cards.append(card)
-    return "\n".join(cards)
 
-def generate_backend_cards(backends):
-    cards = []
-    for key, api in backends.items():
-        features = ", ".join(api.get("features", [])[:3]) if api.get("features") else "N/A"
-        card = f"""
+BACKEND_CARD = """
         <div class="card bg-white rounded-xl shadow-lg p-6 border-l-4 border-purple-500">
             <div class="flex justify-between items-start mb-3">
-                <h3 class="font-bold text-lg text-gray-800">{api['name']}</h3>
-                <span class="port-badge bg-purple-100 text-purple-800 px-2 py-1 rounded text-sm">:{api['port']}</span>
+                <h3 class="font-bold text-lg text-gray-800">{{name}}</h3>
+                <span class="port-badge bg-purple-100 text-purple-800 px-2 py-1 rounded text-sm">:{{port}}</span>
             </div>
-            <p class="text-gray-600 text-sm mb-3">{api['description']}</p>
+            <p class="text-gray-600 text-sm mb-3">{{description}}</p>
             <div class="space-y-1 text-xs text-gray-500">
-                <p><strong>Framework:</strong> {api['framework']}</p>
-                <p><strong>ORM:</strong> {api['orm']}</p>
-                <p><strong>DB:</strong> {api.get('database', 'N/A')[:40]}...</p>
+                <p><strong>Framework:</strong> {{framework}}</p>
+                <p><strong>ORM:</strong> {{orm}}</p>
+                <p><strong>DB:</strong> {{database}}...</p>
+                <p><strong>Endpoints:</strong> {{endpoints}}</p>
             </div>
         </div>
         """
-        cards.append(card)
-    return "\n".join(cards)
 
-def generate_service_cards(services):
-    cards = []
-    for key, svc in services.items():
-        card = f"""
+SERVICE_CARD = """
         <div class="card bg-white rounded-xl shadow-lg p-4 border-l-4 border-orange-500">
             <div class="flex justify-between items-start mb-2">
-                <h3 class="font-bold text-gray-800">{svc['name']}</h3>
-                <span class="port-badge bg-orange-100 text-orange-800 px-2 py-1 rounded text-xs">:{svc['port']}</span>
+                <h3 class="font-bold text-gray-800">{{name}}</h3>
+                <span class="port-badge bg-orange-100 text-orange-800 px-2 py-1 rounded text-xs">:{{port}}</span>
             </div>
-            <p class="text-gray-600 text-xs">{svc['description']}</p>
+            <p class="text-gray-600 text-xs">{{description}}</p>
+        </div>
+        """
+
+DATABASE_CARD = """
+        <div class="card bg-white rounded-xl shadow-lg p-6 border-l-4 border-{{color}}-500">
+            <h3 class="font-bold text-lg text-gray-800 mb-2">{{name}}</h3>
+            <p class="text-gray-600 text-sm mb-3">{{host}}:{{port}}</p>
+            <p class="text-xs text-gray-500"><strong>Usado por:</strong> {{used_by}}</p>
+        </div>
+        """
+
+PACKAGE_CARD = """
+        <div class="card bg-white rounded-xl shadow-lg p-4 border-l-4 border-cyan-500">
+            <h3 class="font-bold text-gray-800 text-sm mb-1">{{key}}</h3>
+            <p class="text-gray-600 text-xs mb-2">{{description}}</p>
+            <p class="text-xs text-gray-400">Exports: {{exports}}</p>
+        </div>
+        """
+
+PORT_BADGE = """
+        <div class="bg-{{color}}-100 text-{{color}}-800 px-3 py-2 rounded-lg text-center">
+            <div class="font-mono font-bold">:{{port}}</div>
+            <div class="text-xs truncate">{{desc}}</div>
         </div>
         """
-        cards.append(card)
+
+ISSUE_ITEM = """
+        <div class="bg-white rounded-lg p-3">
+            <p class="font-semibold text-gray-800">{{issue}}</p>
+            <p class="text-sm text-gray-600 mt-1">{{details}}</p>
+            <p class="text-sm text-green-700 mt-1">💡 {{recommendation}}</p>
+        </div>
+        """
+
+# Seção de tabelas: só aparece se algum backend tem schema (ver --scan)
+SCHEMA_SECTION = """
+
+        <!-- Tabelas e Relacionamentos (schema.prisma) -->
+        <section class="mb-12">
+            <h2 class="text-2xl font-bold text-gray-800 mb-4">🗄️ Tabelas e Relacionamentos</h2>
+            <div class="space-y-6">
+                {{schema_cards}}
+            </div>
+        </section>"""
+
+SCHEMA_CARD = """
+                <div class="bg-white rounded-xl shadow-lg p-6 overflow-x-auto">
+                    <h3 class="font-bold text-lg text-gray-800 mb-1">{{name}}</h3>
+                    <p class="text-gray-600 text-sm mb-3">{{tables}} tabelas, {{relations}} relacionamentos</p>
+                    {{diagram}}
+                    <p class="text-xs text-gray-500 mt-3"><strong>Sem relacionamentos:</strong> {{isolated}}</p>
+                </div>
+        """
+
+_frontend_card = compile_template(FRONTEND_CARD)
+_backend_card = compile_template(BACKEND_CARD)
+_service_card = compile_template(SERVICE_CARD)
+_database_card = compile_template(DATABASE_CARD)
+_package_card = compile_template(PACKAGE_CARD)
+_port_badge = compile_template(PORT_BADGE)
+_issue_item = compile_template(ISSUE_ITEM)
+_schema_section = compile_template(SCHEMA_SECTION)
+_schema_card = compile_template(SCHEMA_CARD)
+
+def generate_frontend_cards(frontends):
+    cards = []
+    for app in frontends:
+        cards.append(_frontend_card.render({
+            "name": app.name,
+            "port": app.port,
+            "description": app.description,
+            "react_version": app.react_version,
+            "state_management": app.state_management,
+            "production_path": app.production_path,
+            "platforms": ", ".join(app.platforms),
+        }))
+    return "\n".join(cards)
+
+def generate_backend_cards(backends, routes):
+    counts = routes.contagem()
+    cards = []
+    for api in backends:
+        cards.append(_backend_card.render({
+            "name": api.name,
+            "port": api.port,
+            "description": api.description,
+            "framework": api.framework,
+            "orm": api.orm,
+            "database": api.database[:40],
+            # Contado pelo índice quando há lista; senão o total informado à mão
+            "endpoints": counts.get(api.chave, api.endpoints_count),
+        }))
     return "\n".join(cards)
 
+def generate_service_cards(services):
+    return "\n".join(_service_card.render({
+        "name": svc.name,
+        "port": svc.port,
+        "description": svc.description,
+    }) for svc in services)
+
 def generate_database_cards(databases):
     cards = []
     colors = {"mysql_main": "indigo", "firebird_erp": "amber", "redis": "rose"}
-    for key, db in databases.items():
-        color = colors.get(key, "gray")
-        used_by = ", ".join(db.get("used_by", [])[:4]) if db.get("used_by") else "N/A"
-        card = f"""
-        <div class="card bg-white rounded-xl shadow-lg p-6 border-l-4 border-{color}-500">
-            <h3 class="font-bold text-lg text-gray-800 mb-2">{db['name']}</h3>
-            <p class="text-gray-600 text-sm mb-3">{db.get('host', '')}:{db.get('port', '')}</p>
-            <p class="text-xs text-gray-500"><strong>Usado por:</strong> {used_by}</p>
-        </div>
-        """
-        cards.append(card)
+    for db in databases:
+        cards.append(_database_card.render({
+            "color": colors.get(db.chave, "gray"),
+            "name": db.name,
+            "host": db.host,
+            "port": db.port,
+            "used_by": ", ".join(db.used_by[:4]) or "N/A",
+        }))
     return "\n".join(cards)
 
+def generate_schema_section(backends):
+    """erDiagram de cada backend com schema.prisma escaneado ("" se nenhum)"""
+    cards = []
+    for api in backends:
+        if not api.schema:
+            continue
+        schema = prisma.EsquemaPrisma.de_dict(api.schema)
+        diagram, isolated = prisma.mermaid_er(schema)
+        cards.append(_schema_card.render({
+            "name": api.name,
+            "tables": len(schema),
+            "relations": len(schema.rel_origem),
+            "diagram": (f'<div class="mermaid">\n{html.escape(diagram, quote=False)}\n                    </div>'
+                        if schema.rel_origem else ""),
+            "isolated": ", ".join(isolated) or "nenhuma",
+        }))
+    if not cards:
+        return ""
+    return _schema_section.render({"schema_cards": "\n".join(cards)})
+
 def generate_package_cards(packages):
     cards = []
-    for key, pkg in packages.items():
-        exports = ", ".join(pkg.get("exports", [])[:3])
-        card = f"""
-        <div class="card bg-white rounded-xl shadow-lg p-4 border-l-4 border-cyan-500">
-            <h3 class="font-bold text-gray-800 text-sm mb-1">{key}</h3>
-            <p class="text-gray-600 text-xs mb-2">{pkg['description']}</p>
-            <p class="text-xs text-gray-400">Exports: {exports}</p>
-        </div>
-        """
-        cards.append(card)
+    for pkg in packages:
+        cards.append(_package_card.render({
+            "key": pkg.chave,
+            "description": pkg.description,
+            "exports": ", ".join(pkg.exports[:3]),
+        }))
     return "\n".join(cards)
 
-def generate_port_badges(ports):
+TIER_COLORS = {"hub": "blue", "auth": "red", "frontend": "green", "backend": "purple",
+               "service": "orange", "database": "indigo"}
+
+def generate_port_badges(ports_index):
     badges = []
-    colors = {
-        "auth": "red", "frontend": "green", "backend": "purple",
-        "service": "orange", "data": "indigo"
-    }
-    for port, desc in sorted(ports.items()):
-        color = "gray"
-        if "auth" in desc.lower(): color = "red"
-        elif "frontend" in desc.lower() or port in [3006, 3007, 3008, 3009, 5173]: color = "green"
-        elif "api" in desc.lower() or "backend" in desc.lower(): color = "purple"
-        elif "service" in desc.lower(): color = "orange"
-
-        badge = f"""
-        <div class="bg-{color}-100 text-{color}-800 px-3 py-2 rounded-lg text-center">
-            <div class="font-mono font-bold">:{port}</div>
-            <div class="text-xs truncate">{desc[:20]}</div>
-        </div>
-        """
-        badges.append(badge)
+    for (host, port), services in ports_index.portas(portas.BASE).items():
+        # Cor da camada do primeiro serviço; porta compartilhada ganha ⚠️
+        desc = " / ".join(name for name, _ in services)
+        if len(services) > 1:
+            desc = "⚠️ " + desc
+        badges.append(_port_badge.render({
+            "color": TIER_COLORS.get(services[0][1], "gray"),
+            "port": port,
+            "desc": desc[:20],
+        }))
     return "\n".join(badges)
 
+def port_issues(ports_index):
+    """Avisos de portas com mais de um serviço (ver ecossistema.portas)"""
+    issues = []
+    for env, host, port, services in ports_index.conflitos():
+        free = ports_index.sugerir(env, host)
+        issues.append({
+            "issue": f"Porta {port} compartilhada ({env}, {host})",
+            "details": " / ".join(services),
+            "recommendation": (f"Mover um dos serviços para uma porta livre (ex.: {free[0]})"
+                               if free else "Mover um dos serviços para outra faixa"),
+        })
+    return issues
+
+def route_issues(routes):
+    """Avisos de rotas duplicadas ou sombreadas (ver ecossistema.rotas)"""
+    problems = routes.problemas()
+    issues = []
+    for dup in problems["duplicadas"]:
+        issues.append({
+            "issue": f"Rota duplicada em {dup['service']}",
+            "details": " / ".join(dup["endpoints"]),
+            "recommendation": "Remover ou renomear uma das rotas",
+        })
+    for shadow in problems["sombreadas"]:
+        issues.append({
+            "issue": f"Rota sombreada em {shadow['service']}",
+            "details": f"{shadow['endpoint']} nunca é alcançada: {shadow['shadowed_by']} vem antes",
+            "recommendation": "Declarar a rota literal antes da rota com parâmetro",
+        })
+    return issues
+
+DIAGRAM_FORMATS = ("mermaid", "svg")
+
+def generate_architecture_diagram(model, diagram="mermaid"):
+    """Fluxograma gerado dos dados: Mermaid no navegador ou SVG já posicionado"""
+    if diagram == "svg":
+        return fluxograma.svg(model)
+    text = html.escape(fluxograma.mermaid(model), quote=False)
+    return f'<div class="mermaid">\n{text}\n                </div>'
+
 def generate_issues(issues_list):
-    items = []
-    for issue in issues_list:
-        item = f"""
-        <div class="bg-white rounded-lg p-3">
-            <p class="font-semibold text-gray-800">{issue['issue']}</p>
-            <p class="text-sm text-gray-600 mt-1">{issue['details']}</p>
-            <p class="text-sm text-green-700 mt-1">💡 {issue['recommendation']}</p>
-        </div>
-        """
-        items.append(item)
-    return "\n".join(items)
+    return "\n".join(_issue_item.render(issue) for issue in issues_list)
+
+def template_context(model, diagram="mermaid"):
+    """Valores dos slots de HTML_TEMPLATE para um ECOSYSTEM_DATA já validado"""
+    routes = rotas.indexar(model.backends)
+    issues = dict(model.issues)
+    ports_index = portas.indexar(model)
+    issues["warnings"] = issues["warnings"] + route_issues(routes) + port_issues(ports_index)
+    with rastro.intervalo("architecture_diagram", diagram=diagram):
+        architecture = generate_architecture_diagram(model, diagram)
+    return {
+        "generated_at": model.meta["generated_at"][:19],
+        "total_projects": model.meta["total_projects"],
+        "active_projects": model.meta["active_projects"],
+        "databases": model.meta["databases"],
+        "total_tables": model.meta["total_tables"],
+        "architecture_diagram": architecture,
+        "frontend_cards": generate_frontend_cards(model.frontends),
+        "backend_cards": generate_backend_cards(model.backends, routes),
+        "service_cards": generate_service_cards(model.services),
+        "database_cards": generate_database_cards(model.databases),
+        "schema_section": generate_schema_section(model.backends),
+        "package_cards": generate_package_cards(model.packages),
+        "port_badges": generate_port_badges(ports_index),
+        "critical_count": len(issues["critical"]),
+        "warning_count": len(issues["warnings"]),
+        "improvement_count": len(issues["improvements"]),
+        "critical_issues": generate_issues(issues["critical"]),
+        "warning_issues": generate_issues(issues["warnings"]),
+        "improvement_issues": generate_issues(issues["improvements"])
+    }
+
+def validated(data):
+    """Ecossistema validado (ErroValidacao com todos os problemas)"""
+    if isinstance(data, modelo.Ecossistema):
+        return data
+    return modelo.validar_ecossistema(data)
+
+def render_html(data, diagram="mermaid"):
+    return compile_template(HTML_TEMPLATE).render(template_context(validated(data), diagram))
+
+def write_html(data, f, diagram="mermaid"):
+    with rastro.intervalo("context"):
+        context = template_context(validated(data), diagram)
+    with rastro.intervalo("template"):
+        compile_template(HTML_TEMPLATE).render_to(f.write, context)
+
+def write_json(data, f):
+    json.dump(data, f, indent=2, ensure_ascii=False)
+
+def load_ecosystem_json(path):
+    """Carrega um ECOSYSTEM_DATA exportado (chaves de ports_map voltam a int)"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if "ports_map" in data:
+        data["ports_map"] = {int(port): desc for port, desc in data["ports_map"].items()}
+    return data
+
+def cache_keys(data, diagram="mermaid"):
+    """Hash das entradas de cada artefato (generated_at não entra)"""
+    meta = {k: v for k, v in data.get("meta", {}).items() if k != "generated_at"}
+    inputs = {**data, "meta": meta}
+    templates = [HTML_TEMPLATE, FRONTEND_CARD, BACKEND_CARD, SERVICE_CARD,
+                 DATABASE_CARD, SCHEMA_SECTION, SCHEMA_CARD, PACKAGE_CARD, PORT_BADGE,
+                 ISSUE_ITEM]
+    return {
+        HTML_FILENAME: hash_entradas("html", GENERATOR_VERSION, inputs, templates, diagram),
+        JSON_FILENAME: hash_entradas("json", GENERATOR_VERSION, inputs),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gera o mapa de arquitetura do ecossistema Invistto",
+        epilog="Sem seletores, gera o HTML e o JSON.")
+    saida.adicionar_seletor(parser, "html", "gera o diagrama HTML")
+    saida.adicionar_seletor(parser, "json", "exporta ECOSYSTEM_DATA em JSON")
+    saida.adicionar_opcoes(parser, OUTPUT_DIR)
+    parser.add_argument("--force", action="store_true",
+                        help="regera todos os artefatos, ignorando os caches de build e de varredura")
+    parser.add_argument("--scan", metavar="RAIZ",
+                        help="mescla os dados extraídos do código-fonte em RAIZ")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="threads da varredura (padrão: do Python)")
+    parser.add_argument("--diagram", choices=DIAGRAM_FORMATS, default="mermaid",
+                        help="diagrama de arquitetura: Mermaid (layout no navegador) ou SVG "
+                             "pré-calculado (padrão: %(default)s)")
+    parser.add_argument("--watch", action="store_true",
+                        help="com --scan, regera os artefatos a cada arquivo salvo em RAIZ")
+    rastro.adicionar_opcoes(parser)
+    args = parser.parse_args(argv)
+    rastro.validar(parser, args)
+
+    if args.html is None and args.json is None:
+        args.html = args.json = saida.PADRAO
+    targets = {
+        name: saida.destino(value, args.out_dir, filename)
+        for name, value, filename in (("html", args.html, HTML_FILENAME),
+                                      ("json", args.json, JSON_FILENAME))
+        if value is not None
+    }
+    saida.validar(parser, targets)
+    if args.watch and not args.scan:
+        parser.error("--watch exige --scan")
+    if args.watch and any(saida.eh_stdout(path) for path in targets.values()):
+        parser.error("--watch não pode escrever no stdout")
+    log = saida.log(targets)
+
+    with rastro.sessao(args.trace, args.trace_format, args.trace_profile,
+                       "ECOSSISTEMA-INVISTTO", log):
+        return generate(args, targets, log)
+
+def generate(args, targets, log):
+    """Gera os artefatos de `targets` com as opções já validadas por main()"""
+    if args.scan:
+        from ecossistema import varredura
+        from ecossistema.cache_fatos import CacheFatos
+        scan_cache = CacheFatos(os.path.join(args.out_dir, SCAN_CACHE_FILENAME), forcar=args.force)
+
+    def scan():
+        """ECOSYSTEM_DATA com o código-fonte mesclado; só relê o que mudou"""
+        with rastro.intervalo("scan"):
+            scanned = varredura.escanear(args.scan, args.workers, scan_cache.ler)
+            scan_cache.salvar()
+            return varredura.mesclar(ECOSYSTEM_DATA, scanned)
+
+    def check(data):
+        """ECOSYSTEM_DATA validado, ou None com todos os erros no stderr"""
+        try:
+            with rastro.intervalo("validate"):
+                return modelo.validar_ecossistema(data)
+        except modelo.ErroValidacao as e:
+            print(f"❌ ECOSYSTEM_DATA inválido ({len(e.erros)} erros):", file=sys.stderr)
+            for error in e.erros:
+                print(f"   • {error}", file=sys.stderr)
+            return None
 
-def main():
     data = ECOSYSTEM_DATA
+    if args.scan:
+        start = time.perf_counter()
+        data = scan()
+        print(f"🔎 Varredura em {time.perf_counter() - start:.3f}s "
+              f"({scan_cache.extraidos} arquivos extraídos, {scan_cache.reaproveitados} do cache)",
+              file=log)
+    model = check(data)
+    if model is None:
+        return 1
+    keys = cache_keys(data, args.diagram)
+    manifest = ManifestoBuild(args.out_dir, "ECOSSISTEMA-INVISTTO", forcar=args.force)
+
+    def up_to_date(filename, path):
+        if saida.eh_stdout(path):
+            return False
+        artifact = saida.artefato_manifesto(filename, path, args.out_dir)
+        return manifest.atualizado(artifact, keys[filename], path)
 
-    html = HTML_TEMPLATE.format(
-        generated_at=data["meta"]["generated_at"][:19],
-        total_projects=data["meta"]["total_projects"],
-        active_projects=data["meta"]["active_projects"],
-        databases=data["meta"]["databases"],
-        total_tables=data["meta"]["total_tables"],
-        frontend_cards=generate_frontend_cards(data["frontends"]),
-        backend_cards=generate_backend_cards(data["backends"]),
-        service_cards=generate_service_cards(data["services"]),
-        database_cards=generate_database_cards(data["databases"]),
-        package_cards=generate_package_cards(data["shared_packages"]),
-        port_badges=generate_port_badges(data["ports_map"]),
-        critical_count=len(data["standardization_issues"]["critical"]),
-        warning_count=len(data["standardization_issues"]["warnings"]),
-        improvement_count=len(data["standardization_issues"]["improvements"]),
-        critical_issues=generate_issues(data["standardization_issues"]["critical"]),
-        warning_issues=generate_issues(data["standardization_issues"]["warnings"]),
-        improvement_issues=generate_issues(data["standardization_issues"]["improvements"])
-    )
-
-    output_path = "/home/robson/Documentos/projetos/codigo-fonte/ECOSSISTEMA-INVISTTO.html"
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html)
-
-    print(f"✅ Diagrama gerado: {output_path}")
-    print(f"📊 Total de projetos mapeados: {data['meta']['total_projects']}")
-    print(f"🔌 Portas em uso: {len(data['ports_map'])}")
-    print(f"⚠️  Problemas identificados: {len(data['standardization_issues']['critical']) + len(data['standardization_issues']['warnings']) + len(data['standardization_issues']['improvements'])}")
-
-    # Exportar também como JSON para referência
-    json_path = "/home/robson/Documentos/projetos/codigo-fonte/ECOSSISTEMA-INVISTTO.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    print(f"📄 Dados JSON: {json_path}")
+    def record(filename, path):
+        if not saida.eh_stdout(path):
+            manifest.registrar(saida.artefato_manifesto(filename, path, args.out_dir), keys[filename])
+
+    def build(model):
+        output_path = targets.get("html")
+        if output_path is not None:
+            if up_to_date(HTML_FILENAME, output_path):
+                print(f"⏭️  Diagrama inalterado: {output_path}", file=log)
+            else:
+                with rastro.intervalo("html"), saida.abrir(output_path) as f:
+                    write_html(model, f, args.diagram)
+                record(HTML_FILENAME, output_path)
+                print(f"✅ Diagrama gerado: {output_path}", file=log)
+
+        # Exportar também como JSON para referência
+        json_path = targets.get("json")
+        if json_path is not None:
+            if up_to_date(JSON_FILENAME, json_path):
+                print(f"⏭️  Dados JSON inalterados: {json_path}", file=log)
+            else:
+                with rastro.intervalo("json"), saida.abrir(json_path) as f:
+                    write_json(model.dados, f)
+                record(JSON_FILENAME, json_path)
+                print(f"📄 Dados JSON: {json_path}", file=log)
+
+        # Manifesto só quando algo foi para arquivo (no stdout puro nada é gravado)
+        if any(not saida.eh_stdout(path) for path in targets.values()):
+            os.makedirs(args.out_dir, exist_ok=True)
+            manifest.salvar()
+
+    build(model)
+    print(f"📊 Total de projetos mapeados: {data['meta']['total_projects']}", file=log)
+    print(f"🔌 Portas em uso: {len(portas.indexar(model).portas())}", file=log)
+    print(f"⚠️  Problemas identificados: {len(data['standardization_issues']['critical']) + len(data['standardization_issues']['warnings']) + len(data['standardization_issues']['improvements'])}", file=log)
 
     # Abrir no navegador
-    import webbrowser
-    webbrowser.open(f"file://{output_path}")
+    saida.abrir_navegador(targets.get("html"), args)
+
+    if args.watch:
+        # Polling: a cada intervalo só os stats dos arquivos são consultados
+        # (ver ecossistema.cache_fatos); regera só se as entradas mudaram
+        print(f"👀 Observando {args.scan} (Ctrl+C para sair)", file=log)
+        try:
+            while True:
+                time.sleep(WATCH_INTERVAL_S)
+                start = time.perf_counter()
+                data = scan()
+                new_keys = cache_keys(data, args.diagram)
+                if new_keys == keys:
+                    continue
+                keys = new_keys
+                model = check(data)
+                if model is None:
+                    continue
+                build(model)
+                print(f"🔄 Atualizado em {(time.perf_counter() - start) * 1000:.0f}ms", file=log)
+        except KeyboardInterrupt:
+            pass
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
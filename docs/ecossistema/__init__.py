@@ -0,0 +1,9 @@
+"""
+ECOSSISTEMA INVISTTO - Módulos de apoio
+=======================================
+Infraestrutura compartilhada pelos geradores DIAGRAMA-ECOSSISTEMA.py e
+ECOSSISTEMA-INVISTTO.py.
+
+Os submódulos são importados sob demanda pelos scripts; este pacote não
+importa nada no carregamento para manter o tempo de inicialização baixo.
+"""
@@ -0,0 +1,26 @@
+"""
+Fixtures compartilhadas: o pacote ecossistema importável a partir de docs/
+e projetos mínimos que passam na validação de PROJETOS.
+"""
+
+import os
+import sys
+
+import pytest
+
+DOCS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if DOCS_DIR not in sys.path:
+    sys.path.insert(0, DOCS_DIR)
+
+
+@pytest.fixture
+def projeto():
+    """Fábrica de projetos de PROJETOS com todos os campos obrigatórios"""
+
+    def criar(tipo, porta="", path_prod="", conecta=()):
+        return {"nome": tipo, "tipo": tipo, "porta": porta, "path_prod": path_prod,
+                "descricao": "", "stack": "", "status": "ativo", "cor": "#000000",
+                "conecta": list(conecta)}
+
+    return criar
@@ -0,0 +1,7 @@
+import { Controller, Delete } from '@nestjs/common';
+
+@Controller(`carrinho`)
+export class CarrinhoController {
+  @Delete(':id')
+  remover() {}
+}
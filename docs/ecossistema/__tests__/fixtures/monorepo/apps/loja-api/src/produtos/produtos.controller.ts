@@ -0,0 +1,19 @@
+import { Body, Controller, Get, Param, Post } from '@nestjs/common';
+
+@Controller('/produtos/')
+export class ProdutosController {
+  @Get()
+  listar() {}
+
+  @Get(':id')
+  buscar(@Param('id') id: string) {}
+
+  @Post()
+  criar(@Body() dto: unknown) {}
+}
+
+@Controller({ version: '1' })
+export class SaudeController {
+  @All("health")
+  saude() {}
+}
@@ -0,0 +1,2 @@
+const port = process.env.PORT ?? '3020';
+app.listen(port);
@@ -0,0 +1,14 @@
+module.exports = {
+  apps: [
+    {
+      name: 'loja-api',
+      script: 'dist/main.js',
+      env: { NODE_ENV: 'production', PORT: 3010 },
+    },
+    {
+      name: "worker",
+      script: 'dist/worker.js',
+      env: { PORT: '3099' },
+    },
+  ],
+};
@@ -0,0 +1,2 @@
+export function useCarrinho() {}
+export * from '../index';
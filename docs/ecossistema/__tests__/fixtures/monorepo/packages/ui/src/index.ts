@@ -0,0 +1,5 @@
+export { Botao, Card as Cartao } from './botoes';
+export type { Tema } from './tema';
+export * from './hooks';
+export * as tipos from './tipos';
+export const VERSAO = '1.0.0';
@@ -0,0 +1,2 @@
+export interface Produto {}
+export enum Status { Ativo }
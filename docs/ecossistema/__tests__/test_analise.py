@@ -0,0 +1,39 @@
+"""
+Análise do grafo: raio de impacto, ciclos e pontos únicos de falha (quem
+derruba frontends, nunca os próprios frontends).
+"""
+
+import pytest
+
+from ecossistema.analise import analisar
+from ecossistema.grafo import compilar_grafo
+
+
+@pytest.fixture
+def grafo(projeto):
+    return compilar_grafo({
+        "hub": projeto("frontend", conecta=["auth", "api"]),
+        "admin": projeto("frontend", conecta=["auth", "admin-api"]),
+        "auth": projeto("backend", conecta=["mysql"]),
+        "api": projeto("backend", conecta=["mysql", "mcp"]),
+        "admin-api": projeto("backend", conecta=["mysql"]),
+        "mcp": projeto("service", conecta=["api"]),
+        "mysql": projeto("database"),
+    })
+
+
+def test_impacto_e_ciclos(grafo):
+    nos, resumo = analisar(grafo)
+
+    assert (nos["mysql"]["impacto"], nos["mysql"]["frontends_afetados"]) == (6, 2)
+    assert sorted(nos["api"]["quebra"]) == ["hub"]
+    assert nos["hub"]["impacto"] == 0
+    assert resumo["ciclos"] == [["api", "mcp"]]
+
+
+def test_pontos_unicos_sao_dependencias_compartilhadas(grafo):
+    _, resumo = analisar(grafo)
+
+    # Banco e auth derrubam os dois frontends; os frontends nunca entram
+    assert resumo["pontos_unicos"][:2] == ["mysql", "auth"]
+    assert not {"hub", "admin"} & set(resumo["pontos_unicos"])
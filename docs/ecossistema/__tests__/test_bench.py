@@ -0,0 +1,33 @@
+"""
+Ecossistema sintético (determinístico e válido nos dois formatos) e uma
+rodada mínima do benchmark com comparação.
+"""
+
+import io
+
+from ecossistema import bench, modelo, sintetico
+
+
+def test_sintetico_deterministico_e_valido():
+    assert sintetico.projetos(200, seed=3) == sintetico.projetos(200, seed=3)
+    assert sintetico.projetos(200, seed=3) != sintetico.projetos(200, seed=4)
+
+    projetos = sintetico.projetos(200, seed=3)
+    assert len(projetos) == 200
+    assert all(destino in projetos for p in projetos.values() for destino in p["conecta"])
+    modelo.validar_projetos(projetos)
+    modelo.validar_ecossistema(sintetico.ecosystem_data(200, seed=3))
+
+
+def test_executar_e_comparar(tmp_path):
+    resultados = bench.executar([20], etapas={"render_html", "template"}, repeticoes=1,
+                                log=io.StringIO())
+    assert {(r["alvo"], r["etapa"]) for r in resultados} == {
+        ("diagrama", "render_html"), ("ecossistema", "template")}
+    assert all(r["segundos"] >= 0 and r["pico_bytes"] > 0 for r in resultados)
+
+    anterior = bench.relatorio(resultados, 0, 1)
+    pior = [{**r, "segundos": r["segundos"] * 10 + 1} for r in resultados]
+    regressoes = bench.comparar(anterior, bench.relatorio(pior, 0, 1), 1.25)
+    assert {(alvo, metrica) for alvo, _, _, metrica, _, _ in regressoes} == {
+        ("diagrama", "segundos"), ("ecossistema", "segundos")}
@@ -0,0 +1,56 @@
+"""
+Cache de build: artefato pulado enquanto o hash das entradas não muda,
+regerado quando muda, quando some do disco ou com --force.
+"""
+
+import json
+
+from ecossistema import scripts
+from ecossistema.build import ManifestoBuild, hash_entradas
+
+
+def test_manifesto(tmp_path):
+    artefato = tmp_path / "saida.json"
+    artefato.write_text("{}")
+    chave = hash_entradas("json", "1", {"b": 2, "a": 1})
+    assert chave == hash_entradas("json", "1", {"a": 1, "b": 2})
+
+    manifesto = ManifestoBuild(str(tmp_path), "teste")
+    assert not manifesto.atualizado("saida.json", chave, str(artefato))
+    manifesto.registrar("saida.json", chave)
+    manifesto.salvar()
+
+    relido = ManifestoBuild(str(tmp_path), "teste")
+    assert relido.atualizado("saida.json", chave, str(artefato))
+    assert not relido.atualizado("saida.json", hash_entradas("json", "2", {}), str(artefato))
+    assert not ManifestoBuild(str(tmp_path), "teste", forcar=True).atualizado(
+        "saida.json", chave, str(artefato))
+    artefato.unlink()
+    assert not relido.atualizado("saida.json", chave, str(artefato))
+
+
+def test_manifesto_corrompido_regera_tudo(tmp_path):
+    (tmp_path / ".teste.build.json").write_text("[1, 2")
+    assert ManifestoBuild(str(tmp_path), "teste").artefatos == {}
+
+
+def test_gerador_pula_json_inalterado(tmp_path, monkeypatch):
+    diagrama = scripts.carregar("diagrama")
+    argv = ["--json", "--out-dir", str(tmp_path), "--no-open"]
+    destino = tmp_path / "DIAGRAMA-ECOSSISTEMA-DATA.json"
+
+    diagrama.main(argv)
+    # Se o gerador rodar de novo, o marcador some
+    destino.write_text('"marcador"')
+    diagrama.main(argv)
+    assert json.loads(destino.read_text()) == "marcador"
+
+    chave = next(iter(diagrama.PROJETOS))
+    monkeypatch.setitem(diagrama.PROJETOS, chave,
+                        {**diagrama.PROJETOS[chave], "descricao": "alterada"})
+    diagrama.main(argv)
+    assert json.loads(destino.read_text())[chave]["descricao"] == "alterada"
+
+    destino.write_text('"marcador"')
+    diagrama.main(argv + ["--force"])
+    assert json.loads(destino.read_text()) != "marcador"
@@ -0,0 +1,61 @@
+"""
+Cache de fatos: tamanho e mtime iguais confiam no cache; mtime novo lê o
+arquivo e só reextrai se o SHA-1 mudou; a versão dos extratores invalida.
+"""
+
+import os
+
+from ecossistema import cache_fatos
+from ecossistema.varredura import extrair_vite
+
+
+def _reabrir(banco, cache):
+    cache.salvar()
+    return cache_fatos.CacheFatos(banco)
+
+
+def test_invalidacao_por_tamanho_mtime_e_sha1(tmp_path):
+    vite = tmp_path / "vite.config.ts"
+    vite.write_text("export default { server: { port: 5173 } }")
+    banco = str(tmp_path / "fatos.sqlite")
+
+    cache = cache_fatos.CacheFatos(banco)
+    assert cache.ler(str(vite), extrair_vite) == {"port": 5173}
+    cache = _reabrir(banco, cache)
+
+    # Mesmo tamanho e mesmo mtime: o arquivo nem é aberto (fato antigo)
+    st = os.stat(vite)
+    vite.write_text("export default { server: { port: 5174 } }")
+    os.utime(vite, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert cache.ler(str(vite), extrair_vite) == {"port": 5173}
+    assert (cache.extraidos, cache.reaproveitados) == (0, 1)
+
+    # Tocado: o hash mudou, então extrai de novo
+    os.utime(vite, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.ler(str(vite), extrair_vite) == {"port": 5174}
+    assert cache.extraidos == 1
+    cache = _reabrir(banco, cache)
+
+    # Tocado de novo sem mudar o conteúdo: lê, compara o hash e reaproveita
+    os.utime(vite, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    assert cache.ler(str(vite), extrair_vite) == {"port": 5174}
+    assert (cache.extraidos, cache.reaproveitados) == (0, 1)
+
+
+def test_versao_dos_extratores_e_arquivos_removidos(tmp_path, monkeypatch):
+    vite = tmp_path / "vite.config.ts"
+    vite.write_text("port: 3000")
+    banco = str(tmp_path / "fatos.sqlite")
+    cache = cache_fatos.CacheFatos(banco)
+    cache.ler(str(vite), extrair_vite)
+    cache.salvar()
+
+    monkeypatch.setattr(cache_fatos, "VERSAO_EXTRATORES", "outra")
+    assert cache_fatos.CacheFatos(banco).entradas == {}
+    monkeypatch.undo()
+
+    vite.unlink()
+    cache = cache_fatos.CacheFatos(banco)
+    assert len(cache.entradas) == 1
+    cache.salvar()
+    assert cache_fatos.CacheFatos(banco).entradas == {}
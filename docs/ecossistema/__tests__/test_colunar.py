@@ -0,0 +1,50 @@
+"""
+Exportação colunar: ida e volta com numpy.load e troca do diretório inteiro
+(sem colunas de uma exportação anterior).
+"""
+
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ecossistema import colunar  # noqa: E402
+from ecossistema.analise import analisar  # noqa: E402
+from ecossistema.grafo import compilar_grafo  # noqa: E402
+
+
+@pytest.fixture
+def grafo(projeto):
+    return compilar_grafo({
+        "hub": projeto("frontend", 5173, conecta=["auth", "api"]),
+        "auth": projeto("backend", 3001, conecta=["mysql"]),
+        "api": projeto("backend", 3002, conecta=["mysql"]),
+        "mysql": projeto("database"),
+    })
+
+
+def test_ida_e_volta(tmp_path, grafo):
+    destino = str(tmp_path / "grafo.colunar")
+    colunar.exportar(grafo, destino, analisar(grafo)[0])
+    tabela = colunar.carregar(destino)
+
+    assert tabela["_manifesto"]["n_nos"] == 4
+    assert [colunar.texto(tabela, "no_chave", i) for i in range(4)] == grafo.chaves
+    assert tabela["no_porta"].tolist() == [5173, 3001, 3002, -1]
+    assert tabela["no_impacto"].tolist() == [0, 1, 1, 3]
+    inicio, destinos = tabela["aresta_inicio"], tabela["aresta_destino"]
+    assert destinos[inicio[0]:inicio[1]].tolist() == [1, 2]
+    assert tabela["aresta_origem"].tolist() == [0, 0, 1, 2]
+    tipos = tabela["_manifesto"]["categorias"]["no_tipo"]
+    assert [tipos[c] for c in tabela["no_tipo"]] == ["frontend", "backend", "backend", "database"]
+
+
+def test_reexportar_sem_analise_nao_deixa_colunas_velhas(tmp_path, grafo):
+    destino = str(tmp_path / "grafo.colunar")
+    colunar.exportar(grafo, destino, analisar(grafo)[0])
+    colunar.exportar(grafo, destino + "/")
+
+    assert "no_impacto.npy" not in os.listdir(destino)
+    assert "no_impacto" not in colunar.carregar(destino)
+    assert os.listdir(tmp_path) == ["grafo.colunar"]
@@ -0,0 +1,62 @@
+"""
+Diff entre retratos: nós, arestas, portas e versões adicionados, removidos
+e alterados; a camada auth surgir no retrato novo não inventa arestas.
+"""
+
+import copy
+import json
+
+from ecossistema import diff
+
+ANTIGO = {
+    "frontends": {"hub": {"name": "Hub", "port": 5173, "auth": "@invistto/auth-react",
+                          "backend_port": 3010, "react_version": "18.3.1"}},
+    "backends": {"auth": {"name": "Auth", "port": 3001},
+                 "hub-api": {"name": "Hub API", "port": 3010}},
+    "services": {"mcp": {"name": "MCP", "port": 3002, "integrates_with": ["hub-api (3010)"]}},
+    "databases": {"mysql": {"name": "MySQL", "used_by": ["auth", "hub-api"]}},
+    "shared_packages": {"@invistto/auth-react": {"name": "auth-react"}},
+}
+
+
+def _novo():
+    novo = copy.deepcopy(ANTIGO)
+    novo["backends"]["auth"]["tier"] = "auth"      # só o tier: nenhuma aresta muda
+    novo["backends"]["bi-api"] = {"name": "BI API", "port": 3020}
+    del novo["services"]["mcp"]
+    novo["backends"]["hub-api"]["port"] = 3011
+    novo["frontends"]["hub"]["backend_port"] = 3011
+    novo["frontends"]["hub"]["react_version"] = "19.2.0"
+    novo["databases"]["mysql"]["used_by"] = ["auth", "bi-api"]
+    return novo
+
+
+def test_adicionados_removidos_e_alterados():
+    antigo, novo = diff.indexar(ANTIGO), diff.indexar(_novo())
+    delta = diff.comparar(antigo, novo)
+
+    assert delta["nos_adicionados"] == ["bi-api"]
+    assert delta["nos_removidos"] == ["mcp"]
+    assert delta["arestas_adicionadas"] == [("bi-api", "mysql")]
+    assert delta["arestas_removidas"] == [("hub-api", "mysql"), ("mcp", "hub-api")]
+    assert delta["portas"] == [("hub-api", 3010, 3011)]
+    assert delta["versoes"] == [("hub", "react_version", "18.3.1", "19.2.0")]
+    assert ("hub", "@invistto/auth-react") in novo.arestas
+    fluxo = diff.mermaid(delta, antigo, novo)
+    assert fluxo.count("==>") == 1 and fluxo.count("-.->") == 2
+
+
+def test_retratos_do_diagrama_e_codigo_de_saida(tmp_path):
+    antigo = {"hub": {"tipo": "frontend", "nome": "Hub", "porta": 5173, "conecta": ["auth"]},
+              "auth": {"tipo": "backend", "nome": "Auth", "porta": 3001, "conecta": []}}
+    novo = copy.deepcopy(antigo)
+    novo["hub"]["conecta"] = []
+    caminhos = []
+    for nome, dados in (("antigo.json", antigo), ("novo.json", novo)):
+        (tmp_path / nome).write_text(json.dumps(dados))
+        caminhos.append(str(tmp_path / nome))
+
+    assert diff.comparar(diff.carregar(caminhos[0]), diff.carregar(caminhos[1]))[
+        "arestas_removidas"] == [("hub", "auth")]
+    assert diff.main(caminhos + ["--no-open"]) == 1
+    assert diff.main([caminhos[0], caminhos[0], "--no-open"]) == 0
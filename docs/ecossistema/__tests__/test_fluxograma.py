@@ -0,0 +1,70 @@
+"""
+Fluxograma gerado do modelo: Mermaid de um ecossistema pequeno, camadas
+recolhidas acima do limiar e SVG bem formado.
+"""
+
+import copy
+import xml.etree.ElementTree as ET
+
+from ecossistema import fluxograma, modelo
+
+DADOS = {
+    "meta": {"generated_at": "", "total_projects": 2, "active_projects": 2,
+             "databases": 1, "total_tables": 0},
+    "frontends": {"hub": {"name": "Hub", "description": "", "port": 5173,
+                          "react_version": "18.3.1", "state_management": "Zustand",
+                          "backend_port": 3010, "production_path": "/hub"}},
+    "backends": {"hub-api": {"name": 'Hub "API"', "description": "", "port": 3010,
+                             "framework": "NestJS", "orm": "Prisma"}},
+    "services": {},
+    "databases": {"mysql": {"name": "MySQL", "host": "db", "port": 3306,
+                            "used_by": ["hub-api"]}},
+    "shared_packages": {},
+    "standardization_issues": {"critical": [], "warnings": [], "improvements": []},
+}
+
+
+def test_mermaid():
+    assert fluxograma.mermaid(modelo.validar_ecossistema(DADOS)).splitlines() == [
+        "flowchart TB",
+        '    subgraph FRONTEND["🖥️ APLICAÇÕES FRONTEND"]',
+        '        HUB["Hub<br/>:5173 → /hub"]',
+        "    end",
+        '    subgraph BACKEND["⚙️ APIS BACKEND"]',
+        '        HUB_API["Hub #quot;API#quot;<br/>:3010"]',
+        "    end",
+        '    subgraph DATABASE["💾 DADOS"]',
+        '        MYSQL[("MySQL<br/>db:3306")]',
+        "    end",
+        "",
+        "    HUB --> HUB_API",
+        "    HUB_API --> MYSQL",
+        "",
+        "    classDef frontend fill:#10b981,stroke:#059669,color:#fff",
+        "    class HUB frontend",
+        "    classDef backend fill:#8b5cf6,stroke:#7c3aed,color:#fff",
+        "    class HUB_API backend",
+        "    classDef database fill:#6366f1,stroke:#4f46e5,color:#fff",
+        "    class MYSQL database",
+    ]
+
+
+def test_camada_recolhida_soma_as_arestas():
+    dados = copy.deepcopy(DADOS)
+    dados["backends"]["bi-api"] = {"name": "BI API", "description": "", "port": 3020,
+                                   "framework": "NestJS", "orm": "Prisma"}
+    dados["databases"]["mysql"]["used_by"].append("bi-api")
+
+    linhas = fluxograma.mermaid(modelo.validar_ecossistema(dados), limiar=1).splitlines()
+
+    assert '        BACKEND_TODOS["⚙️ APIS BACKEND<br/>2 nós"]' in linhas
+    assert "    HUB --> BACKEND_TODOS" in linhas
+    assert "    BACKEND_TODOS -->|2| MYSQL" in linhas
+    assert not any("HUB_API" in linha for linha in linhas)
+
+
+def test_svg():
+    raiz = ET.fromstring(fluxograma.svg(modelo.validar_ecossistema(DADOS)))
+    textos = [t.text for t in raiz.iter("{http://www.w3.org/2000/svg}text")]
+
+    assert {"Hub", 'Hub "API"', "MySQL"} <= set(textos)
@@ -0,0 +1,34 @@
+"""
+Motor de forças: repulsão por grade próxima da exata, nós fixos parados e
+layout determinístico pela semente.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ecossistema import forca  # noqa: E402
+
+
+def test_repulsao_grade_aproxima_a_exata():
+    pos = np.random.default_rng(7).uniform(-1, 1, (1200, 2))
+    k = 1 / np.sqrt(len(pos))
+
+    exata = forca.repulsao_exata(pos, k)
+    grade = forca.repulsao_grade(pos, k)
+
+    erro = np.linalg.norm(grade - exata, axis=1) / np.linalg.norm(exata, axis=1)
+    assert np.median(erro) < 0.02
+
+
+def test_fixos_nao_se_movem_e_semente_repete():
+    origem, destino = [0, 1, 2, 3], [1, 2, 3, 4]
+    inicial = np.random.default_rng(1).uniform(-1, 1, (5, 2))
+    fixos = np.array([True, False, False, False, True])
+
+    pos = forca.layout_forca(5, origem, destino, pos=inicial.copy(), fixos=fixos)
+
+    assert np.array_equal(pos[fixos], inicial[fixos])
+    assert not np.allclose(pos[~fixos], inicial[~fixos])
+    assert np.array_equal(forca.layout_forca(5, origem, destino, seed=3),
+                          forca.layout_forca(5, origem, destino, seed=3))
@@ -0,0 +1,73 @@
+"""
+Grafo compilado: arrays CSR de sucessores (na ordem de "conecta") e de
+predecessores, graus, agrupamento por tipo e alvos repetidos em "conecta"
+contados uma vez.
+"""
+
+import pytest
+
+from ecossistema.analise import intermediacao
+from ecossistema.grafo import compilar_grafo
+from ecossistema.modelo import ErroValidacao
+
+
+@pytest.fixture
+def grafo(projeto):
+    return compilar_grafo({
+        "hub": projeto("frontend", conecta=["api", "auth", "fora-do-mapa"]),
+        "auth": projeto("backend", conecta=["mysql"]),
+        "api": projeto("backend", conecta=["mysql", "auth"]),
+        "mysql": projeto("database"),
+    })
+
+
+def test_sucessores_na_ordem_de_conecta(grafo):
+    hub, auth, api, mysql = (grafo.id(c) for c in ("hub", "auth", "api", "mysql"))
+
+    assert grafo.saida_inicio.tolist() == [0, 2, 3, 5, 5]
+    assert grafo.saida_destino.tolist() == [api, auth, mysql, mysql, auth]
+    assert list(grafo.sucessores(hub)) == [api, auth]
+    assert list(grafo.sucessores(mysql)) == []
+    assert list(grafo.arestas()) == [(hub, api), (hub, auth), (auth, mysql),
+                                     (api, mysql), (api, auth)]
+    assert grafo.n_arestas == 5
+
+
+def test_predecessores_espelham_as_arestas(grafo):
+    hub, auth, api, mysql = (grafo.id(c) for c in ("hub", "auth", "api", "mysql"))
+
+    assert grafo.entrada_inicio.tolist() == [0, 0, 2, 3, 5]
+    assert list(grafo.predecessores(hub)) == []
+    assert list(grafo.predecessores(auth)) == [hub, api]
+    assert list(grafo.predecessores(mysql)) == [auth, api]
+    assert [grafo.grau_entrada(i) for i in range(len(grafo))] == [0, 2, 1, 2]
+    assert [grafo.grau_saida(i) for i in range(len(grafo))] == [2, 1, 2, 0]
+    reversas = sorted((j, i) for i in range(len(grafo)) for j in grafo.predecessores(i))
+    assert reversas == sorted(grafo.arestas())
+
+
+def test_por_tipo(grafo):
+    assert {t: ids.tolist() for t, ids in grafo.por_tipo.items()} == {
+        "frontend": [0], "backend": [1, 2], "database": [3]}
+    assert grafo.tipos == ["frontend", "backend", "backend", "database"]
+
+
+def test_alvo_repetido_vira_uma_aresta(projeto):
+    def projetos(conecta):
+        return {"a": projeto("frontend", conecta=conecta), "b": projeto("backend", conecta=["d"]),
+                "c": projeto("backend", conecta=["d"]), "d": projeto("database")}
+
+    repetido = compilar_grafo(projetos(["b", "c", "b", "b"]))
+    unico = compilar_grafo(projetos(["b", "c"]))
+
+    assert list(repetido.arestas()) == list(unico.arestas()) == [(0, 1), (0, 2), (1, 3), (2, 3)]
+    assert list(repetido.predecessores(1)) == [0]
+    assert intermediacao(repetido) == intermediacao(unico)
+
+
+def test_projeto_invalido(projeto):
+    incompleto = projeto("backend")
+    del incompleto["descricao"]
+
+    with pytest.raises(ErroValidacao, match="descricao"):
+        compilar_grafo({"api": incompleto})
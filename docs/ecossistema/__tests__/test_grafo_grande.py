@@ -0,0 +1,54 @@
+"""
+HTML em modo grafo grande: escolha automática pelo limiar, grupos por tipo e
+arestas somadas entre tipos; a escrita em blocos não altera o documento.
+"""
+
+import io
+import json
+import re
+
+import pytest
+
+from ecossistema import scripts, sintetico
+
+
+@pytest.fixture
+def diagrama():
+    return scripts.carregar("diagrama")
+
+
+def _array(html, nome):
+    return json.loads(re.search(rf"const {nome} = (\[.*?\]);\n", html, re.S).group(1))
+
+
+def test_modo_automatico_pelo_limiar(diagrama, monkeypatch):
+    grafo = diagrama.compilar_grafo(sintetico.projetos(60))
+    assert not diagrama.modo_grande(grafo)
+    assert diagrama.modo_grande(grafo, True)
+
+    monkeypatch.setattr(diagrama, "LIMIAR_GRAFO_GRANDE", 50)
+    assert diagrama.modo_grande(grafo)
+    assert not diagrama.modo_grande(grafo, False)
+
+
+def test_grupos_e_ligacoes(diagrama):
+    grafo = diagrama.compilar_grafo(sintetico.projetos(300))
+    html = diagrama.gerar_html_interativo(grafo, grande=True)
+
+    assert len(_array(html, "nodes")) == 300
+    grupos = _array(html, "grupos")
+    assert {g["tipo"]: g["n"] for g in grupos} == {t: len(ids) for t, ids in grafo.por_tipo.items()}
+    entre_tipos = sum(1 for o, d in grafo.arestas() if grafo.tipos[o] != grafo.tipos[d])
+    assert sum(l["n"] for l in _array(html, "ligacoesGrupos")) == entre_tipos
+    assert "const grupos" not in diagrama.gerar_html_interativo(grafo, grande=False)
+
+
+def test_blocos_nao_alteram_o_documento(diagrama):
+    grafo = diagrama.compilar_grafo(sintetico.projetos(120))
+    analise = diagrama.analisar(grafo)[0]
+    documentos = []
+    for bloco in (1, 7, 1000):
+        f = io.StringIO()
+        diagrama.escrever_html_interativo(grafo, f, bloco=bloco, grande=True, analise=analise)
+        documentos.append(f.getvalue())
+    assert documentos[0] == documentos[1] == documentos[2]
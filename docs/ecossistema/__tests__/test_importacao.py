@@ -0,0 +1,40 @@
+"""
+Caminho leve: gerar só HTML/JSON/resumo não pode carregar as dependências
+pesadas do PNG (matplotlib, networkx, numpy).
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+DOCS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PESADOS = ("matplotlib", "networkx", "numpy")
+
+SONDA = """
+import json, sys
+sys.path.insert(0, {docs!r})
+from ecossistema import scripts
+diagrama = scripts.carregar("diagrama")
+diagrama.main({argv!r})
+print(json.dumps({{"modulos": sorted(sys.modules)}}))
+"""
+
+
+def _executar(saida, argv):
+    codigo = SONDA.format(docs=DOCS_DIR, argv=argv + ["--out-dir", str(saida), "--no-open"])
+    resultado = subprocess.run([sys.executable, "-c", codigo],
+                               capture_output=True, text=True, check=True)
+    return json.loads(resultado.stdout.strip().splitlines()[-1])
+
+
+def test_caminho_html_nao_importa_dependencias_pesadas(tmp_path):
+    sonda = _executar(tmp_path, ["--html", "--json", "--summary"])
+
+    carregados = [m for m in sonda["modulos"] if m.split(".")[0] in PESADOS]
+    assert not carregados, f"caminho só-HTML importou: {carregados[:5]}"
+    assert (tmp_path / "DIAGRAMA-ECOSSISTEMA-INTERATIVO.html").exists()
+    assert (tmp_path / "DIAGRAMA-ECOSSISTEMA-DATA.json").exists()
+    assert not (tmp_path / "DIAGRAMA-ECOSSISTEMA.png").exists()
+
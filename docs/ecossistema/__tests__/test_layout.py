@@ -0,0 +1,50 @@
+"""
+Layout incremental: com o cache quente, nós sem mudança (e fora da
+vizinhança da mudança) ficam exatamente onde estavam.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from ecossistema import layout  # noqa: E402
+from ecossistema.grafo import compilar_grafo  # noqa: E402
+
+CADEIA = "abcdefgh"
+
+
+def _projetos(projeto, extra=None):
+    projetos = {c: projeto("backend", conecta=[CADEIA[i + 1]] if i + 1 < len(CADEIA) else [])
+                for i, c in enumerate(CADEIA)}
+    if extra:
+        projetos.update(extra)
+    return projetos
+
+
+def _sem_layout(*args, **kwargs):
+    raise AssertionError("layout recalculado sem mudança")
+
+
+def test_cache_quente_sem_mudanca(tmp_path, projeto, monkeypatch):
+    cache = str(tmp_path / "layout.json")
+    grafo = compilar_grafo(_projetos(projeto))
+    primeiro = layout.layout_incremental(grafo, cache)
+
+    monkeypatch.setattr(layout, "_layout_completo", _sem_layout)
+    monkeypatch.setattr(layout, "_relaxar_local", _sem_layout)
+    assert layout.layout_incremental(grafo, cache) == primeiro
+
+
+def test_no_novo_so_mexe_na_vizinhanca(tmp_path, projeto, monkeypatch):
+    cache = str(tmp_path / "layout.json")
+    antes = layout.layout_incremental(compilar_grafo(_projetos(projeto)), cache)
+
+    monkeypatch.setattr(layout, "_layout_completo", _sem_layout)
+    grafo = compilar_grafo(_projetos(projeto, {"novo": projeto("service", conecta=["h"])}))
+    depois = layout.layout_incremental(grafo, cache)
+
+    # Mudaram "novo" e "h"; "g" relaxa, "f" é moldura fixa
+    for chave in "abcdef":
+        assert depois[chave] == antes[chave]
+    assert set(depois) == set(CADEIA) | {"novo"}
+    assert layout.carregar_cache(cache).keys() == depois.keys()
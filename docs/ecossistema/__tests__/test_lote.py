@@ -0,0 +1,52 @@
+"""
+Lote multi-tenant: um diretório de saída por cliente, erro de um cliente
+isolado dos demais, artefatos inalterados pulados na segunda rodada e PNG
+pedido sem matplotlib reportado como erro do cliente.
+"""
+
+import json
+import sys
+
+from ecossistema import lote, scripts, sintetico
+
+
+def test_lote(tmp_path):
+    clientes = tmp_path / "clientes"
+    clientes.mkdir()
+    dados = json.loads(json.dumps(scripts.carregar("ecossistema").ECOSYSTEM_DATA))
+    for nome in ("acme", "beta"):
+        (clientes / f"{nome}.json").write_text(json.dumps(dados))
+    (clientes / "quebrado.json").write_text(json.dumps({"frontends": []}))
+    saida = tmp_path / "saida"
+
+    resultados = lote.renderizar_lote(str(clientes), str(saida), workers=2)
+
+    assert [(nome, sorted(tempos), erro is None) for nome, tempos, erro in resultados] == [
+        ("acme", ["html", "json", "load"], True),
+        ("beta", ["html", "json", "load"], True),
+        ("quebrado", [], False),
+    ]
+    assert (saida / "acme" / "ECOSSISTEMA-INVISTTO.html").exists()
+    assert json.loads((saida / "beta" / "ECOSSISTEMA-INVISTTO.json").read_text()) == dados
+
+    segunda = lote.renderizar_lote(str(clientes), str(saida), workers=2)
+    assert [sorted(tempos) for _, tempos, _ in segunda[:2]] == [["load"], ["load"]]
+
+
+def test_png_sem_matplotlib_e_erro_do_cliente(tmp_path, monkeypatch):
+    dados = {**scripts.carregar("ecossistema").ECOSYSTEM_DATA, "projetos": sintetico.projetos(10)}
+    caminho = tmp_path / "acme.json"
+    caminho.write_text(json.dumps(dados))
+    monkeypatch.setitem(sys.modules, "matplotlib", None)
+
+    nome, tempos, erro = lote._renderizar_tenant(str(caminho), str(tmp_path / "acme"))
+
+    assert (nome, erro) == ("acme", "PNG exige matplotlib/numpy (pip install matplotlib numpy)")
+    assert "png" not in tempos
+    assert sorted(p.name for p in (tmp_path / "acme").iterdir()) == [
+        ".ECOSSISTEMA-INVISTTO.build.json", "ECOSSISTEMA-INVISTTO.html", "ECOSSISTEMA-INVISTTO.json"]
+
+    monkeypatch.undo()
+    nome, tempos, erro = lote._renderizar_tenant(str(caminho), str(tmp_path / "acme"))
+    assert (erro, list(tempos)) == (None, ["load", "png"])
+    assert (tmp_path / "acme" / "DIAGRAMA-ECOSSISTEMA.png").read_bytes()[:4] == b"\x89PNG"
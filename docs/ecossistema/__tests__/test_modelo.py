@@ -0,0 +1,65 @@
+"""
+Validação de ECOSYSTEM_DATA: todos os problemas de frontends, backends,
+bancos e ports_map saem numa única ErroValidacao, com o caminho de cada um.
+"""
+
+import copy
+
+import pytest
+
+from ecossistema import modelo
+
+VALIDO = {
+    "meta": {"generated_at": "", "total_projects": 2, "active_projects": 2,
+             "databases": 1, "total_tables": 0},
+    "frontends": {"hub": {"name": "Hub", "description": "", "port": 5173,
+                          "react_version": "18.3.1", "state_management": "Zustand",
+                          "backend_port": 3010}},
+    "backends": {"hub-api": {"name": "Hub API", "description": "", "port": 3010,
+                             "framework": "NestJS", "orm": "Prisma",
+                             "endpoints": ["GET /lojas"]}},
+    "services": {},
+    "databases": {"mysql": {"name": "MySQL", "host": "db", "port": 3306,
+                            "used_by": ["hub-api"]}},
+    "shared_packages": {},
+    "standardization_issues": {"critical": [], "warnings": [], "improvements": []},
+    "ports_map": {3010: "hub-api"},
+}
+
+
+def test_valido():
+    m = modelo.validar_ecossistema(VALIDO)
+
+    assert [s.chave for s in m.frontends + m.backends] == ["hub", "hub-api"]
+    assert m.backends[0].endpoints == ("GET /lojas",)
+    assert [(a.origem, a.destino) for a in m.arestas] == [("hub", "hub-api"),
+                                                          ("hub-api", "mysql")]
+
+
+def test_todos_os_erros_numa_passada():
+    dados = copy.deepcopy(VALIDO)
+    del dados["frontends"]["hub"]["react_version"]
+    dados["frontends"]["hub"]["port"] = "5173"
+    dados["backends"]["hub-api"]["port"] = 70000
+    dados["backends"]["hub-api"]["endpoints"] = ["GET /lojas", 7]
+    dados["backends"]["bi-api"] = ["não é objeto"]
+    del dados["databases"]["mysql"]["name"]
+    dados["databases"]["mysql"]["used_by"] = "hub-api"
+    dados["ports_map"]["x"] = "?"
+    del dados["standardization_issues"]["warnings"]
+
+    with pytest.raises(modelo.ErroValidacao) as erro:
+        modelo.validar_ecossistema(dados)
+
+    assert sorted(erro.value.erros) == sorted([
+        "frontends['hub'].react_version: campo obrigatório ausente",
+        "frontends['hub'].port: esperada porta entre 1 e 65535, veio '5173'",
+        "backends['hub-api'].port: esperada porta entre 1 e 65535, veio 70000",
+        "backends['hub-api'].endpoints: esperada lista de textos, veio 7",
+        "backends['bi-api']: esperado objeto, veio list",
+        "databases['mysql'].name: campo obrigatório ausente",
+        "databases['mysql'].used_by: esperado lista, veio 'hub-api'",
+        "ports_map['x']: esperada porta numérica",
+        "standardization_issues.warnings: campo obrigatório ausente",
+    ])
+    assert str(erro.value).startswith("9 erro(s) de validação: ")
@@ -0,0 +1,77 @@
+"""
+Snapshots do PM2: série colunar (instâncias somadas), percentis, cache .npz
+e junção aos projetos por nome e porta.
+"""
+
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ecossistema import pm2  # noqa: E402
+from ecossistema.grafo import compilar_grafo  # noqa: E402
+
+
+@pytest.fixture
+def grafo(projeto):
+    return compilar_grafo({
+        "admin-panel-api": projeto("backend", 3002),
+        "servermcp": projeto("service", 3002),
+        "invistto-auth": projeto("backend", 3001),
+    })
+
+
+def _processo(nome, cpu, mb, reinicios, porta=None, pm_id=0):
+    env = {"status": "online", "restart_time": reinicios, "pm_uptime": 0, "env": {}}
+    if porta:
+        env["env"]["PORT"] = porta
+    return {"name": nome, "pm_id": pm_id, "monit": {"cpu": cpu, "memory": mb * pm2.MB},
+            "pm2_env": env}
+
+
+def test_serie_reduzida_e_juntada(tmp_path, grafo):
+    serie = tmp_path / "pm2.jsonl"
+    with open(serie, "w") as f:
+        for i in range(100):
+            f.write(json.dumps([
+                # "admin" na porta 3002: o nome desempata contra servermcp
+                _processo("admin", i, 100, 2 + i // 50, porta=3002),
+                # Cluster: duas instâncias do mesmo app somam CPU e memória
+                _processo("invistto-auth", 1, 50, 0, pm_id=1),
+                _processo("invistto-auth", 2, 50, 0, pm_id=2),
+                _processo("cron", 0, 10, 0),
+            ]) + "\n")
+    # Um snapshot indentado (como o `pm2 prettylist`) em outro arquivo
+    (tmp_path / "ultimo.json").write_text(json.dumps([_processo("admin", 99, 100, 4, porta=3002)],
+                                                     indent=2))
+
+    runtime = pm2.ingerir([str(serie), str(tmp_path / "ultimo.json")], grafo)
+
+    admin = runtime.nos["admin-panel-api"]
+    assert admin["processo"] == "admin"
+    assert admin["amostras"] == 101
+    assert admin["cpu_p50"] == 50.0 and admin["cpu_max"] == 99.0
+    assert (admin["reinicios"], admin["reinicios_janela"]) == (4, 2)
+    auth = runtime.nos["invistto-auth"]
+    assert (auth["cpu_p95"], auth["rss_p95_mb"]) == (3.0, 100.0)
+    assert runtime.sem_projeto == ["cron"]
+    assert runtime.escalas_nos()["admin-panel-api"] == pm2.ESCALA_MAX
+    assert pm2.cor_cpu(0) == "#22c55e" and pm2.cor_cpu(250) == "#ef4444"
+
+
+def test_cache_npz_reaproveitado_ate_a_entrada_mudar(tmp_path):
+    snapshot = tmp_path / "jlist.json"
+    snapshot.write_text(json.dumps([_processo("invistto-auth", 5, 64, 1)]))
+    cache = str(tmp_path / pm2.CACHE_ARQUIVO)
+
+    primeira = pm2.carregar([str(snapshot)], cache)
+    assert os.path.exists(cache)
+    os.utime(cache, ns=(0, 0))
+    segunda = pm2.carregar([str(snapshot)], cache)
+    np.testing.assert_array_equal(primeira.cpu, segunda.cpu)
+    assert os.stat(cache).st_mtime_ns == 0  # veio do cache, não regravou
+
+    snapshot.write_text(json.dumps([_processo("invistto-auth", 7, 64, 1)] * 2))
+    assert pm2.carregar([str(snapshot)], cache).cpu[0, 0] == 14
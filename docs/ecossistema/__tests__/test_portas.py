@@ -0,0 +1,63 @@
+"""
+Índice de portas: conflito de dois serviços na mesma porta, faixas livres
+e a porta sugerida, no base e num ambiente sobreposto.
+"""
+
+import copy
+
+import pytest
+
+from ecossistema import modelo, portas, scripts
+
+
+def _servico(port, **extras):
+    return {"name": "", "description": "", "port": port, **extras}
+
+
+DATA = {
+    "meta": {"generated_at": "", "total_projects": 5, "active_projects": 5,
+             "databases": 0, "total_tables": 0},
+    "frontends": {"hub": _servico(3000, react_version="19", state_management="N/A")},
+    "backends": {"auth": _servico(3001, tier="auth", framework="NestJS", orm="Prisma"),
+                 "bi-api": _servico(3001, framework="NestJS", orm="Prisma")},
+    "services": {"mcp": _servico(3002), "sem-porta": _servico("")},
+    "databases": {},
+    "shared_packages": {},
+    "standardization_issues": {"critical": [], "warnings": [], "improvements": []},
+    "ports_map": {"3003": "legado", 3001: "auth (já indexada)"},
+    "environments": {"staging": {"host": "stg01",
+                                 "ports": {"bi-api": 13001, "mcp": {"host": "stg02"}}}},
+}
+
+
+def test_conflito_e_porta_sugerida():
+    indice = portas.indexar(modelo.validar_ecossistema(DATA))
+
+    assert indice.conflitos() == [("base", "localhost", 3001, ["auth", "bi-api"])]
+    assert indice.servicos(3001) == ["auth", "bi-api"]
+    assert indice.servicos(3003) == ["legado"]
+    assert indice.livres(faixa=(3000, 3010)) == [(3004, 3010)]
+    assert indice.sugerir(faixa=(3000, 3010), quantidade=2) == [3004, 3005]
+    # No staging o bi-api foi movido: sem conflito, tudo no host do ambiente
+    assert indice.servicos(3001, "staging", "stg01") == ["auth"]
+    assert indice.servicos(13001, "staging", "stg01") == ["bi-api"]
+    assert indice.servicos(3002, "staging", "stg02") == ["mcp"]
+
+
+def test_ambiente_invalido_falha_na_validacao():
+    dados = copy.deepcopy(DATA)
+    dados["environments"]["staging"]["ports"]["bi-api"] = "13001"
+
+    with pytest.raises(modelo.ErroValidacao) as erro:
+        modelo.validar_ecossistema(dados)
+    assert erro.value.erros == [
+        "environments['staging'].ports.bi-api: esperada porta entre 1 e 65535, veio '13001'"]
+
+
+def test_aviso_com_a_porta_livre():
+    eco = scripts.carregar("ecossistema")
+    [aviso] = eco.port_issues(portas.indexar(modelo.validar_ecossistema(DATA)))
+
+    assert aviso["issue"] == "Porta 3001 compartilhada (base, localhost)"
+    assert aviso["details"] == "auth / bi-api"
+    assert "3004" in aviso["recommendation"]
@@ -0,0 +1,84 @@
+"""
+Parser de schema.prisma: tabelas (@@map), colunas (@map) e o tipo de cada
+relação no erDiagram (1-1 por @unique, 1-n, n-m implícita, autorrelação).
+"""
+
+from ecossistema import prisma
+
+SCHEMA = """
+model User {
+  id       Int      @id @default(autoincrement())
+  email    String   @unique // "//" dentro de comentário
+  role     Role
+  profile  Profile?
+  posts    Post[]
+  @@map("users")
+}
+
+model Profile {
+  id     Int  @id
+  userId Int  @unique @map("user_id")
+  user   User @relation(fields: [userId], references: [id])
+}
+
+model Post {
+  id       Int   @id
+  authorId Int   @map("author_id")
+  author   User? @relation(fields: [authorId], references: [id])
+  tags     Tag[]
+}
+
+model Tag {
+  id    Int    @id
+  posts Post[]
+}
+
+model Employee {
+  id        Int        @id
+  managerId Int?
+  manager   Employee?  @relation("Gerencia", fields: [managerId], references: [id])
+  reports   Employee[] @relation("Gerencia")
+}
+
+enum Role {
+  ADMIN
+  USER
+}
+"""
+
+
+def _relacoes(e):
+    return {(e.modelos[o], e.modelos[d], e.campos[c], fks)
+            for o, d, c, fks in zip(e.rel_origem, e.rel_destino, e.rel_campo, e.rel_fks)}
+
+
+def test_modelos_campos_e_relacoes():
+    e = prisma.analisar(SCHEMA)
+
+    assert e.modelos == ["User", "Profile", "Post", "Tag", "Employee"]
+    assert e.tabelas == ["users", "Profile", "Post", "Tag", "Employee"]
+    campos = {(e.modelos[m], e.campos[c]): c for m in range(len(e)) for c in e.campos_de(m)}
+    assert e.colunas[campos["Profile", "userId"]] == "user_id"
+    assert e.flags[campos["User", "email"]] & prisma.UNICO
+    # Enum não é relação; a lista sem FK de um lado 1-n também não entra
+    assert not e.flags[campos["User", "role"]] & prisma.RELACAO
+    assert _relacoes(e) == {
+        ("Profile", "User", "user", "userId"),
+        ("Post", "User", "author", "authorId"),
+        ("Post", "Tag", "tags", ""),
+        ("Employee", "Employee", "manager", "managerId"),
+    }
+    assert prisma.EsquemaPrisma.de_dict(e.para_dict()).rel_fks == e.rel_fks
+
+
+def test_er_com_cardinalidades():
+    texto, isoladas = prisma.mermaid_er(prisma.analisar(SCHEMA))
+    linhas = set(texto.splitlines()[1:])
+
+    assert linhas == {
+        '    users ||--o| Profile : "user_id"',
+        '    users |o--o{ Post : "author_id"',
+        '    Tag }o--o{ Post : "tags"',
+        '    Employee |o--o{ Employee : "managerId"',
+    }
+    assert isoladas == []
@@ -0,0 +1,55 @@
+"""
+Rastro por etapa: desligado não registra nada; ligado, os intervalos
+aninhados saem como trace do Chrome e como perfil do speedscope.
+"""
+
+import io
+import json
+
+from ecossistema import rastro, scripts
+
+
+def test_desligado_devolve_contexto_nulo():
+    assert rastro.intervalo("a") is rastro.intervalo("b", x=1)
+
+
+def test_intervalos_aninhados_nos_dois_formatos(tmp_path):
+    with rastro.sessao(str(tmp_path / "t.json"), processo="teste", perfil=True,
+                       log=io.StringIO()) as r:
+        with rastro.intervalo("etapa", n=3):
+            with rastro.intervalo("interna"):
+                sum(range(1000))
+        try:
+            with rastro.intervalo("falha"):
+                raise KeyError("x")
+        except KeyError:
+            pass
+    assert rastro.intervalo("depois") is rastro.intervalo("fim")
+
+    eventos = {e["name"]: e for e in json.loads((tmp_path / "t.json").read_text())["traceEvents"]
+               if e["ph"] == "X"}
+    assert set(eventos) == {"teste", "etapa", "interna", "falha"}
+    etapa, interna = eventos["etapa"], eventos["interna"]
+    assert etapa["ts"] <= interna["ts"] and interna["ts"] + interna["dur"] <= etapa["ts"] + etapa["dur"]
+    assert etapa["args"]["n"] == 3 and etapa["args"]["perfil"]
+    assert "perfil" not in interna["args"]  # cProfile só nas etapas
+    assert eventos["falha"]["args"]["erro"] == "KeyError"
+    assert (tmp_path / "t.etapa.pstats").exists()
+
+    perfil = r.speedscope("teste")
+    nomes = [f["name"] for f in perfil["shared"]["frames"]]
+    marcas = [(m["type"], nomes[m["frame"]]) for m in perfil["profiles"][0]["events"]]
+    assert marcas == [("O", "teste"), ("O", "etapa"), ("O", "interna"), ("C", "interna"),
+                      ("C", "etapa"), ("O", "falha"), ("C", "falha"), ("C", "teste")]
+
+
+def test_trace_do_diagrama(tmp_path):
+    caminho = tmp_path / "diagrama.speedscope.json"
+    diagrama = scripts.carregar("diagrama")
+    diagrama.main(["--html", "--json", "--out-dir", str(tmp_path), "--no-open",
+                   "--trace", str(caminho)])
+
+    perfil = json.loads(caminho.read_text())
+    assert perfil["$schema"] == rastro.SPEEDSCOPE_SCHEMA
+    nomes = {f["name"] for f in perfil["shared"]["frames"]}
+    assert {"DIAGRAMA-ECOSSISTEMA", "compilar_grafo", "analise", "html", "nos_d3", "json"} <= nomes
@@ -0,0 +1,62 @@
+"""
+Trie de rotas: duplicadas, sombreadas (ordem de declaração do Express),
+compartilhadas, o dono de um caminho concreto e rotas ALL sombreando as
+dos outros métodos.
+"""
+
+from ecossistema.rotas import IndiceRotas
+
+
+def _indice():
+    indice = IndiceRotas()
+    for servico, endpoint in (
+        ("lojas-api", "GET /lojas/:id"),
+        ("lojas-api", "GET /lojas/stats"),       # sombreada por :id (declarada antes)
+        ("lojas-api", "GET /lojas/:lojaId"),     # duplicada de /lojas/:id
+        ("lojas-api", "GET /bases/ativas"),
+        ("lojas-api", "GET /bases/:id"),         # literal antes: não sombreia
+        ("lojas-api", "ALL /arquivos/*"),
+        ("bi-api", "GET /lojas/stats"),          # compartilhada entre serviços
+    ):
+        indice.adicionar(servico, endpoint)
+    return indice
+
+
+def test_problemas():
+    p = _indice().problemas()
+
+    assert p["duplicadas"] == [{"service": "lojas-api",
+                                "endpoints": ["GET /lojas/:id", "GET /lojas/:lojaId"]}]
+    assert p["sombreadas"] == [{"service": "lojas-api", "endpoint": "GET /lojas/stats",
+                                "shadowed_by": "GET /lojas/:id"}]
+    assert p["compartilhadas"] == [{"endpoint": "GET /lojas/stats",
+                                    "services": ["bi-api", "lojas-api"]}]
+
+
+def test_dono_segue_a_ordem_de_declaracao():
+    indice = _indice()
+
+    # Em lojas-api o :id declarado antes responde; bi-api só tem a literal
+    assert indice.dono("get", "/lojas/stats") == [("lojas-api", "GET /lojas/:id"),
+                                                 ("bi-api", "GET /lojas/stats")]
+    assert indice.dono("GET", "/bases/ativas?x=1") == [("lojas-api", "GET /bases/ativas")]
+    assert indice.dono("GET", "/bases/7") == [("lojas-api", "GET /bases/:id")]
+    assert indice.dono("POST", "/arquivos/a/b.pdf") == [("lojas-api", "ALL /arquivos/*")]
+    assert indice.dono("DELETE", "/lojas/1") == []
+    assert indice.contagem() == {"lojas-api": 6, "bi-api": 1}
+
+
+def test_rota_all_sombreia_os_outros_metodos():
+    indice = IndiceRotas()
+    for endpoint in ("GET /itens", "ALL /x/:id", "GET /x/1", "POST /x/:xId", "ALL /itens",
+                     "GET /arquivos/a", "ALL /arquivos/*"):
+        indice.adicionar("api", endpoint)
+
+    assert indice.dono("GET", "/x/1") == [("api", "ALL /x/:id")]
+    # GET antes de ALL não cobre os outros métodos; a rota ALL declarada
+    # depois não sombreia quem veio antes
+    assert indice.problemas()["sombreadas"] == [
+        {"service": "api", "endpoint": "GET /x/1", "shadowed_by": "ALL /x/:id"},
+        {"service": "api", "endpoint": "POST /x/:xId", "shadowed_by": "ALL /x/:id"},
+    ]
+    assert indice.problemas()["duplicadas"] == []
@@ -0,0 +1,40 @@
+"""
+Destinos dos artefatos: escrita atômica e PNG pedido sem matplotlib (o
+anterior fica intacto e o código de saída é 1).
+"""
+
+import sys
+
+import pytest
+
+from ecossistema import saida, scripts
+
+
+def test_falha_no_meio_mantem_o_arquivo_anterior(tmp_path):
+    caminho = tmp_path / "artefato.json"
+    caminho.write_text("anterior")
+    with pytest.raises(RuntimeError):
+        with saida.abrir(str(caminho)) as f:
+            f.write("novo, pela metade")
+            raise RuntimeError("falhou")
+    assert caminho.read_text() == "anterior"
+    assert [p.name for p in tmp_path.iterdir()] == ["artefato.json"]
+
+    with saida.abrir(str(caminho)) as f:
+        f.write("novo")
+    assert caminho.read_text() == "novo"
+
+
+def test_png_pedido_sem_matplotlib(tmp_path, monkeypatch):
+    png = tmp_path / "DIAGRAMA-ECOSSISTEMA.png"
+    png.write_bytes(b"\x89PNG anterior")
+    monkeypatch.setitem(sys.modules, "matplotlib", None)
+    diagrama = scripts.carregar("diagrama")
+
+    codigo = diagrama.main(["--png", "--json", "--out-dir", str(tmp_path), "--no-open"])
+
+    assert codigo == 1
+    assert png.read_bytes() == b"\x89PNG anterior"
+    assert (tmp_path / "DIAGRAMA-ECOSSISTEMA-DATA.json").exists()
+    # Sem seletores o PNG vem do padrão "tudo": só o aviso, sem falhar
+    assert diagrama.main(["--out-dir", str(tmp_path), "--no-open"]) is None
@@ -0,0 +1,123 @@
+"""
+Sonda contra servidores locais: estados, reaproveitamento de conexão e uma
+varredura de 500 alvos com as conexões abertas ao mesmo tempo.
+"""
+
+import asyncio
+import resource
+import socket
+import threading
+
+import pytest
+
+from ecossistema import sonda
+
+
+class Stubs:
+    """Servidores asyncio numa thread própria: ok (200), erro (500) e mudo"""
+
+    def __init__(self):
+        self.conexoes = 0
+        # Handlers mudos ativos agora e o maior número simultâneo já visto
+        self.mudos = 0
+        self.pico_mudos = 0
+        self.loop = asyncio.new_event_loop()
+        self.portas = {}
+        pronto = threading.Event()
+        threading.Thread(target=self._rodar, args=(pronto,), daemon=True).start()
+        pronto.wait()
+
+    def _rodar(self, pronto):
+        asyncio.set_event_loop(self.loop)
+        for nome, tratar in (("ok", self._http(200)), ("erro", self._http(500)),
+                             ("mudo", self._mudo)):
+            servidor = self.loop.run_until_complete(
+                asyncio.start_server(tratar, "127.0.0.1", 0, backlog=1024))
+            self.portas[nome] = servidor.sockets[0].getsockname()[1]
+        pronto.set()
+        self.loop.run_forever()
+
+    def _http(self, codigo):
+        async def tratar(leitor, escritor):
+            self.conexoes += 1
+            try:
+                while True:
+                    await leitor.readuntil(b"\r\n\r\n")
+                    escritor.write(f"HTTP/1.1 {codigo} X\r\nContent-Length: 0\r\n\r\n".encode())
+                    await escritor.drain()
+            except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+                pass
+            escritor.close()
+        return tratar
+
+    async def _mudo(self, leitor, escritor):
+        # Aceita e nunca responde; só fecha quando o cliente desiste
+        self.mudos += 1
+        self.pico_mudos = max(self.pico_mudos, self.mudos)
+        try:
+            await leitor.read()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.mudos -= 1
+        escritor.close()
+
+    def parar(self):
+        # Cancela as conexões ainda abertas antes de parar o loop
+        async def encerrar():
+            for tarefa in asyncio.all_tasks() - {asyncio.current_task()}:
+                tarefa.cancel()
+        asyncio.run_coroutine_threadsafe(encerrar(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+@pytest.fixture(scope="module")
+def stubs():
+    s = Stubs()
+    yield s
+    s.parar()
+
+
+def _porta_fechada():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_estados(stubs):
+    alvos = [
+        sonda.Alvo("ok", "127.0.0.1", stubs.portas["ok"], "/hub/"),
+        sonda.Alvo("erro", "127.0.0.1", stubs.portas["erro"], "/"),
+        sonda.Alvo("mudo", "127.0.0.1", stubs.portas["mudo"], "/"),
+        sonda.Alvo("tcp", "127.0.0.1", stubs.portas["mudo"]),
+        sonda.Alvo("fechada", "127.0.0.1", _porta_fechada(), "/"),
+    ]
+    r = sonda.sondar(alvos, timeout=0.3)
+
+    assert (r["ok"].estado, r["ok"].codigo) == (sonda.OK, 200)
+    assert (r["erro"].estado, r["erro"].codigo) == (sonda.DEGRADADO, 500)
+    assert (r["mudo"].estado, r["mudo"].erro) == (sonda.FORA, "timeout")
+    assert (r["tcp"].estado, r["tcp"].codigo) == (sonda.OK, None)
+    assert r["fechada"].estado == sonda.FORA
+
+
+def test_reaproveita_conexao_por_host(stubs):
+    antes = stubs.conexoes
+    alvos = [sonda.Alvo(f"s{i}", "127.0.0.1", stubs.portas["ok"], "/") for i in range(20)]
+    r = sonda.sondar(alvos, timeout=1.0, concorrencia=1)
+
+    assert all(x.estado == sonda.OK for x in r.values())
+    assert stubs.conexoes - antes == 1
+
+
+def test_varredura_de_500_em_paralelo(stubs):
+    if resource.getrlimit(resource.RLIMIT_NOFILE)[0] < 1200:
+        pytest.skip("limite de arquivos abertos baixo para 500 conexões simultâneas")
+    alvos = [sonda.Alvo(f"s{i}", "127.0.0.1", stubs.portas["mudo" if i % 2 else "ok"], "/")
+             for i in range(500)]
+    stubs.pico_mudos = 0
+    r = sonda.sondar(alvos, timeout=1.0)
+
+    assert sonda.contagem(r)[sonda.FORA] == 250
+    # Em série haveria um mudo por vez; em paralelo os 250 esperam juntos
+    assert stubs.pico_mudos >= 250
@@ -0,0 +1,32 @@
+"""
+Templates pré-compilados: slots {{nome}}, chaves de CSS/JS literais e cache
+pelo conteúdo.
+"""
+
+import io
+
+import pytest
+
+from ecossistema import template
+
+
+def test_render_e_render_to():
+    t = template.compile_template("<style>a { color: red }</style><p>{{ nome }} tem {{n}}</p>")
+
+    assert t.slots == ("nome", "n")
+    assert t.render({"nome": "hub", "n": 3}) == "<style>a { color: red }</style><p>hub tem 3</p>"
+    f = io.StringIO()
+    t.render_to(f.write, {"nome": "api", "n": 0})
+    assert f.getvalue() == "<style>a { color: red }</style><p>api tem 0</p>"
+    with pytest.raises(KeyError):
+        t.render({"nome": "hub"})
+
+
+def test_cache_pelo_conteudo():
+    template.clear_cache()
+    t = template.compile_template("{{a}}")
+
+    assert template.compile_template("{{" + "a}}") is t
+    assert template.compile_template("{{b}}") is not t
+    template.clear_cache()
+    assert template.compile_template("{{a}}") is not t
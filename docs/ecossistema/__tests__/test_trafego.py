@@ -0,0 +1,73 @@
+"""
+Ingestão de access logs: tokenizador, atribuição por caminho/porta,
+percentis do histograma e leitura igual em mmap (janelas pequenas) e gzip.
+"""
+
+import gzip
+import mmap
+
+import pytest
+
+from ecossistema import trafego
+from ecossistema.grafo import compilar_grafo
+
+
+@pytest.fixture
+def grafo(projeto):
+    return compilar_grafo({
+        "hub": projeto("frontend", 5173, "/hub/", ["auth"]),
+        "admin": projeto("frontend", 5173, "/admin/", ["admin-api"]),
+        "auth": projeto("backend", 3001),
+        "admin-api": projeto("backend", 3002),
+        "mcp": projeto("service", 3002),
+    })
+
+
+def _linha(caminho, upstream="-", tempo="-", segundo=0, nbytes=100):
+    return (f'10.0.0.1 - - [17/Oct/2026:10:00:{segundo:02d} +0000] "GET {caminho} HTTP/1.1" '
+            f'200 {nbytes} "-" "Mozilla/5.0 \\x22x\\x22" 0.050 {tempo} {upstream}\n').encode()
+
+
+def _log(tmp_path, linhas, comprimir=False):
+    caminho = tmp_path / ("access.log.gz" if comprimir else "access.log")
+    with (gzip.open if comprimir else open)(caminho, "wb") as f:
+        f.writelines(linhas)
+    return str(caminho)
+
+
+def test_tokenizar():
+    assert trafego.tokenizar(_linha("/admin/api/u?x=1", "127.0.0.1:3002", "0.010")) == \
+        (b"/admin/api/u?x=1", 200, 100, 0.010, 3002)
+    # Vários upstreams: tempos somados, porta do último
+    campos = trafego.tokenizar(_linha("/a", "10.0.0.2:3001, 10.0.0.3:3002", "0.010, 0.020"))
+    assert campos[3:] == (0.030, 3002)
+    # combined puro: sem tempo nem upstream
+    combined = b'1.2.3.4 - - [17/Oct/2026:10:00:00 +0000] "GET /hub/ HTTP/1.1" 304 - "-" "curl"\n'
+    assert trafego.tokenizar(combined) == (b"/hub/", 304, 0, None, None)
+    assert trafego.tokenizar(b"lixo\n") is None
+
+
+def test_atribuicao_e_percentis(tmp_path, grafo):
+    linhas = [_linha("/admin/api/x", "127.0.0.1:3002", "0.010", segundo=i % 60) for i in range(99)]
+    linhas += [_linha("/admin/api/x", "127.0.0.1:3002", "1.000", segundo=59)]
+    linhas += [_linha("/hub/index.html", "127.0.0.1:5173", "0.001", segundo=59),
+               _linha("/nada", segundo=59)]
+    t = trafego.ingerir([_log(tmp_path, linhas)], grafo)
+
+    # 3002 é de admin-api e de mcp: vale a ligação que admin já tem
+    assert set(t.nos) == {"admin", "admin-api", "hub"}
+    assert t.sem_projeto == 1
+    assert t.duracao == 59
+    aresta = t.arestas[(grafo.id("admin"), grafo.id("admin-api"))]
+    assert aresta.requisicoes == 100
+    # Limite do balde: erro de no máximo 2**(1/POR_OITAVA)
+    assert 10 <= aresta.percentil(0.5) < 10 * 2 ** (1 / trafego.POR_OITAVA)
+    assert 1000 <= aresta.percentil(0.999) < 1000 * 2 ** (1 / trafego.POR_OITAVA)
+    assert max(t.larguras_arestas().values()) == trafego.LARGURA_ARESTA + trafego.LARGURA_EXTRA
+
+
+def test_mmap_em_janelas_e_gzip_leem_o_mesmo(tmp_path):
+    linhas = [_linha(f"/admin/{'x' * (i % 300)}", "127.0.0.1:3002", "0.005") for i in range(2000)]
+    texto = _log(tmp_path, linhas)
+    assert list(trafego.ler_linhas(texto, janela=mmap.ALLOCATIONGRANULARITY)) == linhas
+    assert list(trafego.ler_linhas(_log(tmp_path, linhas, comprimir=True))) == linhas
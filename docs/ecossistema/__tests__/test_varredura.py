@@ -0,0 +1,139 @@
+"""
+Varredura do código-fonte: cada extrator sobre o monorepo de fixtures/
+(rotas de controllers, portas do PM2, do main.ts e do vite, exports
+seguidos por `export * from`), a mescla com os dados manuais e um app sem
+porta detectável que não derruba a geração.
+"""
+
+import json
+import os
+
+from ecossistema import scripts, varredura
+
+MONOREPO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "monorepo")
+
+
+def _ler(*partes):
+    with open(os.path.join(MONOREPO, *partes), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_extrair_controller():
+    produtos = varredura.extrair_controller(_ler("apps", "loja-api", "src", "produtos",
+                                                 "produtos.controller.ts"))
+    carrinho = varredura.extrair_controller(_ler("apps", "loja-api", "src", "app.controller.ts"))
+
+    # Cada @Controller troca o prefixo; sem caminho (só opções) não há prefixo
+    assert produtos["endpoints"] == ["GET /produtos", "GET /produtos/:id", "POST /produtos",
+                                     "ALL /health"]
+    assert carrinho["endpoints"] == ["DELETE /carrinho/:id"]
+
+
+def test_extrair_portas():
+    assert varredura.extrair_ecosystem(_ler("ecosystem.config.js")) == {
+        "ports": {"loja-api": 3010, "worker": 3099}}
+    assert varredura.extrair_vite(_ler("apps", "loja-web", "vite.config.ts")) == {"port": 5180}
+    assert varredura.extrair_main(_ler("apps", "loja-api", "src", "main.ts")) == {"port": 3999}
+    assert varredura.extrair_main(_ler("apps", "relatorios-api", "src", "main.ts")) == {
+        "port": 3020}
+    assert varredura.extrair_main("app.listen(3000);") == {"port": None}
+
+
+def test_extrair_exports():
+    assert varredura.extrair_exports(_ler("packages", "ui", "src", "index.ts")) == {
+        "exports": ["Botao", "Cartao", "Tema", "VERSAO"],
+        "reexports": ["./hooks", "./tipos"],
+    }
+
+
+def test_porta_api():
+    def fatos(nome, main_port=None):
+        return {"package": {"name": nome}, "main_port": main_port}
+
+    pm2 = {"loja-api": 3010, "worker": 3099}
+    assert varredura._porta_api(fatos("loja-api"), pm2) == 3010
+    assert varredura._porta_api(fatos("@worker/fila"), pm2) == 3099
+    assert varredura._porta_api(fatos("outra-api", 3020), pm2) == 3020
+    assert varredura._porta_api(fatos("outra-api", 3020), {"api": 3001}) == 3001
+    assert varredura._porta_api(fatos("outra-api"), {}) is None
+
+
+def test_escanear_monorepo():
+    dados = varredura.escanear(MONOREPO, workers=2)
+
+    web = dados["frontends"]["loja-web"]
+    assert (web["port"], web["react_version"], web["state_management"], web["ui_framework"],
+            web["http_client"]) == (5180, "19.1.0", "TanStack Query v5.59.0", "TailwindCSS",
+                                    "axios 1.7.9")
+
+    api = dados["backends"]["loja-api"]
+    # Porta do PM2 (pelo nome do app) vence a do main.ts; node_modules fica de fora
+    assert (api["port"], api["framework"], api["orm"], api["database"]) == (
+        3010, "NestJS 11.x", "Prisma + MySQL2", "MySQL")
+    assert api["endpoints"] == ["DELETE /carrinho/:id", "GET /produtos", "GET /produtos/:id",
+                                "POST /produtos", "ALL /health"]
+    assert api["models"] == ["Produto"]
+
+    # Nenhum app do PM2 com esse nome (e mais de um no repositório): main.ts
+    relatorios = dados["backends"]["loja-relatorios-api"]
+    assert (relatorios["port"], relatorios["framework"], relatorios["orm"],
+            relatorios["database"]) == (3020, "Express.js", "N/A", "PostgreSQL")
+    assert "endpoints" not in relatorios
+
+    # O ciclo hooks/index.ts → ../index não repete nomes
+    assert dados["shared_packages"]["@loja/ui"]["exports"] == [
+        "Botao", "Cartao", "Tema", "VERSAO", "useCarrinho", "Produto", "Status"]
+    assert dados["ports_map"] == {3010: "loja-api", 3020: "loja-relatorios-api",
+                                  5180: "loja-web"}
+
+
+def test_mesclar():
+    base = {
+        "meta": {"generated_at": "manual"},
+        "frontends": {"loja-web": {"name": "Loja", "description": "Vitrine", "port": 5173,
+                                   "features": ["carrinho"]}},
+        "backends": {"api-da-loja": {"name": "Loja API", "package": "loja-api",
+                                     "description": "", "port": 3000}},
+        "shared_packages": {},
+        "ports_map": {3000: "api-da-loja", 3010: "reservada"},
+    }
+
+    dados = varredura.mesclar(base, varredura.escanear(MONOREPO))
+
+    # Casado pela chave: nome e descrição manuais, porta escaneada, extras mantidos
+    web = dados["frontends"]["loja-web"]
+    assert (web["name"], web["description"], web["port"], web["features"]) == (
+        "Loja", "Vitrine", 5180, ["carrinho"])
+    # Casado por "package": fica na chave manual; descrição vazia é completada
+    assert "loja-api" not in dados["backends"]
+    api = dados["backends"]["api-da-loja"]
+    assert (api["name"], api["description"], api["port"]) == ("Loja API", "API da loja", 3010)
+    assert "loja-relatorios-api" in dados["backends"]
+    assert list(dados["shared_packages"]) == ["@loja/ui"]
+    assert dados["ports_map"] == {3000: "api-da-loja", 3010: "reservada",
+                                  3020: "loja-relatorios-api", 5180: "loja-web"}
+    assert dados["meta"] == {"generated_at": "manual"}
+    assert base["frontends"]["loja-web"]["port"] == 5173
+
+
+def _pacote(pasta, nome, dependencias):
+    pasta.mkdir(parents=True)
+    (pasta / "package.json").write_text(json.dumps(
+        {"name": nome, "description": f"{nome} escaneado", "dependencies": dependencias}))
+
+
+def test_pacote_sem_porta_nao_derruba_o_scan(tmp_path):
+    raiz = tmp_path / "repo"
+    _pacote(raiz / "apps" / "x-novo", "x-novo", {"react": "^19.1.0"})
+    (raiz / "packages").mkdir()
+    saida = tmp_path / "saida"
+    eco = scripts.carregar("ecossistema")
+
+    codigo = eco.main(["--scan", str(raiz), "--json", "--html", "--out-dir", str(saida),
+                       "--no-open"])
+
+    assert codigo is None
+    dados = json.loads((saida / eco.JSON_FILENAME).read_text())
+    assert dados["frontends"]["x-novo"]["port"] == ""
+    assert dados["frontends"]["x-novo"]["react_version"] == "19.1.0"
+    assert (saida / eco.HTML_FILENAME).exists()
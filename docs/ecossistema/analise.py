@@ -0,0 +1,321 @@
+"""
+ANÁLISE DO GRAFO DE DEPENDÊNCIAS
+================================
+Algoritmos sobre o GrafoCompilado (aresta A → B: A depende de B), em Python
+puro para não pesar no caminho do HTML:
+
+    ciclos           componentes fortemente conexas (Tarjan iterativo), O(n + m)
+    raio de impacto  quem para se um nó cair: alcançabilidade reversa na
+                     condensação, com conjuntos em bits (int); cada uma das
+                     O(m) uniões é um OR de n bits, O(m·n/64) no total
+    pontos únicos    nós (fora os frontends) cuja queda derruba frontends,
+    de falha         do raio de impacto: cada projeto precisa de todas as
+                     suas dependências, então não há caminho alternativo
+    dominadores      nós pelos quais passa todo caminho das entradas (nós sem
+                     dependentes) até outro nó: o nó só é alcançado através
+                     do dominador (Cooper-Harvey-Kennedy sobre a ordem pós-DFS)
+    intermediação    betweenness de Brandes; exata até LIMIAR_EXATO nós, acima
+                     disso estimada a partir de AMOSTRAS origens
+
+O resultado por nó vai para o JSON exportado e para o tooltip do HTML.
+"""
+
+import random
+from array import array
+
+from ecossistema import rastro
+
+# Lista de frontends afetados guardada por nó (o total vem à parte)
+LIMITE_LISTA = 20
+
+LIMIAR_EXATO = 500
+AMOSTRAS = 32
+
+TIPO_ALVO = "frontend"
+
+
+# ==============================================================================
+# COMPONENTES FORTEMENTE CONEXAS
+# ==============================================================================
+
+def componentes_fortes(g):
+    """(componente de cada nó, componentes) na ordem em que Tarjan as fecha
+
+    Essa ordem é topológica reversa: uma componente sai depois de todas as
+    que ela alcança (dependências antes dos dependentes).
+    """
+    n = len(g)
+    inicio, destino = g.saida_inicio, g.saida_destino
+    ordem = array("i", [-1]) * n
+    baixo = array("i", [0]) * n
+    comp = array("i", [-1]) * n
+    pilha = []
+    componentes = []
+    contador = 0
+
+    for raiz in range(n):
+        if ordem[raiz] != -1:
+            continue
+        # Pilha de chamadas explícita: (nó, próxima aresta)
+        chamadas = [(raiz, inicio[raiz])]
+        ordem[raiz] = baixo[raiz] = contador
+        contador += 1
+        pilha.append(raiz)
+        while chamadas:
+            v, p = chamadas[-1]
+            if p < inicio[v + 1]:
+                chamadas[-1] = (v, p + 1)
+                w = destino[p]
+                if ordem[w] == -1:
+                    ordem[w] = baixo[w] = contador
+                    contador += 1
+                    pilha.append(w)
+                    chamadas.append((w, inicio[w]))
+                elif comp[w] == -1 and ordem[w] < baixo[v]:
+                    baixo[v] = ordem[w]
+                continue
+            chamadas.pop()
+            if chamadas:
+                u = chamadas[-1][0]
+                if baixo[v] < baixo[u]:
+                    baixo[u] = baixo[v]
+            if baixo[v] == ordem[v]:
+                membros = []
+                while True:
+                    w = pilha.pop()
+                    comp[w] = len(componentes)
+                    membros.append(w)
+                    if w == v:
+                        break
+                componentes.append(membros)
+    return comp, componentes
+
+
+def ciclos(g, comp, componentes):
+    """Componentes com ciclo: mais de um nó ou um nó que depende de si mesmo"""
+    resultado = []
+    for membros in componentes:
+        if len(membros) > 1 or membros[0] in g.sucessores(membros[0]):
+            resultado.append(sorted(membros))
+    return resultado
+
+
+# ==============================================================================
+# RAIO DE IMPACTO (ALCANÇABILIDADE REVERSA)
+# ==============================================================================
+
+def dependentes(g, comp, componentes):
+    """Conjunto (int de bits) dos nós que dependem, direta ou indiretamente, de cada nó"""
+    k = len(componentes)
+    membros_bits = [0] * k
+    for c, membros in enumerate(componentes):
+        for v in membros:
+            membros_bits[c] |= 1 << v
+
+    # Predecessores fecham depois (ordem reversa de Tarjan): fontes primeiro
+    acima = [0] * k
+    pred_inicio, pred_origem = g.entrada_inicio, g.entrada_origem
+    for c in range(k - 1, -1, -1):
+        bits = 0
+        vistos = set()
+        for v in componentes[c]:
+            for p in range(pred_inicio[v], pred_inicio[v + 1]):
+                cp = comp[pred_origem[p]]
+                if cp != c and cp not in vistos:
+                    vistos.add(cp)
+                    bits |= acima[cp] | membros_bits[cp]
+        acima[c] = bits
+
+    resultado = []
+    for v in range(len(g)):
+        c = comp[v]
+        resultado.append((acima[c] | membros_bits[c]) & ~(1 << v))
+    return resultado
+
+
+def _bits(x, limite):
+    """Até `limite` índices dos bits ligados de x, do menor para o maior"""
+    ids = []
+    while x and len(ids) < limite:
+        menor = x & -x
+        ids.append(menor.bit_length() - 1)
+        x ^= menor
+    return ids
+
+
+# ==============================================================================
+# DOMINADORES
+# ==============================================================================
+
+def dominadores(g):
+    """Dominador imediato de cada nó (-1 nas entradas) e tamanho da subárvore
+
+    Raiz virtual ligada às entradas (nós sem dependentes) e, para ciclos sem
+    entrada, a um nó de cada parte ainda não alcançada.
+    """
+    n = len(g)
+    inicio, destino = g.saida_inicio, g.saida_destino
+    raiz = n
+    pos = array("i", [-1]) * (n + 1)
+    rpo = []
+
+    def dfs(origens):
+        for s in origens:
+            if pos[s] != -1:
+                continue
+            pos[s] = -2
+            chamadas = [(s, inicio[s])]
+            while chamadas:
+                v, p = chamadas[-1]
+                if p < inicio[v + 1]:
+                    chamadas[-1] = (v, p + 1)
+                    w = destino[p]
+                    if pos[w] == -1:
+                        pos[w] = -2
+                        chamadas.append((w, inicio[w]))
+                    continue
+                chamadas.pop()
+                rpo.append(v)
+
+    filhos_raiz = [v for v in range(n) if g.grau_entrada(v) == 0]
+    dfs(filhos_raiz)
+    for v in range(n):
+        if pos[v] == -1:
+            filhos_raiz.append(v)
+            dfs([v])
+    rpo.append(raiz)
+    rpo.reverse()
+    for i, v in enumerate(rpo):
+        pos[v] = i
+
+    idom = array("i", [-1]) * (n + 1)
+    idom[raiz] = raiz
+    eh_filho_raiz = bytearray(n + 1)
+    for v in filhos_raiz:
+        eh_filho_raiz[v] = 1
+    pred_inicio, pred_origem = g.entrada_inicio, g.entrada_origem
+
+    def intersectar(a, b):
+        while a != b:
+            while pos[a] > pos[b]:
+                a = idom[a]
+            while pos[b] > pos[a]:
+                b = idom[b]
+        return a
+
+    mudou = True
+    while mudou:
+        mudou = False
+        for v in rpo[1:]:
+            novo = raiz if eh_filho_raiz[v] else -1
+            for p in range(pred_inicio[v], pred_inicio[v + 1]):
+                u = pred_origem[p]
+                if idom[u] == -1:
+                    continue
+                novo = u if novo == -1 else intersectar(u, novo)
+            if idom[v] != novo:
+                idom[v] = novo
+                mudou = True
+
+    # Tamanho da subárvore de dominância (pós-ordem = rpo ao contrário)
+    tamanho = array("i", [1]) * (n + 1)
+    for v in reversed(rpo[1:]):
+        tamanho[idom[v]] += tamanho[v]
+    return [(-1 if idom[v] == raiz else idom[v]) for v in range(n)], tamanho[:n]
+
+
+# ==============================================================================
+# INTERMEDIAÇÃO (BRANDES)
+# ==============================================================================
+
+def intermediacao(g, amostras=None, seed=42):
+    """Betweenness normalizada de cada nó (estimada por amostragem em grafos grandes)"""
+    n = len(g)
+    if amostras is None:
+        amostras = n if n <= LIMIAR_EXATO else AMOSTRAS
+    origens = range(n) if amostras >= n else random.Random(seed).sample(range(n), amostras)
+    inicio, destino = g.saida_inicio, g.saida_destino
+    cb = [0.0] * n
+    for s in origens:
+        sigma = [0] * n
+        dist = [-1] * n
+        sigma[s] = 1
+        dist[s] = 0
+        fila = [s]
+        for v in fila:
+            dv = dist[v] + 1
+            for p in range(inicio[v], inicio[v + 1]):
+                w = destino[p]
+                if dist[w] < 0:
+                    dist[w] = dv
+                    fila.append(w)
+                if dist[w] == dv:
+                    sigma[w] += sigma[v]
+        delta = [0.0] * n
+        for w in reversed(fila):
+            dw = dist[w] - 1
+            coef = (1.0 + delta[w]) / sigma[w]
+            for p in range(g.entrada_inicio[w], g.entrada_inicio[w + 1]):
+                v = g.entrada_origem[p]
+                if dist[v] == dw:
+                    delta[v] += sigma[v] * coef
+            if w != s:
+                cb[w] += delta[w]
+    escala = n / len(origens) if len(origens) else 0.0
+    norma = (n - 1) * (n - 2) or 1
+    return [c * escala / norma for c in cb]
+
+
+# ==============================================================================
+# ANÁLISE COMPLETA
+# ==============================================================================
+
+def analisar(g, amostras=None):
+    """{chave: análise do nó} e o resumo global"""
+    n = len(g)
+    with rastro.intervalo("ciclos"):
+        comp, componentes = componentes_fortes(g)
+        com_ciclo = ciclos(g, comp, componentes)
+    ciclo_de = {}
+    for i, membros in enumerate(com_ciclo):
+        for v in membros:
+            ciclo_de[v] = i
+    with rastro.intervalo("dependentes"):
+        acima = dependentes(g, comp, componentes)
+    with rastro.intervalo("dominadores"):
+        idom, dominados = dominadores(g)
+    with rastro.intervalo("intermediacao"):
+        bc = intermediacao(g, amostras)
+
+    alvo = 0
+    for v in g.por_tipo.get(TIPO_ALVO, ()):
+        alvo |= 1 << v
+    ranking = sorted(range(n), key=lambda v: -bc[v])
+    posicao = {v: i + 1 for i, v in enumerate(ranking)}
+
+    nos = {}
+    chaves = g.chaves
+    for v in range(n):
+        afetados = acima[v] & alvo
+        nos[chaves[v]] = {
+            "impacto": acima[v].bit_count(),
+            "frontends_afetados": afetados.bit_count(),
+            "quebra": [chaves[u] for u in _bits(afetados, LIMITE_LISTA)],
+            "ciclo": ciclo_de.get(v),
+            "idom": chaves[idom[v]] if idom[v] >= 0 else None,
+            "domina": dominados[v] - 1,
+            "intermediacao": round(bc[v], 6),
+            "ranking": posicao[v],
+        }
+
+    resumo = {
+        "ciclos": [[chaves[v] for v in membros] for membros in com_ciclo],
+        "pontos_unicos": [chaves[v] for v in sorted(range(n), key=lambda v: (
+                              -(acima[v] & alvo).bit_count(), -acima[v].bit_count()))
+                          if not alvo >> v & 1 and acima[v] & alvo][:LIMITE_LISTA],
+        "maior_impacto": [chaves[v] for v in sorted(range(n), key=lambda v: -acima[v].bit_count())
+                          if acima[v]][:LIMITE_LISTA],
+        "intermediacao": [chaves[v] for v in ranking if bc[v] > 0][:LIMITE_LISTA],
+        "intermediacao_exata": (amostras or (n if n <= LIMIAR_EXATO else AMOSTRAS)) >= n,
+    }
+    return nos, resumo
@@ -0,0 +1,339 @@
+"""
+BENCHMARKS DOS GERADORES EM ESCALA
+==================================
+Mede tempo e pico de memória de cada etapa dos dois geradores sobre
+entradas sintéticas (ecossistema.sintetico) de 10 a 100k nós e grava o
+resultado em JSON, um arquivo por commit, para comparar entre commits.
+
+    diagrama     load (JSON → PROJETOS), index (compilar_grafo), analise,
+                 layout (sem cache; numpy), render_html (D3, em memória),
+                 render_png (matplotlib; layout do cache), write (HTML e
+                 JSON em arquivo)
+    ecossistema  load (load_ecosystem_json), index (validação do modelo),
+                 cards (generate_*_cards), template (contexto + template de
+                 slots, o antigo HTML_TEMPLATE.format), write (HTML e JSON
+                 em arquivo)
+
+Tempo: o menor de --repeat execuções (perf_counter). Memória: pico do
+tracemalloc numa execução à parte (o rastreamento deixa tudo mais lento e
+não entra no tempo). Etapas que dependem de numpy/matplotlib são puladas
+sem eles, e layout/render_png acima de --png-limit nós (o layout completo
+de 100k nós leva minutos por execução).
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.bench [--sizes 10,100,1000] [--targets diagrama]
+        [--out ARQUIVO] [--compare ANTERIOR.json] [--threshold 1.25]
+
+Sem --out, grava .bench/<commit>.json; com --compare, sai com código 1 se
+alguma etapa ficou mais lenta (ou mais pesada) que o limiar.
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from ecossistema import scripts, sintetico
+
+FORMATO = "ecossistema-bench"
+VERSAO = 1
+
+TAMANHOS = (10, 100, 1000, 10000, 100000)
+REPETICOES = 3
+
+# Acima disso layout e PNG ficam de fora (o layout completo domina tudo)
+LIMITE_PNG = 10000
+
+# Diferenças abaixo disso (s ou bytes) são ruído e não contam como regressão
+RUIDO_S = 0.005
+RUIDO_BYTES = 256 * 1024
+
+BENCH_DIR = os.path.join(scripts.DOCS_DIR, ".bench")
+
+
+class Pular(Exception):
+    """Etapa indisponível neste ambiente ou tamanho (motivo na mensagem)"""
+
+
+# ==============================================================================
+# ETAPAS (cada uma lê e completa o contexto `c`)
+# ==============================================================================
+
+def _numpy():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise Pular("numpy não instalado")
+
+
+def _d_load(c):
+    c["projetos"] = json.loads(c["entrada"])
+
+
+def _d_index(c):
+    c["grafo"] = c["diagrama"].compilar_grafo(c["projetos"])
+
+
+def _d_analise(c):
+    c["analise"] = c["diagrama"].analisar(c["grafo"])[0]
+
+
+def _d_layout(c):
+    if len(c["grafo"]) > c["limite_png"]:
+        raise Pular(f"acima de {c['limite_png']} nós (--png-limit)")
+    _numpy()
+    from ecossistema.layout import layout_incremental
+
+    # Sempre do zero: o cache da repetição anterior não pode valer
+    if os.path.exists(c["cache_layout"]):
+        os.remove(c["cache_layout"])
+    layout_incremental(c["grafo"], c["cache_layout"], k=2, iteracoes=50, seed=42)
+
+
+def _d_render_html(c):
+    buffer = io.StringIO()
+    c["diagrama"].escrever_html_interativo(c["grafo"], buffer, analise=c["analise"])
+
+
+def _d_render_png(c):
+    if len(c["grafo"]) > c["limite_png"]:
+        raise Pular(f"acima de {c['limite_png']} nós (--png-limit)")
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        raise Pular("matplotlib não instalado")
+    if not c["diagrama"].gerar_png_estatico(c["grafo"], io.BytesIO(),
+                                            caminho_cache=c["cache_layout"]):
+        raise Pular("PNG não gerado")
+
+
+def _d_write(c):
+    d = c["diagrama"]
+    with open(os.path.join(c["tmp"], d.HTML_ARQUIVO), "w", encoding="utf-8") as f:
+        d.escrever_html_interativo(c["grafo"], f, analise=c["analise"])
+    with open(os.path.join(c["tmp"], d.JSON_ARQUIVO), "w", encoding="utf-8") as f:
+        json.dump({chave: {**proj, "analise": c["analise"][chave]}
+                   for chave, proj in c["projetos"].items()}, f, indent=2, ensure_ascii=False)
+
+
+def _e_load(c):
+    c["data"] = c["eco"].load_ecosystem_json(c["arquivo"])
+
+
+def _e_index(c):
+    c["modelo"] = c["eco"].validated(c["data"])
+
+
+def _e_cards(c):
+    eco, m = c["eco"], c["modelo"]
+    eco.generate_frontend_cards(m.frontends)
+    eco.generate_backend_cards(m.backends, c["rotas"])
+    eco.generate_service_cards(m.services)
+    eco.generate_database_cards(m.databases)
+    eco.generate_package_cards(m.packages)
+
+
+def _e_template(c):
+    eco = c["eco"]
+    eco.compile_template(eco.HTML_TEMPLATE).render(eco.template_context(c["modelo"]))
+
+
+def _e_write(c):
+    eco = c["eco"]
+    with open(os.path.join(c["tmp"], eco.HTML_FILENAME), "w", encoding="utf-8") as f:
+        eco.write_html(c["modelo"], f)
+    with open(os.path.join(c["tmp"], eco.JSON_FILENAME), "w", encoding="utf-8") as f:
+        eco.write_json(c["data"], f)
+
+
+ETAPAS = {
+    "diagrama": (("load", _d_load), ("index", _d_index), ("analise", _d_analise),
+                 ("layout", _d_layout), ("render_html", _d_render_html),
+                 ("render_png", _d_render_png), ("write", _d_write)),
+    "ecossistema": (("load", _e_load), ("index", _e_index), ("cards", _e_cards),
+                    ("template", _e_template), ("write", _e_write)),
+}
+
+
+def _contexto(alvo, n, seed, tmp, limite_png):
+    """Entrada sintética já serializada e os módulos do alvo"""
+    if alvo == "diagrama":
+        return {"diagrama": scripts.carregar("diagrama"), "tmp": tmp,
+                "entrada": json.dumps(sintetico.projetos(n, seed)),
+                "cache_layout": os.path.join(tmp, "layout.json"), "limite_png": limite_png}
+    eco = scripts.carregar("ecossistema")
+    arquivo = os.path.join(tmp, "entrada.json")
+    with open(arquivo, "w", encoding="utf-8") as f:
+        eco.write_json(sintetico.ecosystem_data(n, seed), f)
+    from ecossistema import rotas
+
+    c = {"eco": eco, "tmp": tmp, "arquivo": arquivo}
+    # As rotas entram nos cards de backend; indexadas fora da medição
+    c["rotas"] = rotas.indexar(eco.validated(eco.load_ecosystem_json(arquivo)).backends)
+    return c
+
+
+# ==============================================================================
+# MEDIÇÃO
+# ==============================================================================
+
+def _medir(etapa, c, repeticoes):
+    """(segundos, pico em bytes) da etapa; a última execução fica no contexto"""
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        etapa(c)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    melhor = None
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        etapa(c)
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor, pico
+
+
+def executar(tamanhos=TAMANHOS, alvos=tuple(ETAPAS), etapas=None, seed=0,
+             repeticoes=REPETICOES, limite_png=LIMITE_PNG, log=sys.stderr):
+    """Lista de resultados {alvo, etapa, n, segundos, pico_bytes | pulada}
+
+    Com `etapas`, só elas são medidas; as anteriores de que dependem rodam
+    uma vez, sem medição.
+    """
+    resultados = []
+    for alvo in alvos:
+        for n in tamanhos:
+            with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+                c = _contexto(alvo, n, seed, tmp, limite_png)
+                for nome, etapa in ETAPAS[alvo]:
+                    if etapas and nome not in etapas:
+                        if _necessaria(alvo, nome, etapas):
+                            try:
+                                etapa(c)
+                            except Pular:
+                                pass
+                        continue
+                    registro = {"alvo": alvo, "etapa": nome, "n": n}
+                    try:
+                        segundos, pico = _medir(etapa, c, repeticoes)
+                    except Pular as e:
+                        registro["pulada"] = str(e)
+                        print(f"  ⏭️  {alvo:<12} {nome:<12} {n:>7}  {e}", file=log)
+                    else:
+                        registro.update(segundos=round(segundos, 6), pico_bytes=pico)
+                        print(f"  ⏱️  {alvo:<12} {nome:<12} {n:>7}  {segundos * 1000:10.1f} ms"
+                              f"  {pico / 1048576:8.1f} MB", file=log)
+                    resultados.append(registro)
+    return resultados
+
+
+def _necessaria(alvo, nome, etapas):
+    """Etapa anterior a uma das pedidas que produz algo que ela usa"""
+    ordem = [n for n, _ in ETAPAS[alvo]]
+    ultima = max((ordem.index(e) for e in etapas if e in ordem), default=-1)
+    return ordem.index(nome) < ultima and nome in ("load", "index", "analise", "layout")
+
+
+def _commit():
+    try:
+        resultado = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=scripts.DOCS_DIR,
+                                   capture_output=True, text=True, check=True)
+        return resultado.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def relatorio(resultados, seed, repeticoes):
+    return {
+        "formato": FORMATO,
+        "versao": VERSAO,
+        "commit": _commit(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "seed": seed,
+        "repeticoes": repeticoes,
+        "resultados": resultados,
+    }
+
+
+def comparar(anterior, atual, limiar):
+    """Regressões [(alvo, etapa, n, métrica, antes, depois)] acima do limiar"""
+    antes = {(r["alvo"], r["etapa"], r["n"]): r for r in anterior["resultados"]
+             if "pulada" not in r}
+    regressoes = []
+    for r in atual["resultados"]:
+        base = antes.get((r["alvo"], r["etapa"], r["n"]))
+        if base is None or "pulada" in r:
+            continue
+        for metrica, ruido in (("segundos", RUIDO_S), ("pico_bytes", RUIDO_BYTES)):
+            a, b = base[metrica], r[metrica]
+            if b > a * limiar and b - a > ruido:
+                regressoes.append((r["alvo"], r["etapa"], r["n"], metrica, a, b))
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos geradores em escala")
+    parser.add_argument("--sizes", default=",".join(map(str, TAMANHOS)),
+                        help="tamanhos em nós, separados por vírgula (padrão: %(default)s)")
+    parser.add_argument("--targets", default=",".join(ETAPAS),
+                        help="geradores medidos (padrão: %(default)s)")
+    parser.add_argument("--stages", default=None,
+                        help="só estas etapas, separadas por vírgula (padrão: todas)")
+    parser.add_argument("--seed", type=int, default=0, help="semente do gerador sintético")
+    parser.add_argument("--repeat", type=int, default=REPETICOES,
+                        help="execuções por etapa; vale a mais rápida (padrão: %(default)s)")
+    parser.add_argument("--png-limit", type=int, default=LIMITE_PNG,
+                        help="maior tamanho com layout e PNG (padrão: %(default)s)")
+    parser.add_argument("--out", default=None,
+                        help="JSON de saída (padrão: .bench/<commit>.json em docs/)")
+    parser.add_argument("--compare", metavar="ANTERIOR",
+                        help="JSON de uma execução anterior para apontar regressões")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="razão depois/antes que conta como regressão (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+
+    alvos = args.targets.split(",")
+    for alvo in alvos:
+        if alvo not in ETAPAS:
+            parser.error(f"alvo desconhecido: {alvo} (opções: {', '.join(ETAPAS)})")
+    etapas = set(args.stages.split(",")) if args.stages else None
+    tamanhos = [int(n) for n in args.sizes.split(",")]
+
+    resultados = executar(tamanhos, alvos, etapas, args.seed, max(1, args.repeat), args.png_limit)
+    atual = relatorio(resultados, args.seed, args.repeat)
+    saida = args.out or os.path.join(BENCH_DIR, f"{atual['commit'] or 'sem-commit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(atual, f, indent=2)
+    print(f"✅ Resultados: {saida}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            anterior = json.load(f)
+        regressoes = comparar(anterior, atual, args.threshold)
+        for alvo, etapa, n, metrica, a, b in regressoes:
+            print(f"❌ {alvo} {etapa} n={n}: {metrica} {a:g} → {b:g} ({b / a:.2f}x)",
+                  file=sys.stderr)
+        if regressoes:
+            return 1
+        print(f"✅ Sem regressões acima de {args.threshold}x frente a "
+              f"{anterior.get('commit') or args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
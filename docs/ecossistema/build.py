@@ -0,0 +1,57 @@
+"""
+CACHE DE BUILD (ENDEREÇADO POR CONTEÚDO)
+========================================
+Cada artefato gerado (HTML, PNG, JSON) é associado ao hash das entradas que
+o produziram: dados canonicalizados, templates e versão do gerador. O
+manifesto fica ao lado das saídas; se o hash não mudou e o arquivo ainda
+existe, o renderizador é pulado.
+"""
+
+import hashlib
+import json
+import os
+
+
+def canonico(obj):
+    """Serialização determinística (chaves ordenadas, sem espaços)"""
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False,
+                      separators=(",", ":"), default=str)
+
+
+def hash_entradas(*partes):
+    """SHA-256 da forma canônica de todas as entradas de um artefato"""
+    h = hashlib.sha256()
+    for parte in partes:
+        h.update(canonico(parte).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ManifestoBuild:
+    """Manifesto <out_dir>/.<nome>.build.json com o hash de cada artefato"""
+
+    def __init__(self, out_dir, nome, forcar=False):
+        self.caminho = os.path.join(out_dir, f".{nome}.build.json")
+        self.forcar = forcar
+        self.artefatos = {}
+        try:
+            with open(self.caminho, encoding="utf-8") as f:
+                self.artefatos = json.load(f).get("artefatos", {})
+        except (OSError, ValueError, AttributeError):
+            # Manifesto ausente ou corrompido: tudo será regenerado
+            self.artefatos = {}
+
+    def atualizado(self, artefato, chave, caminho):
+        """True se `artefato` já foi gerado com `chave` e o arquivo existe"""
+        if self.forcar:
+            return False
+        return self.artefatos.get(artefato) == chave and os.path.exists(caminho)
+
+    def registrar(self, artefato, chave):
+        self.artefatos[artefato] = chave
+
+    def salvar(self):
+        tmp = self.caminho + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"artefatos": self.artefatos}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.caminho)
@@ -0,0 +1,138 @@
+"""
+CACHE DE FATOS DA VARREDURA (POR ARQUIVO)
+=========================================
+Guarda, para cada (arquivo, extrator), o tamanho, o mtime, o SHA-1 do
+conteúdo e os fatos extraídos, num SQLite ao lado das saídas. Numa nova
+varredura:
+
+    - tamanho e mtime iguais  → fatos do cache, sem abrir o arquivo
+    - só o mtime mudou        → lê e compara o hash; se igual, reaproveita
+    - conteúdo mudou          → extrai de novo
+
+CacheFatos.ler tem a mesma assinatura de varredura.ler_fatos e entra no
+lugar dela (escanear(raiz, ler=cache.ler)). Os fatos devolvidos são
+compartilhados com o cache e não devem ser alterados.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from ecossistema.varredura import VERSAO_EXTRATORES, aplicar_extrator
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT);
+CREATE TABLE IF NOT EXISTS fatos (
+    arquivo TEXT NOT NULL,
+    extrator TEXT NOT NULL,
+    tamanho INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    fatos TEXT NOT NULL,
+    PRIMARY KEY (arquivo, extrator)
+);
+"""
+
+
+class CacheFatos:
+    """Cache <out_dir>/.<nome>.varredura.sqlite dos fatos de cada arquivo
+
+    O banco é lido inteiro na abertura e só as entradas novas ou alteradas
+    são gravadas em salvar(); as consultas durante a varredura (várias
+    threads) não tocam no SQLite.
+    """
+
+    def __init__(self, caminho, forcar=False):
+        self.caminho = caminho
+        self.entradas = {}
+        self.alterados = set()
+        self.usados = set()
+        self.extraidos = 0
+        self.reaproveitados = 0
+        self._trava = threading.Lock()
+        if not forcar:
+            self._carregar()
+
+    def _carregar(self):
+        try:
+            con = sqlite3.connect(f"file:{self.caminho}?mode=ro", uri=True)
+        except sqlite3.Error:
+            return
+        try:
+            versao = con.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()
+            if not versao or versao[0] != VERSAO_EXTRATORES:
+                # Extratores mudaram: os fatos guardados não valem mais
+                return
+            for arquivo, extrator, tamanho, mtime_ns, sha1, fatos in con.execute(
+                    "SELECT arquivo, extrator, tamanho, mtime_ns, sha1, fatos FROM fatos"):
+                self.entradas[arquivo, extrator] = (tamanho, mtime_ns, sha1, json.loads(fatos))
+        except (sqlite3.Error, ValueError):
+            # Cache ausente ou corrompido: tudo será extraído de novo
+            self.entradas = {}
+        finally:
+            con.close()
+
+    def ler(self, caminho, extrator):
+        """Fatos de um arquivo (do cache se ele não mudou); None se ilegível"""
+        try:
+            st = os.stat(caminho)
+        except OSError:
+            return None
+        chave = (caminho, extrator.__name__)
+        item = self.entradas.get(chave)
+        if item and item[0] == st.st_size and item[1] == st.st_mtime_ns:
+            with self._trava:
+                self.usados.add(chave)
+                self.reaproveitados += 1
+            return item[3]
+
+        try:
+            with open(caminho, "rb") as f:
+                dados = f.read()
+        except OSError:
+            return None
+        sha1 = hashlib.sha1(dados).hexdigest()
+        if item and item[2] == sha1:
+            fatos = item[3]
+            with self._trava:
+                self.reaproveitados += 1
+        else:
+            fatos = aplicar_extrator(extrator, dados)
+            with self._trava:
+                self.extraidos += 1
+        with self._trava:
+            self.entradas[chave] = (st.st_size, st.st_mtime_ns, sha1, fatos)
+            self.alterados.add(chave)
+            self.usados.add(chave)
+        return fatos
+
+    def salvar(self):
+        """Grava as entradas alteradas e remove as de arquivos que sumiram"""
+        removidos = [chave for chave in self.entradas
+                     if chave not in self.usados and not os.path.exists(chave[0])]
+        self.usados.clear()
+        if not self.alterados and not removidos:
+            return
+        pasta = os.path.dirname(self.caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        con = sqlite3.connect(self.caminho)
+        try:
+            with con:
+                con.executescript(ESQUEMA)
+                versao = con.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()
+                if versao and versao[0] != VERSAO_EXTRATORES:
+                    con.execute("DELETE FROM fatos")
+                con.execute("INSERT OR REPLACE INTO meta VALUES ('versao', ?)", (VERSAO_EXTRATORES,))
+                con.executemany(
+                    "INSERT OR REPLACE INTO fatos VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*chave, *self.entradas[chave][:3], json.dumps(self.entradas[chave][3]))
+                     for chave in self.alterados])
+                con.executemany("DELETE FROM fatos WHERE arquivo = ? AND extrator = ?", removidos)
+        finally:
+            con.close()
+        for chave in removidos:
+            del self.entradas[chave]
+        self.alterados.clear()
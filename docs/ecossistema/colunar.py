@@ -0,0 +1,158 @@
+"""
+EXPORTAÇÃO COLUNAR DO GRAFO (.npy + manifesto)
+==============================================
+Alternativa compacta ao JSON indentado: um diretório com uma coluna por
+arquivo .npy (formato NumPy 1.0, sem compressão) e um manifesto.json. Os
+arquivos são escritos só com `array` da biblioteca padrão; quem lê usa
+numpy.load(..., mmap_mode="r") e abre um grafo de 100k nós sem parsear nada.
+
+    manifesto.json              formato, versão, n_nos, n_arestas, colunas e
+                                categorias (tipo, cor)
+    no_<coluna>.npy             uma linha por nó (ids de GrafoCompilado)
+    no_<texto>.dados.npy        textos em UTF-8 concatenados (uint8) e
+    no_<texto>.offsets.npy      offsets int64 de n+1 posições (como no Arrow)
+    aresta_inicio.npy           CSR: arestas do nó i em inicio[i]:inicio[i+1]
+    aresta_origem.npy           origem e destino de cada aresta
+    aresta_destino.npy
+
+Cada exportação escreve num diretório temporário ao lado, que só no fim
+toma o lugar do anterior: ninguém lê colunas novas com o manifesto antigo
+e colunas de uma exportação anterior (ex.: a análise) não sobram.
+
+Carregar (a partir de docs/, requer numpy):
+    from ecossistema import colunar
+    tabela = colunar.carregar("DIAGRAMA-ECOSSISTEMA.colunar")
+    tabela["no_tipo"], colunar.texto(tabela, "no_chave", 3)
+"""
+
+import json
+import os
+import shutil
+import sys
+from array import array
+
+FORMATO = "ecossistema-colunar"
+VERSAO = 1
+MANIFESTO = "manifesto.json"
+
+# Colunas numéricas da análise (ecossistema.analise), -1 quando ausente
+COLUNAS_ANALISE = (
+    ("impacto", "i"), ("frontends_afetados", "i"), ("domina", "i"),
+    ("ciclo", "i"), ("ranking", "i"), ("intermediacao", "d"),
+)
+
+_ORDEM = "<" if sys.byteorder == "little" else ">"
+
+
+def _descr(a):
+    tipo = {"b": "i", "B": "u", "h": "i", "H": "u", "i": "i", "I": "u",
+            "l": "i", "L": "u", "q": "i", "Q": "u", "f": "f", "d": "f"}[a.typecode]
+    return ("|" if a.itemsize == 1 else _ORDEM) + tipo + str(a.itemsize)
+
+
+def escrever_npy(caminho, a):
+    """Grava um array 1-D (array.array) no formato .npy 1.0"""
+    cabecalho = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (_descr(a), len(a))
+    # Magic (6) + versão (2) + tamanho (2) + cabeçalho alinhado em 64 bytes
+    total = 10 + len(cabecalho) + 1
+    cabecalho += " " * (-total % 64) + "\n"
+    with open(caminho, "wb") as f:
+        f.write(b"\x93NUMPY\x01\x00")
+        f.write(len(cabecalho).to_bytes(2, "little"))
+        f.write(cabecalho.encode("latin1"))
+        a.tofile(f)
+    return {"arquivo": os.path.basename(caminho), "dtype": _descr(a), "shape": [len(a)]}
+
+
+def _textos(valores):
+    dados = bytearray()
+    offsets = array("q", [0])
+    for valor in valores:
+        dados += str(valor).encode("utf-8")
+        offsets.append(len(dados))
+    return array("B", bytes(dados)), offsets
+
+
+def _categorias(valores):
+    categorias = {}
+    codigos = array("i", (categorias.setdefault(v, len(categorias)) for v in valores))
+    return codigos, list(categorias)
+
+
+def exportar(grafo, diretorio, analise=None):
+    """Grava o grafo (e a análise por nó, se houver) em `diretorio`"""
+    diretorio = diretorio.rstrip("/" + os.sep) or diretorio
+    temporario = f"{diretorio}.{os.getpid()}.tmp"
+    antigo = f"{diretorio}.{os.getpid()}.old"
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+    try:
+        _gravar(grafo, temporario, analise)
+    except BaseException:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+    if os.path.exists(diretorio):
+        os.replace(diretorio, antigo)
+    os.replace(temporario, diretorio)
+    shutil.rmtree(antigo, ignore_errors=True)
+
+
+def _gravar(grafo, diretorio, analise):
+    colunas = {}
+    categorias = {}
+    n = len(grafo)
+
+    def coluna(nome, a):
+        colunas[nome] = escrever_npy(os.path.join(diretorio, nome + ".npy"), a)
+
+    for nome, campo in (("no_chave", None), ("no_nome", "nome"), ("no_descricao", "descricao"),
+                        ("no_stack", "stack")):
+        valores = grafo.chaves if campo is None else (getattr(p, campo) for p in grafo.projetos)
+        dados, offsets = _textos(valores)
+        coluna(nome + ".dados", dados)
+        coluna(nome + ".offsets", offsets)
+
+    for nome, campo in (("no_tipo", "tipo"), ("no_cor", "cor")):
+        codigos, categorias[nome] = _categorias(getattr(p, campo) for p in grafo.projetos)
+        coluna(nome, codigos)
+
+    coluna("no_porta", array("i", (p.porta if p.porta != "" else -1 for p in grafo.projetos)))
+
+    if analise is not None:
+        for campo, tipo in COLUNAS_ANALISE:
+            valores = (analise[chave][campo] for chave in grafo.chaves)
+            coluna("no_" + campo, array(tipo, (-1 if v is None else v for v in valores)))
+
+    origem = array("i", bytes(4 * grafo.n_arestas))
+    for i in range(n):
+        for p in range(grafo.saida_inicio[i], grafo.saida_inicio[i + 1]):
+            origem[p] = i
+    coluna("aresta_inicio", grafo.saida_inicio)
+    coluna("aresta_origem", origem)
+    coluna("aresta_destino", grafo.saida_destino)
+
+    with open(os.path.join(diretorio, MANIFESTO), "w", encoding="utf-8") as f:
+        json.dump({"formato": FORMATO, "versao": VERSAO, "n_nos": n,
+                   "n_arestas": grafo.n_arestas, "colunas": colunas,
+                   "categorias": categorias}, f, indent=2, ensure_ascii=False)
+
+
+def carregar(diretorio, mmap=True):
+    """{coluna: numpy array} (mapeados em memória por padrão) e "_manifesto" """
+    import numpy as np
+
+    with open(os.path.join(diretorio, MANIFESTO), encoding="utf-8") as f:
+        manifesto = json.load(f)
+    if manifesto.get("formato") != FORMATO or manifesto.get("versao") != VERSAO:
+        raise ValueError(f"{diretorio}: formato colunar desconhecido")
+    tabela = {"_manifesto": manifesto}
+    for nome, coluna in manifesto["colunas"].items():
+        tabela[nome] = np.load(os.path.join(diretorio, coluna["arquivo"]),
+                               mmap_mode="r" if mmap else None)
+    return tabela
+
+
+def texto(tabela, coluna, i):
+    """i-ésimo valor de uma coluna de texto"""
+    offsets = tabela[coluna + ".offsets"]
+    return bytes(tabela[coluna + ".dados"][offsets[i]:offsets[i + 1]]).decode("utf-8")
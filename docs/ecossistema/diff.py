@@ -0,0 +1,330 @@
+"""
+DIFERENÇAS ENTRE DOIS RETRATOS DO ECOSSISTEMA
+=============================================
+Compara dois JSONs exportados do mesmo tipo: ECOSSISTEMA-INVISTTO.json
+(--json do ECOSSISTEMA-INVISTTO.py) ou DIAGRAMA-ECOSSISTEMA-DATA.json (--json
+do DIAGRAMA-ECOSSISTEMA.py). Cada retrato vira quatro índices por chave
+(nós, arestas, portas e versões) e as diferenças saem de junções por hash
+(dicts e conjuntos), em O(n + m):
+
+    nós       adicionados / removidos
+    arestas   adicionadas / removidas (DIAGRAMA: "conecta"; ECOSSISTEMA: as
+              ligações como declaradas, ver _ligacoes_declaradas)
+    portas    serviços que mudaram de porta
+    versões   react_version, framework, orm, ... (DIAGRAMA: stack)
+
+Só o que mudou é renderizado: resumo no terminal e, sob pedido, uma página
+HTML compacta e o flowchart Mermaid dos nós afetados e vizinhos diretos.
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.diff ANTIGO.json NOVO.json [--html [DESTINO]]
+                                [--mermaid [DESTINO]] [--out-dir DIR] [--no-open]
+
+Código de saída como o do diff(1): 0 sem diferenças, 1 com diferenças.
+"""
+
+import argparse
+import html
+import json
+import os
+import sys
+import time
+
+from ecossistema import modelo, saida
+from ecossistema.template import compile_template
+
+HTML_ARQUIVO = "DIFF-ECOSSISTEMA.html"
+MERMAID_ARQUIVO = "DIFF-ECOSSISTEMA.mmd"
+
+ECOSSISTEMA = "ecossistema"
+DIAGRAMA = "diagrama"
+
+SECOES = {
+    "frontends": "frontend",
+    "backends": "backend",
+    "services": "service",
+    "databases": "database",
+    "shared_packages": "package",
+}
+
+CAMPOS_VERSAO = ("react_version", "state_management", "ui_framework", "http_client",
+                 "framework", "orm")
+
+
+class Estado:
+    """Um retrato indexado por chave"""
+
+    __slots__ = ("formato", "nos", "arestas", "portas", "versoes")
+
+    def __init__(self, formato):
+        self.formato = formato
+        self.nos = {}        # chave → (tipo, nome)
+        self.arestas = set()  # (origem, destino)
+        self.portas = {}     # chave → porta
+        self.versoes = {}    # (chave, campo) → valor
+
+
+def _de_ecossistema(data):
+    e = Estado(ECOSSISTEMA)
+    for secao, tipo in SECOES.items():
+        for chave, entrada in data.get(secao, {}).items():
+            e.nos[chave] = (tipo, entrada.get("name", chave))
+            if entrada.get("port") not in (None, ""):
+                e.portas[chave] = entrada["port"]
+            for campo in CAMPOS_VERSAO:
+                if entrada.get(campo):
+                    e.versoes[chave, campo] = entrada[campo]
+
+    e.arestas = _ligacoes_declaradas(data)
+    return e
+
+
+def _ligacoes_declaradas(data):
+    """Arestas como escritas em cada entrada, sem a dedução do modelo
+
+    frontend → pacote do "auth", frontend → backend da porta em backend_port
+    (ou citada em "backend"; ":porta" se nenhum backend a usa), serviço →
+    integrates_with e usuário → banco (used_by). As arestas deduzidas pelo
+    ecossistema.modelo dependem do tier dos outros nós: um retrato antigo sem
+    a camada auth mostraria toda aresta de autenticação como adicionada.
+    """
+    backend_da_porta = {}
+    for chave, api in data.get("backends", {}).items():
+        if api.get("port") not in (None, ""):
+            backend_da_porta.setdefault(api["port"], chave)
+
+    arestas = set()
+    for chave, app in data.get("frontends", {}).items():
+        if app.get("auth"):
+            arestas.add((chave, app["auth"]))
+        porta = app.get("backend_port")
+        if porta is None:
+            achada = modelo.PORTA_NO_TEXTO.search(app.get("backend") or "")
+            porta = achada and int(achada.group(1))
+        if porta:
+            arestas.add((chave, backend_da_porta.get(porta, f":{porta}")))
+    for chave, svc in data.get("services", {}).items():
+        for alvo in svc.get("integrates_with", ()):
+            arestas.add((chave, alvo.split(" ", 1)[0]))
+    for chave, db in data.get("databases", {}).items():
+        for usuario in db.get("used_by", ()):
+            arestas.add((usuario, chave))
+    return arestas
+
+
+def _de_diagrama(data):
+    e = Estado(DIAGRAMA)
+    for chave, proj in data.items():
+        e.nos[chave] = (proj.get("tipo", ""), proj.get("nome", chave))
+        if proj.get("porta") not in (None, ""):
+            e.portas[chave] = proj["porta"]
+        if proj.get("stack"):
+            e.versoes[chave, "stack"] = proj["stack"]
+        for alvo in proj.get("conecta", ()):
+            e.arestas.add((chave, alvo))
+    return e
+
+
+def indexar(data):
+    """Estado de um JSON exportado (formato detectado pelas chaves)"""
+    if isinstance(data, dict) and "frontends" in data and "backends" in data:
+        return _de_ecossistema(data)
+    if isinstance(data, dict) and all(isinstance(p, dict) and "tipo" in p for p in data.values()):
+        return _de_diagrama(data)
+    raise ValueError("JSON não é um ECOSSISTEMA-INVISTTO.json nem um DIAGRAMA-ECOSSISTEMA-DATA.json")
+
+
+def carregar(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return indexar(json.load(f))
+
+
+# ==============================================================================
+# COMPARAÇÃO
+# ==============================================================================
+
+def comparar(antigo, novo):
+    """Diferenças entre dois Estados do mesmo formato"""
+    if antigo.formato != novo.formato:
+        raise ValueError(f"formatos diferentes: {antigo.formato} × {novo.formato}")
+
+    def mudancas(a, b):
+        return sorted((chave, a[chave], b[chave]) for chave in a.keys() & b.keys()
+                      if a[chave] != b[chave])
+
+    return {
+        "nos_adicionados": sorted(novo.nos.keys() - antigo.nos.keys()),
+        "nos_removidos": sorted(antigo.nos.keys() - novo.nos.keys()),
+        "arestas_adicionadas": sorted(novo.arestas - antigo.arestas),
+        "arestas_removidas": sorted(antigo.arestas - novo.arestas),
+        "portas": (mudancas(antigo.portas, novo.portas)
+                   + [(chave, None, novo.portas[chave])
+                      for chave in sorted(novo.portas.keys() - antigo.portas.keys())
+                      if chave in antigo.nos]
+                   + [(chave, antigo.portas[chave], None)
+                      for chave in sorted(antigo.portas.keys() - novo.portas.keys())
+                      if chave in novo.nos]),
+        "versoes": [(chave, campo, antes, depois)
+                    for (chave, campo), antes, depois in mudancas(antigo.versoes, novo.versoes)],
+    }
+
+
+def total(delta):
+    return sum(len(lista) for lista in delta.values())
+
+
+# ==============================================================================
+# RENDERIZAÇÃO (SÓ O QUE MUDOU)
+# ==============================================================================
+
+def resumo(delta, antigo, novo):
+    """Linhas do resumo no terminal"""
+    nome = lambda chave: (novo.nos.get(chave) or antigo.nos[chave])[1]
+    linhas = []
+    for chave in delta["nos_adicionados"]:
+        linhas.append(f"  + {chave:<24} {novo.nos[chave][0]}: {nome(chave)}")
+    for chave in delta["nos_removidos"]:
+        linhas.append(f"  - {chave:<24} {antigo.nos[chave][0]}: {nome(chave)}")
+    for origem, destino in delta["arestas_adicionadas"]:
+        linhas.append(f"  + {origem} → {destino}")
+    for origem, destino in delta["arestas_removidas"]:
+        linhas.append(f"  - {origem} → {destino}")
+    for chave, antes, depois in delta["portas"]:
+        linhas.append(f"  ~ {chave:<24} porta {antes or '-'} → {depois or '-'}")
+    for chave, campo, antes, depois in delta["versoes"]:
+        linhas.append(f"  ~ {chave:<24} {campo}: {antes} → {depois}")
+    return linhas
+
+
+def _rotulo(texto):
+    return texto.replace('"', "#quot;")
+
+
+def mermaid(delta, antigo, novo):
+    """flowchart LR dos nós afetados e dos vizinhos das arestas alteradas"""
+    adicionados = set(delta["nos_adicionados"])
+    removidos = set(delta["nos_removidos"])
+    alterados = {c for c, _, _ in delta["portas"]} | {c for c, _, _, _ in delta["versoes"]}
+    arestas = ([(a, b, "==>") for a, b in delta["arestas_adicionadas"]]
+               + [(a, b, "-.->") for a, b in delta["arestas_removidas"]])
+    ordem = sorted(adicionados | removidos | alterados | {c for a, b, _ in arestas for c in (a, b)})
+    ids = {chave: f"n{i}" for i, chave in enumerate(ordem)}
+
+    portas = {c: (antes, depois) for c, antes, depois in delta["portas"]}
+    linhas = ["flowchart LR"]
+    for chave in ordem:
+        no = novo.nos.get(chave) or antigo.nos.get(chave)
+        rotulo = no[1] if no else chave
+        if chave in portas:
+            antes, depois = portas[chave]
+            rotulo += f"<br/>:{antes or '-'} → :{depois or '-'}"
+        elif chave in novo.portas or chave in antigo.portas:
+            rotulo += f"<br/>:{novo.portas.get(chave) or antigo.portas[chave]}"
+        linhas.append(f'    {ids[chave]}["{_rotulo(rotulo)}"]')
+    for origem, destino, seta in arestas:
+        linhas.append(f"    {ids[origem]} {seta} {ids[destino]}")
+
+    linhas.append("    classDef adicionado fill:#dcfce7,stroke:#16a34a")
+    linhas.append("    classDef removido fill:#fee2e2,stroke:#dc2626,stroke-dasharray:4")
+    linhas.append("    classDef alterado fill:#fef3c7,stroke:#d97706")
+    for classe, chaves in (("adicionado", adicionados), ("removido", removidos),
+                           ("alterado", alterados - adicionados - removidos)):
+        if chaves:
+            linhas.append(f"    class {','.join(ids[c] for c in sorted(chaves))} {classe}")
+    return "\n".join(linhas)
+
+
+HTML_DIFF = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <title>Diferenças do Ecossistema</title>
+    <script src="https://unpkg.com/mermaid@10/dist/mermaid.min.js"></script>
+    <style>
+        body { font-family: system-ui, sans-serif; margin: 2rem; color: #1f2937; }
+        h1 { font-size: 1.5rem; } h2 { font-size: 1.1rem; margin-top: 1.5rem; }
+        .arquivos { color: #6b7280; font-size: 0.9rem; }
+        ul { font-family: monospace; font-size: 0.9rem; list-style: none; padding-left: 0; }
+        .mais { color: #15803d; } .menos { color: #b91c1c; } .mudou { color: #b45309; }
+        .mermaid { background: #f8fafc; border-radius: 8px; padding: 20px; }
+    </style>
+</head>
+<body>
+    <h1>🔀 Diferenças do Ecossistema ({{total}})</h1>
+    <p class="arquivos">{{antigo}} → {{novo}}</p>
+    <div class="mermaid">
+{{diagrama}}
+    </div>
+    <h2>Mudanças</h2>
+    <ul>
+{{itens}}
+    </ul>
+    <script>mermaid.initialize({ startOnLoad: true, theme: 'default' });</script>
+</body>
+</html>
+"""
+
+_CLASSES = {"+": "mais", "-": "menos", "~": "mudou"}
+
+
+def gerar_html(delta, antigo, novo, nome_antigo, nome_novo):
+    itens = []
+    for linha in resumo(delta, antigo, novo):
+        marca = linha.strip()[0]
+        itens.append(f'        <li class="{_CLASSES[marca]}">{html.escape(linha.strip())}</li>')
+    return compile_template(HTML_DIFF).render({
+        "total": total(delta),
+        "antigo": html.escape(nome_antigo),
+        "novo": html.escape(nome_novo),
+        "diagrama": html.escape(mermaid(delta, antigo, novo), quote=False),
+        "itens": "\n".join(itens) or "        <li>Nenhuma diferença</li>",
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diferenças entre dois JSONs exportados do ecossistema")
+    parser.add_argument("antigo", help="JSON mais antigo")
+    parser.add_argument("novo", help="JSON mais novo")
+    saida.adicionar_seletor(parser, "html", "página só com as mudanças")
+    saida.adicionar_seletor(parser, "mermaid", "flowchart Mermaid das mudanças")
+    saida.adicionar_opcoes(parser, ".")
+    args = parser.parse_args(argv)
+
+    destinos = {
+        nome: saida.destino(valor, args.out_dir, arquivo)
+        for nome, valor, arquivo in (("html", args.html, HTML_ARQUIVO),
+                                     ("mermaid", args.mermaid, MERMAID_ARQUIVO))
+        if valor is not None
+    }
+    saida.validar(parser, destinos)
+    log = saida.log(destinos)
+
+    inicio = time.perf_counter()
+    try:
+        antigo, novo = carregar(args.antigo), carregar(args.novo)
+        delta = comparar(antigo, novo)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"🔀 {args.antigo} → {args.novo}", file=log)
+    for linha in resumo(delta, antigo, novo):
+        print(linha, file=log)
+    print(f"📊 {total(delta)} diferenças em {time.perf_counter() - inicio:.3f}s", file=log)
+
+    if "mermaid" in destinos:
+        with saida.abrir(destinos["mermaid"]) as f:
+            f.write(mermaid(delta, antigo, novo) + "\n")
+        if not saida.eh_stdout(destinos["mermaid"]):
+            print(f"✅ Mermaid: {destinos['mermaid']}", file=log)
+    if "html" in destinos:
+        with saida.abrir(destinos["html"]) as f:
+            f.write(gerar_html(delta, antigo, novo, os.path.basename(args.antigo),
+                               os.path.basename(args.novo)))
+        if not saida.eh_stdout(destinos["html"]):
+            print(f"✅ HTML: {destinos['html']}", file=log)
+        saida.abrir_navegador(destinos["html"], args)
+    return 1 if total(delta) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+FLUXOGRAMA DA ARQUITETURA (MERMAID OU SVG PRÉ-CALCULADO)
+========================================================
+Gera o diagrama de arquitetura do HTML a partir do modelo validado
+(ecossistema.modelo), em vez do bloco escrito à mão: um subgrafo por camada
+(hub, auth, frontend, backend, service, database) e as arestas deduzidas
+dos dados (Ecossistema.arestas).
+
+Camada com mais de LIMIAR_SUBGRAFO nós é recolhida num único nó; as arestas
+dos membros passam a sair (ou chegar) nele, somadas e rotuladas com o total.
+
+    mermaid(modelo)   texto "flowchart TB" (o navegador calcula o layout)
+    svg(modelo)       SVG pronto, com layout em camadas feito aqui: uma
+                      faixa por camada, ordem dentro da faixa pelo
+                      baricentro dos vizinhos (menos cruzamentos)
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.fluxograma ECOSSISTEMA-INVISTTO.json [--svg] [--limiar N]
+"""
+
+import argparse
+import html
+import json
+import re
+import sys
+
+from ecossistema import modelo
+
+LIMIAR_SUBGRAFO = 15
+
+# Camadas na ordem de cima para baixo: (título do subgrafo, preenchimento, borda)
+CAMADAS = {
+    "hub": ("🏠 INVISTTO HUB", "#3b82f6", "#1d4ed8"),
+    "auth": ("🔐 AUTENTICAÇÃO", "#ef4444", "#dc2626"),
+    "frontend": ("🖥️ APLICAÇÕES FRONTEND", "#10b981", "#059669"),
+    "backend": ("⚙️ APIS BACKEND", "#8b5cf6", "#7c3aed"),
+    "service": ("🔧 SERVIÇOS AUXILIARES", "#f59e0b", "#d97706"),
+    "database": ("💾 DADOS", "#6366f1", "#4f46e5"),
+}
+OUTRA = ("📦 OUTROS", "#94a3b8", "#64748b")
+
+
+class _No:
+    __slots__ = ("id", "camada", "linhas", "banco")
+
+    def __init__(self, id, camada, linhas, banco=False):
+        self.id = id
+        self.camada = camada
+        self.linhas = linhas
+        self.banco = banco
+
+
+def _id(chave, usados):
+    base = re.sub(r"\W", "_", chave).upper() or "N"
+    id, n = base, 1
+    while id in usados:
+        n += 1
+        id = f"{base}_{n}"
+    usados.add(id)
+    return id
+
+
+def montar(m, limiar=LIMIAR_SUBGRAFO):
+    """(camadas {camada: [_No]}, arestas [(id origem, id destino, n)])"""
+    membros = {}
+    for s in m.frontends + m.backends + m.services:
+        linha = f":{s.port}" if s.port != "" else ""
+        if s.secao == "frontends" and s.production_path != "/":
+            linha += f" → {s.production_path}"
+        membros.setdefault(s.tier, []).append((s.chave, [s.name, linha] if linha else [s.name], False))
+    for db in m.databases:
+        local = f"{db.host}:{db.port}" if db.host and db.port != "" else db.host or f":{db.port}"
+        membros.setdefault("database", []).append((db.chave, [db.name, local], True))
+
+    ordem = [c for c in CAMADAS if c in membros] + sorted(c for c in membros if c not in CAMADAS)
+    # Ids dos subgrafos reservados antes dos nós
+    usados = {camada.upper() for camada in ordem}
+    camadas = {}
+    no_da_chave = {}
+    for camada in ordem:
+        itens = membros[camada]
+        if len(itens) > limiar:
+            titulo = CAMADAS.get(camada, OUTRA)[0]
+            no = _No(_id(camada + "_todos", usados), camada, [titulo, f"{len(itens)} nós"])
+            camadas[camada] = [no]
+            for chave, _, _ in itens:
+                no_da_chave[chave] = no.id
+            continue
+        camadas[camada] = []
+        for chave, linhas, banco in itens:
+            no = _No(_id(chave, usados), camada, linhas, banco)
+            camadas[camada].append(no)
+            no_da_chave[chave] = no.id
+
+    # Arestas entre nós recolhidos viram uma só, com o total
+    contagem = {}
+    for a in m.arestas:
+        origem, destino = no_da_chave.get(a.origem), no_da_chave.get(a.destino)
+        if origem is not None and destino is not None and origem != destino:
+            contagem[origem, destino] = contagem.get((origem, destino), 0) + 1
+    return camadas, [(o, d, n) for (o, d), n in contagem.items()]
+
+
+# ==============================================================================
+# MERMAID
+# ==============================================================================
+
+def _texto_mermaid(linhas):
+    return "<br/>".join(l.replace('"', "#quot;") for l in linhas)
+
+
+def mermaid(m, limiar=LIMIAR_SUBGRAFO):
+    """flowchart TB com um subgrafo por camada"""
+    camadas, arestas = montar(m, limiar)
+    saida = ["flowchart TB"]
+    for camada, nos in camadas.items():
+        titulo = CAMADAS.get(camada, OUTRA)[0]
+        saida.append(f'    subgraph {camada.upper()}["{titulo}"]')
+        for no in nos:
+            abre, fecha = ('[("', '")]') if no.banco else ('["', '"]')
+            saida.append(f"        {no.id}{abre}{_texto_mermaid(no.linhas)}{fecha}")
+        saida.append("    end")
+    saida.append("")
+    for origem, destino, n in arestas:
+        saida.append(f"    {origem} -->|{n}| {destino}" if n > 1 else f"    {origem} --> {destino}")
+    saida.append("")
+    for camada, nos in camadas.items():
+        _, fundo, borda = CAMADAS.get(camada, OUTRA)
+        saida.append(f"    classDef {camada} fill:{fundo},stroke:{borda},color:#fff")
+        saida.append(f"    class {','.join(no.id for no in nos)} {camada}")
+    return "\n".join(saida)
+
+
+# ==============================================================================
+# SVG (LAYOUT EM CAMADAS)
+# ==============================================================================
+
+LARGURA_CARACTERE = 7
+ALTURA_LINHA = 16
+MARGEM = 24
+ESPACO_X = 24
+ESPACO_FAIXA = 56
+TITULO_FAIXA = 28
+POR_LINHA = 8
+
+
+def _tamanho(no):
+    largura = max(110, max(len(l) for l in no.linhas) * LARGURA_CARACTERE + 24)
+    return largura, len(no.linhas) * ALTURA_LINHA + 20
+
+
+def _ordenar(camadas, arestas):
+    """Ordem dentro de cada faixa pelo baricentro dos vizinhos já posicionados"""
+    vizinhos = {}
+    for origem, destino, _ in arestas:
+        vizinhos.setdefault(origem, []).append(destino)
+        vizinhos.setdefault(destino, []).append(origem)
+    posicao = {}
+    for _ in range(2):
+        for nos in camadas.values():
+            chave = {}
+            for i, no in enumerate(nos):
+                xs = [posicao[v] for v in vizinhos.get(no.id, ()) if v in posicao]
+                chave[no.id] = (sum(xs) / len(xs) if xs else (i + 0.5) / len(nos), i)
+            nos.sort(key=lambda no: chave[no.id])
+            for i, no in enumerate(nos):
+                posicao[no.id] = (i + 0.5) / len(nos)
+
+
+def svg(m, limiar=LIMIAR_SUBGRAFO):
+    """SVG do fluxograma com posições calculadas no servidor"""
+    camadas, arestas = montar(m, limiar)
+    _ordenar(camadas, arestas)
+
+    # Faixas: até POR_LINHA nós por linha, centralizadas
+    linhas_faixa = []
+    for camada, nos in camadas.items():
+        linhas = [nos[i:i + POR_LINHA] for i in range(0, len(nos), POR_LINHA)]
+        linhas_faixa.append((camada, [[(no, *_tamanho(no)) for no in linha] for linha in linhas]))
+    largura = max((sum(w for _, w, _ in linha) + ESPACO_X * (len(linha) - 1)
+                   for _, linhas in linhas_faixa for linha in linhas), default=0) + 2 * MARGEM
+
+    caixas = {}
+    faixas = []
+    y = MARGEM
+    for camada, linhas in linhas_faixa:
+        topo = y
+        y += TITULO_FAIXA
+        for linha in linhas:
+            altura = max(h for _, _, h in linha)
+            x = (largura - sum(w for _, w, _ in linha) - ESPACO_X * (len(linha) - 1)) / 2
+            for no, w, h in linha:
+                caixas[no.id] = (x, y + (altura - h) / 2, w, h, no)
+                x += w + ESPACO_X
+            y += altura + 16
+        faixas.append((camada, topo, y - topo))
+        y += ESPACO_FAIXA - 16
+    altura_total = y - ESPACO_FAIXA + 16 + MARGEM
+
+    saida = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {largura:.0f} {altura_total:.0f}" '
+        f'width="{largura:.0f}" height="{altura_total:.0f}" font-family="system-ui, sans-serif">',
+        '<defs><marker id="seta" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="7" '
+        'markerHeight="7" orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" '
+        'fill="#64748b"/></marker></defs>',
+    ]
+    for camada, topo, altura in faixas:
+        titulo, _, borda = CAMADAS.get(camada, OUTRA)
+        saida.append(f'<rect x="{MARGEM / 2:.0f}" y="{topo:.0f}" width="{largura - MARGEM:.0f}" '
+                     f'height="{altura:.0f}" rx="10" fill="#f8fafc" stroke="{borda}" '
+                     f'stroke-opacity="0.4"/>')
+        saida.append(f'<text x="{MARGEM:.0f}" y="{topo + 19:.0f}" font-size="13" font-weight="bold" '
+                     f'fill="#334155">{html.escape(titulo)}</text>')
+
+    for origem, destino, n in arestas:
+        x1, y1, w1, h1, _ = caixas[origem]
+        x2, y2, w2, h2, _ = caixas[destino]
+        cx1, cx2 = x1 + w1 / 2, x2 + w2 / 2
+        if y2 > y1:
+            ay, by = y1 + h1, y2
+        elif y2 < y1:
+            ay, by = y1, y2 + h2
+        else:
+            ay, by = y1, y2
+        meio = (ay + by) / 2 if y1 != y2 else y1 - 30
+        saida.append(f'<path d="M{cx1:.1f},{ay:.1f} C{cx1:.1f},{meio:.1f} {cx2:.1f},{meio:.1f} '
+                     f'{cx2:.1f},{by:.1f}" fill="none" stroke="#64748b" stroke-opacity="0.6" '
+                     f'stroke-width="{min(1.2 + 0.4 * (n - 1), 4):.1f}" marker-end="url(#seta)"/>')
+        if n > 1:
+            saida.append(f'<text x="{(cx1 + cx2) / 2:.1f}" y="{meio - 3:.1f}" font-size="10" '
+                         f'text-anchor="middle" fill="#475569">{n}</text>')
+
+    for x, y, w, h, no in caixas.values():
+        _, fundo, borda = CAMADAS.get(no.camada, OUTRA)
+        rx = 18 if no.banco else 8
+        saida.append(f'<g><rect x="{x:.1f}" y="{y:.1f}" width="{w:.0f}" height="{h:.0f}" rx="{rx}" '
+                     f'fill="{fundo}" stroke="{borda}" stroke-width="2"/>')
+        for i, linha in enumerate(no.linhas):
+            peso = ' font-weight="bold"' if i == 0 else ""
+            saida.append(f'<text x="{x + w / 2:.1f}" y="{y + 10 + ALTURA_LINHA * (i + 0.75):.1f}" '
+                         f'font-size="{12 if i == 0 else 11}"{peso} text-anchor="middle" '
+                         f'fill="#fff">{html.escape(linha)}</text>')
+        saida.append("</g>")
+    saida.append("</svg>")
+    return "\n".join(saida)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fluxograma da arquitetura de um ECOSSISTEMA-INVISTTO.json")
+    parser.add_argument("json", help="ECOSYSTEM_DATA exportado (--json)")
+    parser.add_argument("--svg", action="store_true", help="SVG com layout pronto em vez de Mermaid")
+    parser.add_argument("--limiar", type=int, default=LIMIAR_SUBGRAFO,
+                        help="recolhe camadas com mais nós que isso (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+
+    with open(args.json, encoding="utf-8") as f:
+        try:
+            m = modelo.validar_ecossistema(json.load(f))
+        except modelo.ErroValidacao as e:
+            parser.error(str(e))
+    print(svg(m, args.limiar) if args.svg else mermaid(m, args.limiar))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
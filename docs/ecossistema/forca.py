@@ -0,0 +1,277 @@
+"""
+MOTOR DE LAYOUT POR FORÇAS (NumPy)
+==================================
+Fruchterman-Reingold vetorizado sobre arrays, sem networkx:
+
+    - repulsão k²/d: exata (em blocos) para grafos pequenos; acima de
+      LIMIAR_EXATO, por grade hierárquica: pares exatos só entre células
+      vizinhas (lado k) e centros de massa para as distantes, no estilo
+      Barnes-Hut;
+    - atração d²/k vetorizada sobre o array de arestas (nos dois sentidos);
+    - passo limitado pela temperatura, com resfriamento linear (padrão) ou
+      geométrico;
+    - nós fixos e nós ancorados (mola até a posição inicial) para o
+      relaxamento incremental.
+
+Dependência: numpy.
+"""
+
+import numpy as np
+
+# Até quantos nós a repulsão é calculada entre todos os pares
+LIMIAR_EXATO = 800
+
+# Máximo de pares materializados por vez (limita memória em regiões densas)
+PARES_POR_BLOCO = 1 << 21
+
+
+def _acumular(desloc, ii, vx, vy):
+    n = len(desloc)
+    desloc[:, 0] += np.bincount(ii, weights=vx, minlength=n)
+    desloc[:, 1] += np.bincount(ii, weights=vy, minlength=n)
+
+
+def repulsao_exata(pos, k, ativos=None):
+    """Σ_j k²·(p_i - p_j)/d² para cada i em `ativos` (todos se None)"""
+    n = len(pos)
+    desloc = np.zeros((n, 2))
+    ids = np.arange(n) if ativos is None else np.flatnonzero(ativos)
+    x, y = pos[:, 0], pos[:, 1]
+    bloco = max(1, PARES_POR_BLOCO // max(n, 1))
+    k2 = k * k
+    for ini in range(0, len(ids), bloco):
+        linhas = ids[ini:ini + bloco]
+        dx = x[linhas, None] - x[None, :]
+        dy = y[linhas, None] - y[None, :]
+        d2 = dx * dx + dy * dy
+        np.maximum(d2, 1e-4 * k2, out=d2)
+        f = k2 / d2
+        f[np.arange(len(linhas)), linhas] = 0.0
+        desloc[linhas, 0] = (dx * f).sum(axis=1)
+        desloc[linhas, 1] = (dy * f).sum(axis=1)
+    return desloc
+
+
+def _indice_celulas(cel):
+    """Células ocupadas de um nível: (célula de cada nó, nº de células, busca)
+
+    busca(cx, cy) devolve o índice da célula ou -1 se vazia, para
+    coordenadas até 3 células fora das ocupadas. Usa uma tabela densa
+    quando a grade não é muito esparsa; senão, busca binária.
+    """
+    minimo = cel.min(axis=0) - 3
+    c = cel - minimo
+    larg, alt = (int(v) + 4 for v in c.max(axis=0))
+    unicas, inverso = np.unique(c[:, 0] * alt + c[:, 1], return_inverse=True)
+
+    if larg * alt <= 16 * len(cel) + 4096:
+        mapa = np.full(larg * alt, -1, dtype=np.int64)
+        mapa[unicas] = np.arange(len(unicas))
+
+        def busca(cx, cy):
+            return mapa[(cx - minimo[0]) * alt + (cy - minimo[1])]
+    else:
+        def busca(cx, cy):
+            chave = (cx - minimo[0]) * alt + (cy - minimo[1])
+            i = np.minimum(np.searchsorted(unicas, chave), len(unicas) - 1)
+            return np.where(unicas[i] == chave, i, -1)
+
+    return inverso.ravel(), len(unicas), busca
+
+
+def _vizinhanca(pos, ids, k2, celula, massa, busca, meu, desloc):
+    """Repulsão exata entre cada nó de `ids` e os nós das 3x3 células vizinhas"""
+    x, y = pos[:, 0].copy(), pos[:, 1].copy()
+    ordem = np.argsort(celula, kind="stable")
+    inicio = np.cumsum(massa) - massa
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            alvo = busca(meu[:, 0] + ox, meu[:, 1] + oy)
+            cnt = np.where(alvo >= 0, massa[alvo], 0)
+            ini = inicio[alvo]
+
+            # Blocos de nós cuja soma de pares cabe em PARES_POR_BLOCO
+            acum = np.cumsum(cnt)
+            cortes = np.searchsorted(acum, np.arange(PARES_POR_BLOCO, acum[-1], PARES_POR_BLOCO))
+            limites = np.concatenate(([0], cortes, [len(ids)]))
+            for a, b in zip(limites[:-1], limites[1:]):
+                c = cnt[a:b]
+                total = int(c.sum())
+                if total == 0:
+                    continue
+                ii = np.repeat(ids[a:b], c)
+                jj = ordem[np.repeat(ini[a:b] - (np.cumsum(c) - c), c) + np.arange(total)]
+                dx = x.take(ii) - x.take(jj)
+                dy = y.take(ii) - y.take(jj)
+                d2 = np.maximum(dx * dx + dy * dy, 1e-4 * k2)
+                f = np.where(ii != jj, k2 / d2, 0.0)
+                _acumular(desloc, ii, dx * f, dy * f)
+
+
+def repulsao_grade(pos, k, ativos=None, lado=None):
+    """Repulsão aproximada por grade hierárquica (Barnes-Hut em grade)
+
+    Nós nas 3x3 células vizinhas (lado padrão k) repelem exatamente. O
+    resto é agrupado por nível: no nível L (células de lado·2^L) cada nó
+    sente o centro de massa das células filhas das vizinhas da célula-mãe
+    que não são vizinhas da sua; no nível mais alto, todas as não vizinhas.
+    Cada par de nós é contado uma única vez e o custo fica em
+    O(n · log(extensão/lado)) mais os pares próximos.
+    """
+    n = len(pos)
+    desloc = np.zeros((n, 2))
+    if n < 2:
+        return desloc
+    lado = k if lado is None else lado
+    k2 = k * k
+    ids = np.arange(n) if ativos is None else np.flatnonzero(ativos)
+    if len(ids) == 0:
+        return desloc
+    p = pos[ids]
+
+    # Deslocamentos do nível L: filhas das 3x3 mães vizinhas (6x6), menos as
+    # 3x3 vizinhas (sobram 27); dependem da paridade da célula
+    base = np.arange(-2, 4)
+    grade = np.stack(np.meshgrid(base, base, indexing="ij"), axis=-1).reshape(-1, 2)
+    deslocamentos = np.empty((2, 2, 27, 2), dtype=np.int64)
+    for px in (0, 1):
+        for py in (0, 1):
+            o = grade - (px, py)
+            deslocamentos[px, py] = o[np.abs(o).max(axis=1) > 1]
+    cel = np.floor((pos - pos.min(axis=0)) / lado).astype(np.int64)
+    nivel = 0
+    while True:
+        celula, total, busca = _indice_celulas(cel)
+        massa = np.bincount(celula, minlength=total)
+        cx = np.bincount(celula, weights=pos[:, 0], minlength=total) / massa
+        cy = np.bincount(celula, weights=pos[:, 1], minlength=total) / massa
+        meu = cel[ids]
+        if nivel == 0:
+            _vizinhanca(pos, ids, k2, celula, massa, busca, meu, desloc)
+
+        topo = int(np.ptp(cel, axis=0).max()) < 4
+        if topo:
+            # Todas as células não vizinhas do nível (no máximo 4x4)
+            primeiro = np.zeros(total, dtype=np.int64)
+            primeiro[celula[::-1]] = np.arange(n)[::-1]
+            ox = cel[primeiro][None, :, 0] - meu[:, None, 0]
+            oy = cel[primeiro][None, :, 1] - meu[:, None, 1]
+            alvo = np.broadcast_to(np.arange(total), ox.shape)
+            valido = (np.abs(ox) > 1) | (np.abs(oy) > 1)
+        else:
+            o = deslocamentos[meu[:, 0] & 1, meu[:, 1] & 1]
+            alvo = busca(meu[:, 0:1] + o[:, :, 0], meu[:, 1:2] + o[:, :, 1])
+            valido = alvo >= 0
+
+        dx = p[:, 0:1] - cx[alvo]
+        dy = p[:, 1:2] - cy[alvo]
+        d2 = np.maximum(dx * dx + dy * dy, 1e-4 * k2)
+        f = np.where(valido, k2 * massa[alvo] / d2, 0.0)
+        desloc[ids, 0] += (dx * f).sum(axis=1)
+        desloc[ids, 1] += (dy * f).sum(axis=1)
+        if topo:
+            return desloc
+        cel = cel // 2
+        nivel += 1
+
+
+def repulsao(pos, k, ativos=None, lado=None):
+    if len(pos) <= LIMIAR_EXATO:
+        return repulsao_exata(pos, k, ativos)
+    return repulsao_grade(pos, k, ativos, lado)
+
+
+def atracao(pos, origem, destino, k):
+    """-Σ d·(p_i - p_j)/k sobre as arestas, nos dois sentidos"""
+    desloc = np.zeros((len(pos), 2))
+    if len(origem) == 0:
+        return desloc
+    delta = pos[origem] - pos[destino]
+    d = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+    f = d / k
+    vx, vy = delta[:, 0] * f, delta[:, 1] * f
+    _acumular(desloc, origem, -vx, -vy)
+    _acumular(desloc, destino, vx, vy)
+    return desloc
+
+
+def k_equilibrio(pos, origem, destino, medidos=None):
+    """k que deixa `pos` mais perto do equilíbrio (mínimos quadrados)
+
+    A força em i é k²·R_i - A_i/k; resolvendo k³·R_i = A_i para os nós em
+    `medidos` recupera a escala de um layout que já foi reescalado.
+    """
+    if len(origem) == 0 or len(pos) < 2:
+        return None
+    delta = pos[origem] - pos[destino]
+    comprimentos = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+    referencia = float(np.median(comprimentos)) or 1.0
+    r = repulsao(pos, 1.0, medidos, lado=referencia)
+    a = -atracao(pos, origem, destino, 1.0)
+    if medidos is not None:
+        r, a = r[medidos], a[medidos]
+    rr = float(np.einsum("ij,ij->", r, r))
+    ra = float(np.einsum("ij,ij->", r, a))
+    if rr <= 0 or ra <= 0:
+        return None
+    return (ra / rr) ** (1 / 3)
+
+
+def layout_forca(n, origem, destino, pos=None, k=None, iteracoes=50,
+                 temperatura=None, resfriamento=None, fixos=None,
+                 ancorados=None, ancora=8.0, seed=42, reescalar=None):
+    """Posições (n, 2) por Fruchterman-Reingold
+
+    n                  número de nós; origem/destino: arrays de ids das arestas
+    pos                posições iniciais (n, 2); aleatórias se None
+    k                  distância ideal; padrão 1/sqrt(n) como no networkx
+    iteracoes          número de iterações
+    temperatura        passo máximo inicial; padrão 10% do domínio
+    resfriamento       None = linear até ~0; float = fator geométrico por iteração
+    fixos              máscara bool de nós que não se movem
+    ancorados, ancora  máscara bool de nós presos por mola à posição inicial
+    reescalar          centraliza e ajusta em [-1, 1] (padrão: se não há fixos)
+    """
+    origem = np.asarray(origem, dtype=np.int64)
+    destino = np.asarray(destino, dtype=np.int64)
+    if n == 0:
+        return np.zeros((0, 2))
+    if k is None:
+        k = 1.0 / np.sqrt(n)
+    if pos is None:
+        # Densidade inicial ~1 nó por k²: mantém a grade com poucos pares
+        lado = k * np.sqrt(n)
+        pos = np.random.default_rng(seed).random((n, 2)) * lado
+    pos = np.array(pos, dtype=float)
+    if n == 1:
+        return np.zeros((1, 2)) if reescalar is not False else pos
+
+    if temperatura is None:
+        temperatura = 0.1 * float(np.ptp(pos, axis=0).max() or 1.0)
+    t = temperatura
+    dt = t / (iteracoes + 1)
+    ativos = None if fixos is None else ~np.asarray(fixos, dtype=bool)
+    if ancorados is not None:
+        ancorados = np.asarray(ancorados, dtype=bool)
+        origem_ancora = pos[ancorados].copy()
+
+    for _ in range(iteracoes):
+        desloc = repulsao(pos, k, ativos) + atracao(pos, origem, destino, k)
+        if ancorados is not None:
+            desloc[ancorados] -= ancora * (pos[ancorados] - origem_ancora)
+        comprimento = np.sqrt(np.einsum("ij,ij->i", desloc, desloc))
+        escala = np.minimum(1.0, t / np.maximum(comprimento, 1e-12))
+        desloc *= escala[:, None]
+        if ativos is not None:
+            desloc[~ativos] = 0.0
+        pos += desloc
+        t = t * resfriamento if resfriamento is not None else t - dt
+
+    if reescalar is None:
+        reescalar = fixos is None
+    if reescalar:
+        pos -= pos.mean(axis=0)
+        limite = np.abs(pos).max()
+        if limite > 0:
+            pos /= limite
+    return pos
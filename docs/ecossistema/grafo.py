@@ -0,0 +1,105 @@
+"""
+GRAFO COMPILADO DO ECOSSISTEMA
+==============================
+Índice construído uma única vez a partir de PROJETOS e consumido por todos
+os renderizadores: registros Projeto validados, ids inteiros, adjacência
+direta e reversa em formato CSR (arrays contíguos) e agrupamento dos nós
+por tipo.
+"""
+
+from array import array
+
+from ecossistema.modelo import validar_projetos
+
+
+class GrafoCompilado:
+    """Grafo dirigido imutável (origem "conecta" destino) em formato CSR"""
+
+    __slots__ = (
+        "chaves", "indice", "projetos", "tipos", "por_tipo",
+        "saida_inicio", "saida_destino", "entrada_inicio", "entrada_origem",
+    )
+
+    def __len__(self):
+        return len(self.chaves)
+
+    @property
+    def n_arestas(self):
+        return len(self.saida_destino)
+
+    def id(self, chave):
+        """Id inteiro do nó (KeyError se não existir)"""
+        return self.indice[chave]
+
+    def sucessores(self, i):
+        return self.saida_destino[self.saida_inicio[i]:self.saida_inicio[i + 1]]
+
+    def predecessores(self, i):
+        return self.entrada_origem[self.entrada_inicio[i]:self.entrada_inicio[i + 1]]
+
+    def grau_saida(self, i):
+        return self.saida_inicio[i + 1] - self.saida_inicio[i]
+
+    def grau_entrada(self, i):
+        return self.entrada_inicio[i + 1] - self.entrada_inicio[i]
+
+    def arestas(self):
+        """Itera (origem, destino) na ordem de declaração em "conecta" """
+        inicio = self.saida_inicio
+        destino = self.saida_destino
+        for i in range(len(self.chaves)):
+            for p in range(inicio[i], inicio[i + 1]):
+                yield i, destino[p]
+
+
+def compilar_grafo(projetos):
+    """Compila o dict PROJETOS em um GrafoCompilado (tempo linear)
+
+    A entrada é validada antes (ecossistema.modelo): faltando campo, levanta
+    ErroValidacao com todos os problemas; os nós viram registros Projeto.
+    """
+    g = GrafoCompilado()
+    g.chaves, g.projetos, arestas = validar_projetos(projetos)
+    g.indice = {chave: i for i, chave in enumerate(g.chaves)}
+    g.tipos = []
+    g.por_tipo = {}
+
+    n = len(g.chaves)
+    saida_inicio = array("i", [0])
+    saida_destino = array("i")
+    grau_entrada = array("i", bytes(4 * n))
+
+    p = 0
+    for i, proj in enumerate(g.projetos):
+        tipo = proj.tipo
+        g.tipos.append(tipo)
+        ids = g.por_tipo.get(tipo)
+        if ids is None:
+            ids = g.por_tipo[tipo] = array("i")
+        ids.append(i)
+
+        # Arestas já vêm agrupadas pela origem, na ordem de "conecta"
+        while p < len(arestas) and arestas[p].origem == i:
+            j = arestas[p].destino
+            saida_destino.append(j)
+            grau_entrada[j] += 1
+            p += 1
+        saida_inicio.append(len(saida_destino))
+
+    # Adjacência reversa por contagem (counting sort sobre o destino)
+    entrada_inicio = array("i", [0]) * (n + 1)
+    for j in range(n):
+        entrada_inicio[j + 1] = entrada_inicio[j] + grau_entrada[j]
+    cursor = array("i", entrada_inicio[:n])
+    entrada_origem = array("i", bytes(4 * len(saida_destino)))
+    for i in range(n):
+        for p in range(saida_inicio[i], saida_inicio[i + 1]):
+            j = saida_destino[p]
+            entrada_origem[cursor[j]] = i
+            cursor[j] += 1
+
+    g.saida_inicio = saida_inicio
+    g.saida_destino = saida_destino
+    g.entrada_inicio = entrada_inicio
+    g.entrada_origem = entrada_origem
+    return g
@@ -0,0 +1,187 @@
+"""
+LAYOUT DO GRAFO COM CACHE (WARM START)
+======================================
+As posições calculadas para o PNG ficam em cache por chave de nó, junto com
+uma assinatura da vizinhança. Na execução seguinte:
+
+    - nós conhecidos e sem mudança mantêm a posição;
+    - nós novos ou cuja vizinhança mudou, mais os vizinhos deles, são
+      relaxados, presos a uma moldura fixa formada pelos vizinhos desses
+      vizinhos (os que já tinham posição só se acomodam, ancorados);
+    - se nada mudou, nenhum layout é calculado.
+
+Assim o custo acompanha o tamanho da mudança e a figura não "pula" quando
+um serviço é adicionado. As forças são calculadas por ecossistema.forca
+(NumPy), importado só quando um layout é de fato necessário.
+"""
+
+import hashlib
+import json
+import os
+import random
+
+from ecossistema import rastro
+
+CACHE_ARQUIVO = ".DIAGRAMA-ECOSSISTEMA.layout.json"
+
+# Rigidez da mola que segura nós já posicionados durante o relaxamento local
+ANCORA = 8.0
+
+
+def assinaturas(grafo):
+    """Hash da vizinhança (entrada e saída) de cada nó, por id"""
+    chaves = grafo.chaves
+    resultado = []
+    for i in range(len(chaves)):
+        saida = ",".join(sorted(chaves[j] for j in grafo.sucessores(i)))
+        entrada = ",".join(sorted(chaves[j] for j in grafo.predecessores(i)))
+        resultado.append(hashlib.sha1(f"{saida}|{entrada}".encode("utf-8")).hexdigest()[:16])
+    return resultado
+
+
+def carregar_cache(caminho):
+    """{chave: (x, y, assinatura)}; cache ausente ou inválido vira {}"""
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            nos = json.load(f)["nos"]
+        return {chave: (v[0], v[1], v[2]) for chave, v in nos.items()}
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        return {}
+
+
+def salvar_cache(caminho, grafo, pos, assin):
+    nos = {chave: [float(pos[chave][0]), float(pos[chave][1]), assin[i]]
+           for i, chave in enumerate(grafo.chaves)}
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    tmp = caminho + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"nos": nos}, f)
+    os.replace(tmp, caminho)
+
+
+def _vizinhos(grafo, ids):
+    resultado = set()
+    for i in ids:
+        resultado.update(grafo.sucessores(i))
+        resultado.update(grafo.predecessores(i))
+    return resultado
+
+
+def _arestas(grafo, ids=None):
+    """Arrays (origem, destino) das arestas, opcionalmente restritas a `ids`
+
+    Com `ids`, os índices são renumerados para posições em `ids`.
+    """
+    import numpy as np
+
+    inicio = np.frombuffer(grafo.saida_inicio, dtype=np.int32)
+    destino = np.frombuffer(grafo.saida_destino, dtype=np.int32).astype(np.int64)
+    origem = np.repeat(np.arange(len(grafo), dtype=np.int64), np.diff(inicio))
+    if ids is None:
+        return origem, destino
+    local = np.full(len(grafo), -1, dtype=np.int64)
+    local[ids] = np.arange(len(ids))
+    origem, destino = local[origem], local[destino]
+    dentro = (origem >= 0) & (destino >= 0) & (origem != destino)
+    return origem[dentro], destino[dentro]
+
+
+def _k_equilibrio(grafo, ids, pos):
+    """k que deixa as posições atuais de `ids` mais perto do equilíbrio
+
+    O layout em cache foi reescalado e não tem mais o k original; ver
+    forca.k_equilibrio.
+    """
+    import numpy as np
+    from ecossistema import forca
+
+    chaves = grafo.chaves
+    ids = sorted(i for i in ids if chaves[i] in pos)
+    if len(ids) < 2:
+        return None
+    xy = np.array([pos[chaves[i]] for i in ids], dtype=float)
+    origem, destino = _arestas(grafo, ids)
+    return forca.k_equilibrio(xy, origem, destino)
+
+
+def _layout_completo(grafo, k, iteracoes, seed):
+    """Layout do grafo inteiro com o motor vetorizado (ecossistema.forca)"""
+    from ecossistema import forca
+
+    origem, destino = _arestas(grafo)
+    xy = forca.layout_forca(len(grafo), origem, destino, k=k,
+                            iteracoes=iteracoes, seed=seed)
+    return {chave: (xy[i, 0], xy[i, 1]) for i, chave in enumerate(grafo.chaves)}
+
+
+def _relaxar_local(grafo, livres, moldura, pos, k, iteracoes, ancorados=(), ancora=ANCORA):
+    """Fruchterman-Reingold só sobre `livres`, com `moldura` parada
+
+    Repulsão e atração (nos dois sentidos) consideram apenas o subgrafo
+    livres + moldura; o passo é limitado por uma temperatura que começa em
+    k/2 e esfria linearmente. Nós em `ancorados` (já posicionados antes) são
+    puxados de volta à posição original por uma mola de rigidez `ancora`,
+    para que só se acomodem em vez de migrar.
+    """
+    import numpy as np
+    from ecossistema import forca
+
+    chaves = grafo.chaves
+    ids = sorted(livres | moldura)
+    xy = np.array([pos[chaves[i]] for i in ids], dtype=float)
+    origem, destino = _arestas(grafo, ids)
+    ancorados = set(ancorados)
+    xy = forca.layout_forca(
+        len(ids), origem, destino, pos=xy, k=k, iteracoes=iteracoes,
+        temperatura=0.5 * k, fixos=np.array([i in moldura for i in ids]),
+        ancorados=np.array([i in ancorados for i in ids]), ancora=ancora,
+        reescalar=False,
+    )
+    return {chaves[i]: (xy[n, 0], xy[n, 1]) for n, i in enumerate(ids) if i in livres}
+
+
+def layout_incremental(grafo, caminho_cache=None, k=2, iteracoes=50, seed=42):
+    """Posições {chave: (x, y)} reaproveitando o cache em `caminho_cache`"""
+    cache = carregar_cache(caminho_cache) if caminho_cache else {}
+    assin = assinaturas(grafo)
+    chaves = grafo.chaves
+
+    pos = {}
+    mudados = []
+    for i, chave in enumerate(chaves):
+        item = cache.get(chave)
+        if item is not None:
+            pos[chave] = (item[0], item[1])
+        if item is None or item[2] != assin[i]:
+            mudados.append(i)
+
+    if mudados and not pos:
+        # Sem cache aproveitável: layout completo
+        with rastro.intervalo("layout_completo", nos=len(chaves)):
+            pos = _layout_completo(grafo, k, iteracoes, seed)
+    elif mudados:
+        livres = set(mudados) | _vizinhos(grafo, mudados)
+        moldura = _vizinhos(grafo, livres) - livres
+        escala = _k_equilibrio(grafo, livres | moldura, pos) or 0.1
+        ancorados = [i for i in livres if chaves[i] in pos]
+
+        # Nós novos nascem no centro dos vizinhos já posicionados
+        rng = random.Random(seed)
+        for i in mudados:
+            if chaves[i] in pos:
+                continue
+            ancoras = [pos[chaves[j]] for j in _vizinhos(grafo, [i]) if chaves[j] in pos]
+            if ancoras:
+                cx = sum(p[0] for p in ancoras) / len(ancoras)
+                cy = sum(p[1] for p in ancoras) / len(ancoras)
+            else:
+                cx, cy = rng.uniform(-1, 1), rng.uniform(-1, 1)
+            pos[chaves[i]] = (cx + rng.uniform(-escala, escala),
+                              cy + rng.uniform(-escala, escala))
+
+        with rastro.intervalo("relaxar_local", livres=len(livres), moldura=len(moldura)):
+            pos.update(_relaxar_local(grafo, livres, moldura, pos, escala, iteracoes, ancorados))
+
+    if caminho_cache and (mudados or len(cache) != len(chaves)):
+        salvar_cache(caminho_cache, grafo, pos, assin)
+    return {chave: (float(pos[chave][0]), float(pos[chave][1])) for chave in chaves}
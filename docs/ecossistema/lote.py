@@ -0,0 +1,166 @@
+"""
+RENDERIZAÇÃO EM LOTE (MULTI-TENANT)
+===================================
+Gera os artefatos de vários clientes em paralelo, um processo por núcleo.
+Cada cliente é um JSON no formato de ECOSSISTEMA-INVISTTO.json (o mesmo
+exportado por ECOSSISTEMA-INVISTTO.py). Se o JSON tiver a chave "projetos"
+(formato de PROJETOS), o PNG do grafo também é gerado.
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.lote <dir-clientes> --out-dir <saida> [--workers N] [--force]
+
+Saída:
+    <saida>/<cliente>/ECOSSISTEMA-INVISTTO.html
+    <saida>/<cliente>/ECOSSISTEMA-INVISTTO.json
+    <saida>/<cliente>/DIAGRAMA-ECOSSISTEMA.png   (se houver "projetos")
+    <saida>/lote-tempos.json                     (tempos por cliente)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ecossistema import saida, scripts
+from ecossistema.build import ManifestoBuild, hash_entradas
+
+
+def _carregar_renderizadores():
+    """Carrega os scripts e compila os templates (uma vez por processo)"""
+    eco = scripts.carregar("ecossistema")
+    eco.compile_template(eco.HTML_TEMPLATE)
+    return eco
+
+
+def _renderizar_tenant(caminho, destino, forcar=False):
+    """Renderiza um cliente; devolve (nome, tempos por etapa, erro)
+
+    Artefatos cujas entradas não mudaram (ver ecossistema.build) são pulados
+    e não aparecem nos tempos. Cada arquivo é gravado por saida.abrir: um
+    cliente que falha no meio não deixa artefato truncado.
+    """
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    tempos = {}
+    try:
+        eco = _carregar_renderizadores()
+        os.makedirs(destino, exist_ok=True)
+
+        t = time.perf_counter()
+        data = eco.load_ecosystem_json(caminho)
+        # Validado antes de abrir qualquer artefato: o erro lista tudo de uma vez
+        validado = eco.validated(data)
+        chaves = eco.cache_keys(data)
+        manifesto = ManifestoBuild(destino, "ECOSSISTEMA-INVISTTO", forcar)
+        tempos["load"] = time.perf_counter() - t
+
+        html = os.path.join(destino, eco.HTML_FILENAME)
+        if not manifesto.atualizado(eco.HTML_FILENAME, chaves[eco.HTML_FILENAME], html):
+            t = time.perf_counter()
+            with saida.abrir(html) as f:
+                eco.write_html(validado, f)
+            manifesto.registrar(eco.HTML_FILENAME, chaves[eco.HTML_FILENAME])
+            tempos["html"] = time.perf_counter() - t
+
+        saida_json = os.path.join(destino, eco.JSON_FILENAME)
+        if not manifesto.atualizado(eco.JSON_FILENAME, chaves[eco.JSON_FILENAME], saida_json):
+            t = time.perf_counter()
+            with saida.abrir(saida_json) as f:
+                eco.write_json(data, f)
+            manifesto.registrar(eco.JSON_FILENAME, chaves[eco.JSON_FILENAME])
+            tempos["json"] = time.perf_counter() - t
+        manifesto.salvar()
+
+        if data.get("projetos"):
+            diagrama = scripts.carregar("diagrama")
+            manifesto = ManifestoBuild(destino, "DIAGRAMA-ECOSSISTEMA", forcar)
+            png = os.path.join(destino, diagrama.PNG_ARQUIVO)
+            chave = hash_entradas("png", diagrama.GERADOR_VERSAO, data["projetos"])
+            if not manifesto.atualizado(diagrama.PNG_ARQUIVO, chave, png):
+                # Checado antes de abrir o destino, como no --png do gerador
+                if not diagrama.dependencias_png():
+                    return nome, tempos, "PNG exige matplotlib/numpy (pip install matplotlib numpy)"
+                t = time.perf_counter()
+                grafo = diagrama.compilar_grafo(data["projetos"])
+                cache = os.path.join(destino, diagrama.CACHE_ARQUIVO)
+                with saida.abrir(png, binario=True) as f:
+                    diagrama.gerar_png_estatico(grafo, f, caminho_cache=cache)
+                manifesto.registrar(diagrama.PNG_ARQUIVO, chave)
+                manifesto.salvar()
+                tempos["png"] = time.perf_counter() - t
+    except Exception as e:
+        return nome, tempos, f"{type(e).__name__}: {e}"
+    return nome, tempos, None
+
+
+def renderizar_lote(dir_clientes, out_dir, workers=None, forcar=False):
+    """Renderiza todos os *.json de `dir_clientes`; devolve a lista de resultados"""
+    arquivos = sorted(
+        os.path.join(dir_clientes, nome)
+        for nome in os.listdir(dir_clientes)
+        if nome.endswith(".json")
+    )
+
+    # Templates e snippets compilados antes do fork: os workers herdam o
+    # cache já pronto (e o initializer garante o mesmo em spawn).
+    _carregar_renderizadores()
+
+    resultados = []
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_carregar_renderizadores) as pool:
+        futuros = {}
+        for caminho in arquivos:
+            nome = os.path.splitext(os.path.basename(caminho))[0]
+            futuros[pool.submit(_renderizar_tenant, caminho,
+                                os.path.join(out_dir, nome), forcar)] = nome
+        for futuro in as_completed(futuros):
+            resultados.append(futuro.result())
+
+    resultados.sort(key=lambda r: r[0])
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Renderiza o ecossistema de vários clientes em paralelo")
+    parser.add_argument("dir_clientes", help="diretório com um JSON por cliente")
+    parser.add_argument("--out-dir", required=True, help="diretório de saída")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="número de processos (padrão: núcleos da máquina)")
+    parser.add_argument("--force", action="store_true",
+                        help="regera tudo, ignorando o cache de build")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    resultados = renderizar_lote(args.dir_clientes, args.out_dir, args.workers, args.force)
+    total = time.perf_counter() - inicio
+
+    erros = 0
+    for nome, tempos, erro in resultados:
+        etapas = "  ".join(f"{etapa} {seg * 1000:7.1f}ms" for etapa, seg in tempos.items())
+        if erro:
+            erros += 1
+            print(f"❌ {nome:<24} {erro}")
+        else:
+            print(f"✅ {nome:<24} {etapas}")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    relatorio = os.path.join(args.out_dir, "lote-tempos.json")
+    with saida.abrir(relatorio) as f:
+        json.dump({
+            "total_s": total,
+            "clientes": [
+                {"cliente": nome, "tempos_s": tempos, "erro": erro}
+                for nome, tempos, erro in resultados
+            ],
+        }, f, indent=2, ensure_ascii=False)
+
+    print()
+    print(f"📦 {len(resultados)} clientes em {total:.2f}s ({erros} com erro)")
+    print(f"⏱️  Tempos: {relatorio}")
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""
+MODELO TIPADO DO ECOSSISTEMA (VALIDAÇÃO ÚNICA)
+==============================================
+Registros com __slots__ validados uma única vez, antes de qualquer
+renderização:
+
+    Projeto      nó de PROJETOS (DIAGRAMA-ECOSSISTEMA.py)
+    Aresta       "conecta" já resolvido em ids (destinos desconhecidos são
+                 ignorados, como sempre foram; repetidos contam uma vez);
+                 em ECOSYSTEM_DATA, ligação entre chaves deduzida dos
+                 dados (ver _ligacoes)
+    Servico      frontend, backend ou serviço de ECOSYSTEM_DATA
+    BancoDados   banco de ECOSYSTEM_DATA
+    Pacote       pacote compartilhado de ECOSYSTEM_DATA
+    Ambiente     sobreposição de portas de ECOSYSTEM_DATA["environments"]
+
+A validação percorre a entrada inteira e junta todos os problemas numa só
+ErroValidacao, em vez de parar no primeiro KeyError no meio do HTML. Os
+campos opcionais já saem com o valor padrão que os renderizadores usavam
+(`proj.get("porta", "")` vira `proj.porta`).
+"""
+
+import re
+
+COR = re.compile(r"^#(?:[0-9a-fA-F]{3}){1,2}$")
+PORTA_NO_TEXTO = re.compile(r"\b(\d{2,5})\b")
+
+
+class ErroValidacao(ValueError):
+    """Todos os problemas da entrada, coletados numa única passada"""
+
+    def __init__(self, erros):
+        self.erros = list(erros)
+        resumo = "; ".join(self.erros[:3])
+        if len(self.erros) > 3:
+            resumo += f"; ... (+{len(self.erros) - 3})"
+        super().__init__(f"{len(self.erros)} erro(s) de validação: {resumo}")
+
+
+# ==============================================================================
+# REGISTROS
+# ==============================================================================
+
+class _Registro:
+    __slots__ = ()
+
+    def __init__(self, **campos):
+        for nome in self.__slots__:
+            setattr(self, nome, campos[nome])
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.chave!r})"
+
+
+class Projeto(_Registro):
+    __slots__ = ("chave", "nome", "tipo", "porta", "path_prod", "descricao", "stack",
+                 "status", "cor")
+
+
+class Aresta:
+    """Dependência origem → destino (ids de Projeto ou chaves de ECOSYSTEM_DATA)"""
+
+    __slots__ = ("origem", "destino")
+
+    def __init__(self, origem, destino):
+        self.origem = origem
+        self.destino = destino
+
+
+class Servico(_Registro):
+    __slots__ = ("chave", "secao", "name", "description", "port", "tier", "host",
+                 "production_path", "platforms", "react_version", "state_management",
+                 "framework", "orm", "database", "endpoints", "endpoints_count", "schema")
+
+
+class BancoDados(_Registro):
+    __slots__ = ("chave", "name", "host", "port", "used_by")
+
+
+class Pacote(_Registro):
+    __slots__ = ("chave", "description", "exports")
+
+
+class Ambiente(_Registro):
+    # ports: {chave do serviço: (host ou None, porta ou "")}
+    __slots__ = ("chave", "host", "ports")
+
+
+class Ecossistema:
+    """ECOSYSTEM_DATA validado; `dados` é a entrada original (JSON, cache de build)"""
+
+    __slots__ = ("dados", "meta", "frontends", "backends", "services", "databases",
+                 "packages", "issues", "arestas", "ports_map", "environments")
+
+
+# ==============================================================================
+# VALIDADOR
+# ==============================================================================
+
+_TIPOS = {str: "texto", int: "inteiro", list: "lista", dict: "objeto"}
+
+
+class _Validador:
+    """Lê campos de dicts anotando cada problema em `erros` (nunca levanta)"""
+
+    def __init__(self):
+        self.erros = []
+
+    def erro(self, onde, mensagem):
+        self.erros.append(f"{onde}: {mensagem}")
+
+    def objeto(self, valor, onde):
+        if isinstance(valor, dict):
+            return True
+        self.erro(onde, f"esperado objeto, veio {type(valor).__name__}")
+        return False
+
+    def campo(self, dados, onde, nome, tipo=str, padrao=None, obrigatorio=False):
+        if nome not in dados or dados[nome] is None:
+            if obrigatorio:
+                self.erro(f"{onde}.{nome}", "campo obrigatório ausente")
+            return padrao
+        valor = dados[nome]
+        # bool é int para o Python, mas nunca é uma porta ou um total válido
+        if not isinstance(valor, tipo) or (tipo is int and isinstance(valor, bool)):
+            self.erro(f"{onde}.{nome}", f"esperado {_TIPOS[tipo]}, veio {valor!r}")
+            return padrao
+        return valor
+
+    def textos(self, dados, onde, nome, padrao=()):
+        valor = self.campo(dados, onde, nome, list, None)
+        if valor is None:
+            return tuple(padrao)
+        ruins = [v for v in valor if not isinstance(v, str)]
+        if ruins:
+            self.erro(f"{onde}.{nome}", f"esperada lista de textos, veio {ruins[0]!r}")
+        return tuple(v for v in valor if isinstance(v, str))
+
+    def porta(self, dados, onde, nome="porta", obrigatorio=False):
+        valor = dados.get(nome)
+        if valor is None or valor == "":
+            if obrigatorio:
+                self.erro(f"{onde}.{nome}", "campo obrigatório ausente")
+            return ""
+        if isinstance(valor, bool) or not isinstance(valor, int) or not 0 < valor < 65536:
+            self.erro(f"{onde}.{nome}", f"esperada porta entre 1 e 65535, veio {valor!r}")
+            return ""
+        return valor
+
+    def concluir(self):
+        if self.erros:
+            raise ErroValidacao(self.erros)
+
+
+# ==============================================================================
+# PROJETOS (DIAGRAMA)
+# ==============================================================================
+
+def validar_projetos(projetos):
+    """(chaves, [Projeto], [Aresta]) de um dict PROJETOS; ErroValidacao com tudo"""
+    v = _Validador()
+    chaves = list(projetos)
+    indice = {chave: i for i, chave in enumerate(chaves)}
+    registros = []
+    arestas = []
+    for i, chave in enumerate(chaves):
+        dados = projetos[chave]
+        onde = f"PROJETOS[{chave!r}]"
+        if not v.objeto(dados, onde):
+            continue
+        cor = v.campo(dados, onde, "cor", obrigatorio=True)
+        if cor and not COR.match(cor):
+            v.erro(f"{onde}.cor", f"esperada cor #rgb ou #rrggbb, veio {cor!r}")
+        registros.append(Projeto(
+            chave=chave,
+            nome=v.campo(dados, onde, "nome", obrigatorio=True),
+            tipo=v.campo(dados, onde, "tipo", obrigatorio=True),
+            porta=v.porta(dados, onde),
+            path_prod=v.campo(dados, onde, "path_prod", padrao=""),
+            descricao=v.campo(dados, onde, "descricao", obrigatorio=True),
+            stack=v.campo(dados, onde, "stack", padrao=""),
+            status=v.campo(dados, onde, "status", padrao=""),
+            cor=cor,
+        ))
+        # Alvo repetido conta uma vez (senão vira aresta dupla no grafo)
+        for alvo in dict.fromkeys(v.textos(dados, onde, "conecta")):
+            j = indice.get(alvo)
+            # Destinos fora de PROJETOS são ignorados (mesmo critério de antes)
+            if j is not None:
+                arestas.append(Aresta(i, j))
+    v.concluir()
+    return chaves, registros, arestas
+
+
+# ==============================================================================
+# ECOSYSTEM_DATA (ECOSSISTEMA-INVISTTO)
+# ==============================================================================
+
+# Campos que o card de cada seção exige
+OBRIGATORIOS = {
+    "frontends": ("react_version", "state_management"),
+    "backends": ("framework", "orm"),
+    "services": (),
+}
+
+# Camada das entradas que não definem "tier"
+TIER_SECAO = {"frontends": "frontend", "backends": "backend", "services": "service"}
+
+META = ("total_projects", "active_projects", "databases", "total_tables")
+ISSUES = ("critical", "warnings", "improvements")
+
+
+def _servicos(v, data, secao):
+    registros = []
+    entradas = v.campo(data, "ECOSYSTEM_DATA", secao, dict, {}, obrigatorio=True)
+    for chave, dados in entradas.items():
+        onde = f"{secao}[{chave!r}]"
+        if not v.objeto(dados, onde):
+            continue
+        extras = {nome: v.campo(dados, onde, nome, obrigatorio=True)
+                  for nome in OBRIGATORIOS[secao]}
+        for nome in ("react_version", "state_management", "framework", "orm"):
+            extras.setdefault(nome, v.campo(dados, onde, nome, padrao=""))
+        registros.append(Servico(
+            chave=chave,
+            secao=secao,
+            name=v.campo(dados, onde, "name", obrigatorio=True),
+            description=v.campo(dados, onde, "description", obrigatorio=True),
+            # Opcional: a varredura grava "" para pacote sem porta detectável
+            port=v.porta(dados, onde, "port"),
+            tier=v.campo(dados, onde, "tier", padrao=TIER_SECAO[secao]),
+            host=v.campo(dados, onde, "host"),
+            production_path=v.campo(dados, onde, "production_path", padrao="/"),
+            platforms=v.textos(dados, onde, "platforms", ("Web",)),
+            database=v.campo(dados, onde, "database", padrao="N/A"),
+            endpoints=v.textos(dados, onde, "endpoints"),
+            endpoints_count=v.campo(dados, onde, "endpoints_count", int, "N/A"),
+            schema=v.campo(dados, onde, "schema", dict),
+            **extras,
+        ))
+    return registros
+
+
+def validar_ecossistema(data):
+    """Ecossistema validado de um ECOSYSTEM_DATA; ErroValidacao com tudo"""
+    v = _Validador()
+    m = Ecossistema()
+    m.dados = data
+    if not v.objeto(data, "ECOSYSTEM_DATA"):
+        v.concluir()
+
+    meta = v.campo(data, "ECOSYSTEM_DATA", "meta", dict, {}, obrigatorio=True)
+    m.meta = {"generated_at": v.campo(meta, "meta", "generated_at", padrao="", obrigatorio=True)}
+    for nome in META:
+        m.meta[nome] = v.campo(meta, "meta", nome, int, 0, obrigatorio=True)
+
+    m.frontends = _servicos(v, data, "frontends")
+    m.backends = _servicos(v, data, "backends")
+    m.services = _servicos(v, data, "services")
+
+    m.databases = []
+    for chave, dados in v.campo(data, "ECOSYSTEM_DATA", "databases", dict, {},
+                                obrigatorio=True).items():
+        onde = f"databases[{chave!r}]"
+        if v.objeto(dados, onde):
+            m.databases.append(BancoDados(
+                chave=chave,
+                name=v.campo(dados, onde, "name", obrigatorio=True),
+                host=v.campo(dados, onde, "host", padrao=""),
+                port=v.porta(dados, onde, "port"),
+                used_by=v.textos(dados, onde, "used_by"),
+            ))
+
+    m.packages = []
+    for chave, dados in v.campo(data, "ECOSYSTEM_DATA", "shared_packages", dict, {},
+                                obrigatorio=True).items():
+        onde = f"shared_packages[{chave!r}]"
+        if v.objeto(dados, onde):
+            m.packages.append(Pacote(
+                chave=chave,
+                description=v.campo(dados, onde, "description", obrigatorio=True),
+                exports=v.textos(dados, onde, "exports"),
+            ))
+
+    issues = v.campo(data, "ECOSYSTEM_DATA", "standardization_issues", dict, {},
+                     obrigatorio=True)
+    m.issues = {}
+    for nivel in ISSUES:
+        m.issues[nivel] = []
+        for n, issue in enumerate(v.campo(issues, "standardization_issues", nivel, list, [],
+                                          obrigatorio=True)):
+            onde = f"standardization_issues.{nivel}[{n}]"
+            if v.objeto(issue, onde):
+                for nome in ("issue", "details", "recommendation"):
+                    v.campo(issue, onde, nome, obrigatorio=True)
+                m.issues[nivel].append(issue)
+
+    m.arestas = _ligacoes(v, data, m)
+
+    m.ports_map = {}
+    for porta, desc in v.campo(data, "ECOSYSTEM_DATA", "ports_map", dict, {}).items():
+        numerica = str(porta).isdigit()
+        if not numerica:
+            v.erro(f"ports_map[{porta!r}]", "esperada porta numérica")
+        if not isinstance(desc, str):
+            v.erro(f"ports_map[{porta!r}]", f"esperado texto, veio {desc!r}")
+        elif numerica:
+            # No JSON exportado as chaves voltam como texto
+            m.ports_map[int(porta)] = desc
+
+    m.environments = []
+    for chave, dados in v.campo(data, "ECOSYSTEM_DATA", "environments", dict, {}).items():
+        onde = f"environments[{chave!r}]"
+        if not v.objeto(dados, onde):
+            continue
+        ports = {}
+        for servico, valor in v.campo(dados, onde, "ports", dict, {}).items():
+            if isinstance(valor, dict):
+                onde_porta = f"{onde}.ports[{servico!r}]"
+                ports[servico] = (v.campo(valor, onde_porta, "host"),
+                                  v.porta(valor, onde_porta, "port"))
+            elif valor is not None:
+                ports[servico] = (None, v.porta(dados["ports"], f"{onde}.ports", servico))
+        m.environments.append(Ambiente(chave=chave, host=v.campo(dados, onde, "host"),
+                                       ports=ports))
+    v.concluir()
+    return m
+
+
+def _ligacoes(v, data, m):
+    """Arestas deduzidas de ECOSYSTEM_DATA, por junção de chaves e portas
+
+    frontend → camada auth (campo "auth"), frontend → backend (backend_port,
+    ou a porta citada em "backend"), serviço → integrates_with ("chave
+    (porta)") e usuário → banco (used_by). Alvos desconhecidos são ignorados.
+    """
+    conhecidas = {s.chave for s in m.frontends + m.backends + m.services}
+    conhecidas.update(db.chave for db in m.databases)
+    autenticacao = [s.chave for s in m.backends + m.services if s.tier == "auth"]
+    backend_da_porta = {}
+    for api in m.backends:
+        if api.port != "":
+            backend_da_porta.setdefault(api.port, api.chave)
+
+    arestas = []
+    vistas = set()
+
+    def ligar(origem, destino):
+        if destino in conhecidas and origem != destino and (origem, destino) not in vistas:
+            vistas.add((origem, destino))
+            arestas.append(Aresta(origem, destino))
+
+    for app in m.frontends:
+        dados = data["frontends"][app.chave]
+        onde = f"frontends[{app.chave!r}]"
+        if v.campo(dados, onde, "auth"):
+            for alvo in autenticacao:
+                ligar(app.chave, alvo)
+        porta = v.campo(dados, onde, "backend_port", int)
+        if porta is None:
+            achada = PORTA_NO_TEXTO.search(v.campo(dados, onde, "backend", padrao=""))
+            porta = achada and int(achada.group(1))
+        if porta in backend_da_porta:
+            ligar(app.chave, backend_da_porta[porta])
+    for svc in m.services:
+        onde = f"services[{svc.chave!r}]"
+        for alvo in v.textos(data["services"][svc.chave], onde, "integrates_with"):
+            ligar(svc.chave, alvo.split(" ", 1)[0])
+    for db in m.databases:
+        for usuario in db.used_by:
+            if usuario in conhecidas:
+                ligar(usuario, db.chave)
+    return arestas
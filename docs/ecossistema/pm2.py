@@ -0,0 +1,319 @@
+"""
+MÉTRICAS DE RUNTIME DO PM2
+==========================
+Lê snapshots salvos de `pm2 jlist` (ou o mesmo JSON indentado) e sobrepõe
+CPU, memória, reinícios e uptime de cada processo aos nós de PROJETOS:
+
+    entrada     arquivos ou diretórios; cada arquivo pode ter um snapshot
+                (JSON indentado) ou uma série, um `pm2 jlist` por linha:
+                    while sleep 10; do pm2 jlist >> pm2.jsonl; done
+    série       matrizes (snapshot × processo) de CPU, RSS e reinícios;
+                instâncias de um mesmo app (cluster) são somadas
+    redução     p50/p95/máximo de CPU e RSS com NumPy (nanpercentile), em
+                vetor sobre a série inteira; reinícios na janela pela
+                diferença do contador acumulado; uptime no último snapshot
+                (relativo ao mtime do arquivo)
+    cache       a série já colunar fica num .npz (assinatura: caminho,
+                tamanho e mtime de cada entrada); um dia de amostras a cada
+                10 s volta do cache sem parsear JSON
+    junção      nome do processo = chave do projeto; senão a porta
+                (pm2_env.PORT), desempatada pelo nome; senão a única chave
+                que começa com o nome
+
+Nos renderizadores o raio cresce com o RSS p95 e o preenchimento vai de
+verde a vermelho com a CPU p95; reinícios e uptime vão para o tooltip.
+
+Requer numpy. Execução (a partir de docs/):
+    python3 -m ecossistema.pm2 pm2.jsonl [snapshots/ ...]
+"""
+
+import argparse
+import json
+import os
+import sys
+import warnings
+
+CACHE_ARQUIVO = ".DIAGRAMA-ECOSSISTEMA.pm2.npz"
+VERSAO_CACHE = 1
+
+# Raio do nó: de 1x (sem RSS) a ESCALA_MAX (maior RSS p95), pela raiz
+ESCALA_MAX = 2.0
+
+# Cor pela CPU p95 (%): interpolada entre os pontos
+CORES_CPU = ((0.0, (0x22, 0xc5, 0x5e)), (50.0, (0xea, 0xb3, 0x08)), (100.0, (0xef, 0x44, 0x44)))
+
+MB = 1024 * 1024
+
+
+def _arquivos(caminhos):
+    """Arquivos de entrada na ordem dada (diretórios em ordem de nome)"""
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            for nome in sorted(os.listdir(caminho)):
+                if not nome.startswith("."):
+                    yield os.path.join(caminho, nome)
+        else:
+            yield caminho
+
+
+def _snapshots(caminho):
+    """Listas de processos do arquivo: uma por linha ou JSONs concatenados"""
+    with open(caminho, encoding="utf-8") as f:
+        primeira = f.readline()
+        try:
+            lista = json.loads(primeira) if primeira.strip() else None
+        except ValueError:
+            lista = None
+        if isinstance(lista, list):
+            # Série: um `pm2 jlist` por linha, sem carregar o arquivo inteiro
+            yield lista
+            for linha in f:
+                if linha.strip():
+                    yield json.loads(linha)
+            return
+        texto = primeira + f.read()
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        while pos < len(texto) and texto[pos].isspace():
+            pos += 1
+        if pos == len(texto):
+            return
+        lista, pos = decoder.raw_decode(texto, pos)
+        yield lista
+
+
+def _porta(env):
+    porta = env.get("PORT")
+    if porta is None:
+        porta = (env.get("env") or {}).get("PORT")
+    try:
+        return int(porta)
+    except (TypeError, ValueError):
+        return -1
+
+
+class Serie:
+    """Série colunar: linha = snapshot, coluna = app do PM2 (por nome)"""
+
+    __slots__ = ("nomes", "portas", "cpu", "memoria", "reinicios", "inicio", "status", "instante")
+
+    CAMPOS = __slots__
+
+
+def ler_serie(caminhos):
+    """Serie a partir dos arquivos (JSON → colunas, instâncias somadas)"""
+    import numpy as np
+
+    nomes = {}
+    portas = []
+    status = []
+    linhas, colunas, cpu, memoria, reinicios, inicio = [], [], [], [], [], []
+    n = 0
+    instante = 0.0
+    for caminho in _arquivos(caminhos):
+        instante = max(instante, os.stat(caminho).st_mtime)
+        for processos in _snapshots(caminho):
+            for p in processos:
+                env = p.get("pm2_env") or {}
+                monit = p.get("monit") or {}
+                nome = p.get("name") or env.get("name") or str(p.get("pm_id"))
+                j = nomes.get(nome)
+                if j is None:
+                    j = nomes[nome] = len(portas)
+                    portas.append(_porta(env))
+                    status.append("")
+                status[j] = env.get("status", "")
+                linhas.append(n)
+                colunas.append(j)
+                cpu.append(monit.get("cpu", np.nan))
+                memoria.append(monit.get("memory", np.nan))
+                reinicios.append(env.get("restart_time", np.nan))
+                inicio.append(env.get("pm_uptime", np.nan) if env.get("status") == "online" else np.nan)
+            n += 1
+
+    s = Serie()
+    s.nomes = np.array(list(nomes), dtype=str)
+    s.portas = np.array(portas, dtype=np.int64)
+    s.status = np.array(status, dtype=str)
+    s.instante = np.float64(instante)
+    forma = (n, len(portas))
+    idx = (np.array(linhas, dtype=np.int64), np.array(colunas, dtype=np.int64))
+    for campo, valores in (("cpu", cpu), ("memoria", memoria), ("reinicios", reinicios)):
+        matriz = np.zeros(forma)
+        presente = np.zeros(forma, dtype=bool)
+        np.add.at(matriz, idx, np.array(valores, dtype=float))
+        presente[idx] = True
+        matriz[~presente] = np.nan
+        setattr(s, campo, matriz)
+    # Início mais recente entre as instâncias (o uptime do app é o da mais nova)
+    s.inicio = np.full(forma, np.nan)
+    np.fmax.at(s.inicio, idx, np.array(inicio, dtype=float))
+    return s
+
+
+def _assinatura(caminhos):
+    partes = [VERSAO_CACHE]
+    for caminho in _arquivos(caminhos):
+        st = os.stat(caminho)
+        partes.append([os.path.abspath(caminho), st.st_size, st.st_mtime_ns])
+    return json.dumps(partes)
+
+
+def carregar(caminhos, cache=None):
+    """Serie dos snapshots, do cache .npz quando as entradas não mudaram"""
+    import numpy as np
+
+    assinatura = _assinatura(caminhos)
+    if cache:
+        try:
+            with np.load(cache) as dados:
+                if str(dados["assinatura"]) == assinatura:
+                    s = Serie()
+                    for campo in Serie.CAMPOS:
+                        setattr(s, campo, dados[campo])
+                    return s
+        except (OSError, ValueError, KeyError):
+            pass  # cache ausente, corrompido ou de outro formato: relê
+    s = ler_serie(caminhos)
+    if cache:
+        os.makedirs(os.path.dirname(cache) or ".", exist_ok=True)
+        tmp = cache + ".tmp.npz"
+        np.savez(tmp, assinatura=np.array(assinatura),
+                 **{campo: getattr(s, campo) for campo in Serie.CAMPOS})
+        os.replace(tmp, cache)
+    return s
+
+
+def reduzir(s):
+    """{nome do app: métricas} com percentis sobre a série inteira"""
+    import numpy as np
+
+    if not len(s.nomes):
+        return {}
+    amostras = np.sum(~np.isnan(s.memoria), axis=0)
+    with warnings.catch_warnings():
+        # Coluna só de NaN (app sem monit/restart_time) vira None, sem aviso
+        warnings.simplefilter("ignore", RuntimeWarning)
+        cpu = np.nanpercentile(s.cpu, [50, 95, 100], axis=0)
+        rss = np.nanpercentile(s.memoria, [50, 95, 100], axis=0) / MB
+        reinicios_janela = np.nanmax(s.reinicios, axis=0) - np.nanmin(s.reinicios, axis=0)
+    reinicios_total = _ultimo_valido(s.reinicios)
+    inicio = _ultimo_valido(s.inicio)
+    uptime = np.where(np.isnan(inicio), 0, np.maximum(s.instante - inicio / 1000, 0))
+
+    def numero(x, casas=1):
+        return None if np.isnan(x) else round(float(x), casas)
+
+    return {
+        str(nome): {
+            "porta": int(s.portas[j]) if s.portas[j] >= 0 else None,
+            "status": str(s.status[j]),
+            "amostras": int(amostras[j]),
+            "cpu_p50": numero(cpu[0, j]), "cpu_p95": numero(cpu[1, j]), "cpu_max": numero(cpu[2, j]),
+            "rss_p50_mb": numero(rss[0, j]), "rss_p95_mb": numero(rss[1, j]),
+            "rss_max_mb": numero(rss[2, j]),
+            "reinicios": None if np.isnan(reinicios_total[j]) else int(reinicios_total[j]),
+            "reinicios_janela": None if np.isnan(reinicios_janela[j]) else int(reinicios_janela[j]),
+            "uptime_s": int(uptime[j]),
+        }
+        for j, nome in enumerate(s.nomes)
+    }
+
+
+def _ultimo_valido(matriz):
+    """Último valor não-NaN de cada coluna (NaN se a coluna não tem nenhum)"""
+    import numpy as np
+
+    valido = ~np.isnan(matriz)
+    linha = matriz.shape[0] - 1 - np.argmax(valido[::-1], axis=0)
+    ultimo = matriz[linha, np.arange(matriz.shape[1])]
+    return np.where(valido.any(axis=0), ultimo, np.nan)
+
+
+def _projeto_do_processo(nome, porta, grafo, por_porta):
+    if nome in grafo.indice:
+        return nome
+    candidatos = por_porta.get(porta, [])
+    if len(candidatos) == 1:
+        return candidatos[0]
+    if candidatos:
+        # Porta compartilhada (ex.: 3002): o de maior prefixo comum com o nome
+        return max(candidatos, key=lambda chave: len(os.path.commonprefix([chave, nome])))
+    prefixados = [chave for chave in grafo.chaves if chave.startswith(nome)]
+    return prefixados[0] if len(prefixados) == 1 else None
+
+
+class Runtime:
+    """Métricas do PM2 juntadas aos nós: {chave: métricas} e os sem projeto"""
+
+    def __init__(self, grafo, apps):
+        self.nos = {}
+        self.sem_projeto = []
+        por_porta = {}
+        for chave, proj in zip(grafo.chaves, grafo.projetos):
+            if proj.porta != "":
+                por_porta.setdefault(proj.porta, []).append(chave)
+        # Nome exato primeiro; entre os demais, o de maior RSS fica com o nó
+        # quando dois apontam para o mesmo
+        ordem = sorted(apps.items(), key=lambda item: (item[0] not in grafo.indice,
+                                                       -(item[1]["rss_p95_mb"] or 0)))
+        for nome, m in ordem:
+            chave = _projeto_do_processo(nome, m["porta"], grafo, por_porta)
+            if chave is None or chave in self.nos:
+                self.sem_projeto.append(nome)
+            else:
+                self.nos[chave] = {"processo": nome, **m}
+
+    def escalas_nos(self):
+        """{chave: fator do raio} pela raiz do RSS p95"""
+        maximo = max((m["rss_p95_mb"] or 0 for m in self.nos.values()), default=0)
+        if not maximo:
+            return {}
+        return {chave: 1 + (ESCALA_MAX - 1) * ((m["rss_p95_mb"] or 0) / maximo) ** 0.5
+                for chave, m in self.nos.items()}
+
+    def cores_nos(self):
+        """{chave: cor hex} pela CPU p95 (apps sem CPU ficam de fora)"""
+        return {chave: cor_cpu(m["cpu_p95"]) for chave, m in self.nos.items()
+                if m["cpu_p95"] is not None}
+
+    def para_dict(self):
+        return {"nos": self.nos, "sem_projeto": sorted(self.sem_projeto)}
+
+
+def cor_cpu(cpu):
+    """Cor hex interpolada em CORES_CPU"""
+    for (x0, c0), (x1, c1) in zip(CORES_CPU, CORES_CPU[1:]):
+        if cpu <= x1:
+            t = max(cpu - x0, 0) / (x1 - x0)
+            return "#" + "".join(f"{round(a + (b - a) * t):02x}" for a, b in zip(c0, c1))
+    return "#" + "".join(f"{c:02x}" for c in CORES_CPU[-1][1])
+
+
+def ingerir(caminhos, grafo, cache=None):
+    """Runtime dos snapshots em `caminhos` sobre os nós de `grafo`"""
+    return Runtime(grafo, reduzir(carregar(caminhos, cache)))
+
+
+def main(argv=None):
+    from ecossistema import scripts
+
+    parser = argparse.ArgumentParser(description="Resume snapshots do PM2 por projeto")
+    parser.add_argument("snapshots", nargs="+", help="saídas de `pm2 jlist` (arquivos ou diretórios)")
+    parser.add_argument("--cache", default=None, help="cache .npz da série (padrão: nenhum)")
+    args = parser.parse_args(argv)
+
+    diagrama = scripts.carregar("diagrama")
+    runtime = ingerir(args.snapshots, diagrama.compilar_grafo(diagrama.PROJETOS), args.cache)
+    for chave, m in sorted(runtime.nos.items()):
+        print(f"  {chave:<24} {m['processo']:<20} CPU p95 {m['cpu_p95']}%  "
+              f"RSS p95 {m['rss_p95_mb']}MB  reinícios {m['reinicios']} "
+              f"(+{m['reinicios_janela']})  uptime {m['uptime_s']}s  [{m['status']}]")
+    if runtime.sem_projeto:
+        print(f"⚠️  Sem projeto: {', '.join(sorted(runtime.sem_projeto))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
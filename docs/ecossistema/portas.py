@@ -0,0 +1,182 @@
+"""
+ÍNDICE DE PORTAS (ALOCAÇÃO, CONFLITOS E FAIXAS LIVRES)
+======================================================
+Monta, a partir dos registros do ECOSYSTEM_DATA validado (ecossistema.modelo:
+frontends, backends, services, databases), o mapa (ambiente, host, porta)
+→ serviços, cada um com a sua camada (tier). ports_map continua aceito:
+portas que só aparecem nele entram como tier "unknown".
+
+Camada: o campo "tier" da entrada ou, na falta dele, a da seção
+(frontends → frontend, backends → backend, ...). Host: o campo "host" ou
+"localhost".
+
+Ambientes além do base vêm de ECOSYSTEM_DATA["environments"], como
+sobreposições ao base:
+
+    "environments": {
+        "staging": {"host": "stg01", "ports": {"invistto-auth": 13001,
+                                                "ari": {"port": 13010, "host": "stg02"}}}
+    }
+
+Serviços sem sobreposição mantêm a porta do base, no host do ambiente.
+
+    conflitos()          portas com mais de um serviço no mesmo host/ambiente, O(n)
+    livres(amb, host)    faixas livres entre as portas ocupadas (intervalos)
+    sugerir(amb, host)   primeira porta livre de uma faixa
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.portas ECOSSISTEMA-INVISTTO.json [--env AMBIENTE]
+                                  [--faixa 3000-3999]
+"""
+
+import argparse
+import bisect
+import json
+import sys
+
+from ecossistema import modelo
+
+BASE = "base"
+HOST_PADRAO = "localhost"
+
+TIERS = {
+    "frontends": "frontend",
+    "backends": "backend",
+    "services": "service",
+    "databases": "database",
+}
+
+FAIXA_PADRAO = (3000, 3999)
+
+
+class IndicePortas:
+    """(ambiente, host, porta) → [(serviço, tier)]"""
+
+    def __init__(self):
+        self.alocacoes = {}
+        # Portas ocupadas ordenadas por (ambiente, host), para as faixas livres
+        self._ocupadas = {}
+
+    def adicionar(self, ambiente, host, porta, servico, tier):
+        lista = self.alocacoes.setdefault((ambiente, host, porta), [])
+        if lista:
+            if any(s == servico for s, _ in lista):
+                return
+        else:
+            bisect.insort(self._ocupadas.setdefault((ambiente, host), []), porta)
+        lista.append((servico, tier))
+
+    def ambientes(self):
+        return sorted({ambiente for ambiente, _, _ in self.alocacoes})
+
+    def portas(self, ambiente=BASE):
+        """{(host, porta): [(serviço, tier)]} de um ambiente, ordenado"""
+        return {(host, porta): servicos
+                for (amb, host, porta), servicos in sorted(self.alocacoes.items(),
+                                                           key=lambda item: item[0][1:])
+                if amb == ambiente}
+
+    def servicos(self, porta, ambiente=BASE, host=HOST_PADRAO):
+        return [s for s, _ in self.alocacoes.get((ambiente, host, porta), ())]
+
+    def conflitos(self):
+        """[(ambiente, host, porta, [serviços])] com mais de um serviço"""
+        return [(ambiente, host, porta, [s for s, _ in servicos])
+                for (ambiente, host, porta), servicos in self.alocacoes.items()
+                if len(servicos) > 1]
+
+    def livres(self, ambiente=BASE, host=HOST_PADRAO, faixa=FAIXA_PADRAO):
+        """[(início, fim)] das portas livres dentro de `faixa` (inclusive)"""
+        inicio, fim = faixa
+        ocupadas = self._ocupadas.get((ambiente, host), [])
+        i = bisect.bisect_left(ocupadas, inicio)
+        faixas = []
+        atual = inicio
+        while i < len(ocupadas) and ocupadas[i] <= fim:
+            if ocupadas[i] > atual:
+                faixas.append((atual, ocupadas[i] - 1))
+            atual = ocupadas[i] + 1
+            i += 1
+        if atual <= fim:
+            faixas.append((atual, fim))
+        return faixas
+
+    def sugerir(self, ambiente=BASE, host=HOST_PADRAO, faixa=FAIXA_PADRAO, quantidade=1):
+        """As `quantidade` primeiras portas livres da faixa"""
+        portas = []
+        for a, b in self.livres(ambiente, host, faixa):
+            portas.extend(range(a, min(b, a + quantidade - len(portas) - 1) + 1))
+            if len(portas) >= quantidade:
+                break
+        return portas
+
+
+def indexar(m):
+    """IndicePortas de um Ecossistema validado (base + ambientes sobrepostos)"""
+    indice = IndicePortas()
+    registros = [(s, s.tier) for s in m.frontends + m.backends + m.services]
+    registros += [(db, TIERS["databases"]) for db in m.databases]
+    base = []
+    for registro, tier in registros:
+        if registro.port == "":
+            continue
+        item = (registro.chave, tier, registro.host or HOST_PADRAO, registro.port)
+        base.append(item)
+        indice.adicionar(BASE, item[2], item[3], item[0], tier)
+
+    # Portas só descritas em ports_map (texto livre)
+    for porta, desc in m.ports_map.items():
+        if (BASE, HOST_PADRAO, porta) not in indice.alocacoes:
+            indice.adicionar(BASE, HOST_PADRAO, porta, desc, "unknown")
+
+    for ambiente in m.environments:
+        host_ambiente = ambiente.host or HOST_PADRAO
+        for chave, tier, host, porta in base:
+            sobreposicao = ambiente.ports.get(chave)
+            if sobreposicao is not None:
+                host, porta = sobreposicao[0] or host_ambiente, sobreposicao[1] or porta
+            elif host == HOST_PADRAO:
+                host = host_ambiente
+            indice.adicionar(ambiente.chave, host, porta, chave, tier)
+    return indice
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Portas e conflitos de um ECOSSISTEMA-INVISTTO.json")
+    parser.add_argument("json", help="ECOSYSTEM_DATA exportado (--json)")
+    parser.add_argument("--env", default=None, help="só este ambiente (padrão: todos)")
+    parser.add_argument("--faixa", default=f"{FAIXA_PADRAO[0]}-{FAIXA_PADRAO[1]}",
+                        help="faixa das portas livres sugeridas (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+    try:
+        faixa = tuple(int(p) for p in args.faixa.split("-", 1))
+    except ValueError:
+        parser.error(f"faixa inválida: {args.faixa}")
+
+    with open(args.json, encoding="utf-8") as f:
+        try:
+            indice = indexar(modelo.validar_ecossistema(json.load(f)))
+        except modelo.ErroValidacao as e:
+            parser.error(str(e))
+
+    ambientes = [args.env] if args.env else indice.ambientes()
+    conflitos = 0
+    for ambiente in ambientes:
+        print(f"🌐 {ambiente}")
+        hosts = []
+        for (host, porta), servicos in indice.portas(ambiente).items():
+            if host not in hosts:
+                hosts.append(host)
+            marca = "⚠️ " if len(servicos) > 1 else "  "
+            conflitos += len(servicos) > 1
+            nomes = " / ".join(f"{s} ({t})" for s, t in servicos)
+            print(f"  {marca}{host}:{porta:<6} {nomes}")
+        for host in hosts:
+            faixas = ", ".join(f"{a}" if a == b else f"{a}-{b}"
+                               for a, b in indice.livres(ambiente, host, faixa)[:5])
+            print(f"  🟢 livres em {host}: {faixas or 'nenhuma'}")
+    return 1 if conflitos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
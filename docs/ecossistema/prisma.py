@@ -0,0 +1,273 @@
+"""
+PARSER DE schema.prisma (MODELOS, CAMPOS, RELAÇÕES)
+===================================================
+Lê o schema linha a linha, sem árvore sintática, e guarda o resultado em
+colunas (listas paralelas): um índice por modelo, um por campo e um por
+relação. É a mesma forma serializada no JSON (para_dict / de_dict), então
+o esquema vai do cache de varredura ao HTML sem conversões.
+
+    modelos / tabelas        nome do model e nome da tabela (@@map)
+    inicio_campos            campos do modelo m: inicio_campos[m]:inicio_campos[m+1]
+    campos / tipos / colunas nome, tipo (sem ? e []) e coluna (@map)
+    flags                    OPCIONAL | LISTA | ID | UNICO | RELACAO
+    rel_origem / rel_destino modelo com a FK → modelo referenciado
+    rel_campo / rel_fks      campo da relação e campos da FK ("a,b")
+
+Relações implícitas n-m (listas dos dois lados, sem @relation(fields))
+entram uma vez, com rel_fks vazio.
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.prisma <schema.prisma>   (erDiagram Mermaid no stdout)
+"""
+
+import argparse
+import re
+import sys
+import time
+
+OPCIONAL = 1
+LISTA = 2
+ID = 4
+UNICO = 8
+RELACAO = 16
+
+ESCALARES = {"String", "Boolean", "Int", "BigInt", "Float", "Decimal", "DateTime",
+             "Json", "Bytes", "Unsupported"}
+
+_RE_BLOCO = re.compile(r"(model|view|enum|type)\s+(\w+)\s*\{")
+_RE_MAP = re.compile(r"@map\(\s*(?:name\s*:\s*)?\"([^\"]*)\"")
+_RE_FIELDS = re.compile(r"\bfields\s*:\s*\[([^\]]*)\]")
+_RE_LISTA = re.compile(r"\[([^\]]*)\]")
+
+
+def _sem_comentario(linha):
+    """Corta `//` fora de strings"""
+    i = linha.find("//")
+    while i >= 0:
+        if linha.count('"', 0, i) % 2 == 0:
+            return linha[:i]
+        i = linha.find("//", i + 2)
+    return linha
+
+
+def _nomes(lista):
+    return [n.strip() for n in lista.split(",") if n.strip()]
+
+
+class EsquemaPrisma:
+    """Modelos, campos e relações de um schema.prisma em colunas"""
+
+    __slots__ = ("modelos", "tabelas", "inicio_campos", "campos", "tipos", "colunas",
+                 "flags", "rel_origem", "rel_destino", "rel_campo", "rel_fks")
+
+    def __init__(self):
+        self.modelos = []
+        self.tabelas = []
+        self.inicio_campos = [0]
+        self.campos = []
+        self.tipos = []
+        self.colunas = []
+        self.flags = []
+        self.rel_origem = []
+        self.rel_destino = []
+        self.rel_campo = []
+        self.rel_fks = []
+
+    def __len__(self):
+        return len(self.modelos)
+
+    def campos_de(self, m):
+        return range(self.inicio_campos[m], self.inicio_campos[m + 1])
+
+    def para_dict(self):
+        return {nome: getattr(self, nome) for nome in self.__slots__}
+
+    @classmethod
+    def de_dict(cls, dados):
+        esquema = cls()
+        for nome in cls.__slots__:
+            setattr(esquema, nome, dados[nome])
+        return esquema
+
+
+def analisar(linhas):
+    """EsquemaPrisma de um texto ou de um iterável de linhas (ex.: arquivo aberto)"""
+    if isinstance(linhas, str):
+        linhas = linhas.splitlines()
+    e = EsquemaPrisma()
+    # Atributos de campo que dependem dos nomes dos modelos (resolvidos no fim)
+    pendentes = []   # (campo, modelo, fks)
+    bloco = None
+    chaves_compostas = []
+
+    for linha in linhas:
+        if "//" in linha:
+            linha = _sem_comentario(linha)
+        linha = linha.strip()
+        if not linha:
+            continue
+
+        if bloco is None:
+            m = _RE_BLOCO.match(linha)
+            if m:
+                bloco = m.group(1)
+                if bloco in ("model", "view"):
+                    e.modelos.append(m.group(2))
+                    e.tabelas.append(m.group(2))
+                    chaves_compostas = []
+            continue
+
+        if linha[0] == "}":
+            if bloco in ("model", "view"):
+                inicio = e.inicio_campos[-1]
+                for nome in chaves_compostas:
+                    for c in range(inicio, len(e.campos)):
+                        if e.campos[c] == nome:
+                            e.flags[c] |= ID
+                e.inicio_campos.append(len(e.campos))
+            bloco = None
+            continue
+        if bloco not in ("model", "view"):
+            continue
+
+        if linha.startswith("@@"):
+            if linha.startswith("@@map"):
+                m = _RE_MAP.search(linha.replace("@@map", "@map", 1))
+                if m:
+                    e.tabelas[-1] = m.group(1)
+            elif linha.startswith("@@id"):
+                m = _RE_LISTA.search(linha)
+                if m:
+                    chaves_compostas = _nomes(m.group(1))
+            continue
+
+        partes = linha.split(None, 2)
+        if len(partes) < 2:
+            continue
+        nome, tipo = partes[0], partes[1]
+        atributos = partes[2] if len(partes) > 2 else ""
+        flags = 0
+        if tipo.endswith("?"):
+            flags |= OPCIONAL
+            tipo = tipo[:-1]
+        elif tipo.endswith("[]"):
+            flags |= LISTA
+            tipo = tipo[:-2]
+        if tipo.startswith("Unsupported("):
+            tipo = "Unsupported"
+        coluna = nome
+        if atributos:
+            if "@id" in atributos:
+                flags |= ID
+            if "@unique" in atributos:
+                flags |= UNICO
+            if "@map" in atributos:
+                m = _RE_MAP.search(atributos)
+                if m:
+                    coluna = m.group(1)
+        if tipo not in ESCALARES:
+            fks = ""
+            if "@relation" in atributos:
+                m = _RE_FIELDS.search(atributos)
+                if m:
+                    fks = ",".join(_nomes(m.group(1)))
+            pendentes.append((len(e.campos), len(e.modelos) - 1, fks))
+        e.campos.append(nome)
+        e.tipos.append(tipo)
+        e.colunas.append(coluna)
+        e.flags.append(flags)
+
+    _resolver_relacoes(e, pendentes)
+    return e
+
+
+def _resolver_relacoes(e, pendentes):
+    indice = {nome: m for m, nome in enumerate(e.modelos)}
+    relacoes = []
+    listas = {}      # (modelo, destino) → campos lista sem FK
+    for c, m, fks in pendentes:
+        destino = indice.get(e.tipos[c])
+        if destino is None:
+            # Enum ou tipo composto: não é relação
+            continue
+        e.flags[c] |= RELACAO
+        relacoes.append((c, m, destino, fks))
+        if e.flags[c] & LISTA and not fks:
+            listas.setdefault((m, destino), []).append(c)
+
+    for c, m, destino, fks in relacoes:
+        if not fks:
+            if not e.flags[c] & LISTA:
+                continue
+            # n-m implícita: listas nos dois lados, registrada uma única vez
+            outros = [o for o in listas.get((destino, m), ()) if o != c]
+            if not outros or (m, c) > (destino, outros[0]):
+                continue
+        e.rel_origem.append(m)
+        e.rel_destino.append(destino)
+        e.rel_campo.append(c)
+        e.rel_fks.append(fks)
+
+
+def carregar(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return analisar(f)
+
+
+# ==============================================================================
+# DIAGRAMA (MERMAID erDiagram)
+# ==============================================================================
+
+def _entidade(nome):
+    """Nome de tabela aceito pelo Mermaid (letras, dígitos, _ e -)"""
+    return re.sub(r"[^A-Za-z0-9_-]", "_", nome)
+
+
+def mermaid_er(esquema):
+    """(texto do erDiagram, tabelas sem relação) de um EsquemaPrisma
+
+    Tabelas com o nome do banco (@@map) e arestas rotuladas com as colunas
+    da FK (@map); a FK é 1-1 se for uma coluna só, com @unique ou @id.
+    """
+    linhas = ["erDiagram"]
+    com_relacao = set()
+    for origem, destino, c, fks in zip(esquema.rel_origem, esquema.rel_destino,
+                                      esquema.rel_campo, esquema.rel_fks):
+        filho = _entidade(esquema.tabelas[origem])
+        pai = _entidade(esquema.tabelas[destino])
+        com_relacao.update((origem, destino))
+        if not fks:
+            linhas.append(f'    {pai} }}o--o{{ {filho} : "{esquema.campos[c]}"')
+            continue
+        campos = {esquema.campos[f]: f for f in esquema.campos_de(origem)}
+        nomes = fks.split(",")
+        colunas = ",".join(esquema.colunas[campos[n]] if n in campos else n for n in nomes)
+        unica = False
+        if len(nomes) == 1 and nomes[0] in campos:
+            flags = esquema.flags[campos[nomes[0]]]
+            ids = sum(1 for f in campos.values() if esquema.flags[f] & ID)
+            unica = flags & UNICO or (flags & ID and ids == 1)
+        lado_pai = "|o" if esquema.flags[c] & OPCIONAL else "||"
+        lado_filho = "o|" if unica else "o{"
+        linhas.append(f'    {pai} {lado_pai}--{lado_filho} {filho} : "{colunas}"')
+    isoladas = [esquema.tabelas[m] for m in range(len(esquema)) if m not in com_relacao]
+    return "\n".join(linhas), isoladas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="erDiagram Mermaid de um schema.prisma")
+    parser.add_argument("schema", help="caminho do schema.prisma")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    esquema = carregar(args.schema)
+    diagrama, isoladas = mermaid_er(esquema)
+    print(diagrama)
+    print(f"🗄️  {len(esquema)} tabelas, {len(esquema.rel_origem)} relações "
+          f"({len(isoladas)} isoladas) em {(time.perf_counter() - inicio) * 1000:.1f}ms",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+RASTRO DE EXECUÇÃO (INTERVALOS POR ETAPA)
+=========================================
+Intervalos aninhados em volta das etapas e dos renderizadores dos
+geradores, exportados como trace events do Chrome (chrome://tracing,
+https://ui.perfetto.dev) ou no formato do speedscope
+(https://www.speedscope.app):
+
+    python3 DIAGRAMA-ECOSSISTEMA.py --trace rastro.json
+    python3 DIAGRAMA-ECOSSISTEMA.py --trace rastro.speedscope.json --trace-profile
+
+No código:
+
+    from ecossistema import rastro
+
+    with rastro.intervalo("layout", nos=len(grafo)):
+        ...
+
+Desligado (o padrão), intervalo() devolve um contexto nulo compartilhado:
+uma leitura de global por chamada, sem relógio nem alocação. Mesmo assim os
+intervalos ficam em volta de etapas, nunca dentro de laços por nó.
+
+Com --trace-profile cada etapa (intervalo logo abaixo da raiz da sessão)
+roda sob cProfile: as funções mais caras vão para os args do evento e o
+.pstats completo fica ao lado do trace (<trace>.<etapa>.pstats, para
+pstats ou snakeviz). O cProfile não aninha, então os intervalos internos
+são só cronometrados.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+FORMATOS = ("chrome", "speedscope")
+
+# Funções (por tempo acumulado) anexadas a cada etapa perfilada
+TOP_PERFIL = 15
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# Rastreador da sessão em curso; None = desligado
+_ativo = None
+
+
+class _Nulo:
+    """Contexto sem efeito devolvido com o rastro desligado"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULO = _Nulo()
+
+
+class Evento:
+    __slots__ = ("nome", "args", "inicio", "fim", "profundidade", "thread")
+
+    def __init__(self, nome, args, inicio, fim, profundidade, thread):
+        self.nome = nome
+        self.args = args
+        self.inicio = inicio
+        self.fim = fim
+        self.profundidade = profundidade
+        self.thread = thread
+
+
+class _Intervalo:
+    __slots__ = ("rastreador", "nome", "args", "inicio", "perfil")
+
+    def __init__(self, rastreador, nome, args):
+        self.rastreador = rastreador
+        self.nome = nome
+        self.args = args
+        self.perfil = None
+
+    def __enter__(self):
+        r = self.rastreador
+        pilha = r._pilha()
+        if r.perfil and len(pilha) == r.nivel_perfil:
+            import cProfile
+
+            self.perfil = cProfile.Profile()
+            try:
+                self.perfil.enable()
+            except ValueError:
+                # Outro profiler ativo (coverage, debugger): só cronometra
+                self.perfil = None
+        pilha.append(self)
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, tipo, erro, tb):
+        fim = time.perf_counter_ns()
+        if self.perfil is not None:
+            self.perfil.disable()
+        r = self.rastreador
+        pilha = r._pilha()
+        pilha.pop()
+        if tipo is not None:
+            self.args["erro"] = tipo.__name__
+        if self.perfil is not None:
+            self.args["perfil"] = _mais_caras(self.perfil)
+            r.perfis.append((self.nome, self.perfil))
+        r.eventos.append(Evento(self.nome, self.args, self.inicio, fim, len(pilha),
+                                threading.get_ident()))
+        return False
+
+
+class Rastreador:
+    """Intervalos concluídos de uma execução (tempos em ns de perf_counter)"""
+
+    def __init__(self, perfil=False, nivel_perfil=0):
+        self.perfil = perfil
+        self.nivel_perfil = nivel_perfil
+        self.eventos = []
+        self.perfis = []
+        self.origem = time.perf_counter_ns()
+        self._local = threading.local()
+
+    def _pilha(self):
+        pilha = getattr(self._local, "pilha", None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        return pilha
+
+    def _threads(self):
+        """Ident de cada thread → 1, 2, ... na ordem em que apareceram"""
+        numeros = {}
+        for e in sorted(self.eventos, key=lambda e: e.inicio):
+            numeros.setdefault(e.thread, len(numeros) + 1)
+        return numeros
+
+    def chrome(self, processo="ecossistema"):
+        """Trace events do Chrome: um evento completo ("X") por intervalo, em µs"""
+        pid = os.getpid()
+        threads = self._threads()
+        eventos = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                    "args": {"name": processo}}]
+        for e in sorted(self.eventos, key=lambda e: (e.inicio, -e.fim)):
+            eventos.append({
+                "name": e.nome, "cat": "etapa", "ph": "X", "pid": pid, "tid": threads[e.thread],
+                "ts": (e.inicio - self.origem) / 1000, "dur": (e.fim - e.inicio) / 1000,
+                "args": e.args,
+            })
+        return {"traceEvents": eventos, "displayTimeUnit": "ms"}
+
+    def speedscope(self, processo="ecossistema"):
+        """Perfil "evented" do speedscope por thread (abre/fecha cada intervalo)"""
+        frames, indices = [], {}
+        perfis = []
+        threads = self._threads()
+        for thread, numero in threads.items():
+            eventos = sorted((e for e in self.eventos if e.thread == thread),
+                             key=lambda e: (e.inicio, -e.fim))
+            marcas = []
+            abertos = []
+            for e in eventos:
+                while abertos and abertos[-1].fim <= e.inicio:
+                    fechado = abertos.pop()
+                    marcas.append({"type": "C", "frame": indices[fechado.nome],
+                                   "at": fechado.fim - self.origem})
+                if e.nome not in indices:
+                    indices[e.nome] = len(frames)
+                    frames.append({"name": e.nome})
+                marcas.append({"type": "O", "frame": indices[e.nome], "at": e.inicio - self.origem})
+                abertos.append(e)
+            while abertos:
+                fechado = abertos.pop()
+                marcas.append({"type": "C", "frame": indices[fechado.nome],
+                               "at": fechado.fim - self.origem})
+            perfis.append({
+                "type": "evented", "name": f"{processo} (thread {numero})",
+                "unit": "nanoseconds", "startValue": eventos[0].inicio - self.origem,
+                "endValue": max(e.fim for e in eventos) - self.origem, "events": marcas,
+            })
+        return {"$schema": SPEEDSCOPE_SCHEMA, "name": processo, "exporter": "ecossistema.rastro",
+                "activeProfileIndex": 0, "shared": {"frames": frames}, "profiles": perfis}
+
+    def gravar(self, caminho, formato=None, processo="ecossistema"):
+        """Grava o trace (e os .pstats das etapas perfiladas); devolve os caminhos"""
+        formato = formato or formato_de(caminho)
+        dados = self.speedscope(processo) if formato == "speedscope" else self.chrome(processo)
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+        gravados = [caminho]
+        base = caminho[:-len(".json")] if caminho.endswith(".json") else caminho
+        vistos = {}
+        for nome, perfil in self.perfis:
+            # A mesma etapa repetida (--watch) ganha um sufixo por execução
+            vistos[nome] = vistos.get(nome, 0) + 1
+            sufixo = f".{vistos[nome]}" if vistos[nome] > 1 else ""
+            destino = f"{base}.{nome}{sufixo}.pstats"
+            perfil.dump_stats(destino)
+            gravados.append(destino)
+        return gravados
+
+
+def _mais_caras(perfil):
+    """As TOP_PERFIL funções de maior tempo acumulado, já legíveis"""
+    import pstats
+
+    stats = pstats.Stats(perfil).stats
+    linhas = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_PERFIL]
+    return [{"funcao": pstats.func_std_string(funcao), "chamadas": chamadas,
+             "proprio_ms": round(proprio * 1000, 3), "acumulado_ms": round(acumulado * 1000, 3)}
+            for funcao, (_, chamadas, proprio, acumulado, _) in linhas]
+
+
+def formato_de(caminho):
+    """speedscope se o nome do arquivo o mencionar; senão Chrome"""
+    return "speedscope" if "speedscope" in os.path.basename(caminho) else "chrome"
+
+
+def intervalo(nome, **args):
+    """Contexto que registra `nome` (com `args`) no rastro ativo, se houver"""
+    r = _ativo
+    if r is None:
+        return _NULO
+    return _Intervalo(r, nome, args)
+
+
+def ativar(perfil=False, nivel_perfil=0):
+    global _ativo
+    _ativo = Rastreador(perfil, nivel_perfil)
+    return _ativo
+
+
+def desativar():
+    """Desliga o rastro e devolve o rastreador que estava ativo"""
+    global _ativo
+    r, _ativo = _ativo, None
+    return r
+
+
+@contextmanager
+def sessao(caminho, formato=None, perfil=False, processo="ecossistema", log=None):
+    """Rastreia o bloco num intervalo raiz `processo` e grava o trace ao sair
+
+    Sem `caminho` não faz nada. O trace é gravado mesmo se o bloco falhar.
+    """
+    if not caminho:
+        yield None
+        return
+    r = ativar(perfil, nivel_perfil=1)
+    try:
+        with intervalo(processo):
+            yield r
+    finally:
+        desativar()
+        for gravado in r.gravar(caminho, formato, processo):
+            print(f"🧭 Trace: {gravado}", file=log)
+
+
+def adicionar_opcoes(parser):
+    parser.add_argument("--trace", metavar="ARQUIVO", default=None,
+                        help="grava o tempo de cada etapa como trace do Chrome "
+                             "(speedscope se o nome contiver 'speedscope')")
+    parser.add_argument("--trace-format", choices=FORMATOS, default=None,
+                        help="formato do --trace (padrão: pelo nome do arquivo)")
+    parser.add_argument("--trace-profile", action="store_true",
+                        help="roda cada etapa sob cProfile (funções mais caras no trace, "
+                             ".pstats ao lado)")
+
+
+def validar(parser, args):
+    """Erro de uso para opções de trace sem --trace ou trace no stdout"""
+    if (args.trace_format or args.trace_profile) and not args.trace:
+        parser.error("--trace-format e --trace-profile exigem --trace")
+    if args.trace == "-":
+        parser.error("--trace grava um arquivo e não pode ir para o stdout")
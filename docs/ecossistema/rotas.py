@@ -0,0 +1,216 @@
+"""
+ÍNDICE DE ENDPOINTS (TRIE DE ROTAS)
+===================================
+Indexa os endpoints "MÉTODO /rota" de cada backend numa trie por segmento.
+Parâmetros (`:id`, `:baseId`) viram o mesmo segmento `:`, então
+`bases/:id/lojas` e `bases/:baseId/lojas` são a mesma rota.
+
+    dono("GET", "/bases/12/lojas")  a rota que responde o caminho em cada
+                                    serviço: a primeira declarada que casa,
+                                    como no Express (mesmo modelo das
+                                    sombreadas abaixo)
+    problemas()                     duplicadas (mesma rota duas vezes no
+                                    serviço), sombreadas (uma rota anterior do
+                                    serviço já casa todos os caminhos dela, como
+                                    `:id` antes de `stats` no Express; uma rota
+                                    ALL cobre todos os métodos) e
+                                    compartilhadas (a mesma rota em mais de um
+                                    serviço: o dono depende do proxy)
+    contagem()                      {serviço: nº de endpoints}
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.rotas ECOSSISTEMA-INVISTTO.json [MÉTODO CAMINHO]
+"""
+
+import argparse
+import json
+import sys
+
+from ecossistema import modelo
+
+PARAMETRO = ":"
+CURINGA = "*"
+
+
+def normalizar(rota):
+    """'/bases/:baseId/lojas/' → ('bases', ':', 'lojas')"""
+    segmentos = []
+    for seg in rota.strip("/").split("/"):
+        if not seg:
+            continue
+        if seg[0] == ":":
+            seg = PARAMETRO
+        elif "*" in seg:
+            seg = CURINGA
+        segmentos.append(seg)
+    return tuple(segmentos)
+
+
+def separar(endpoint):
+    """'POST /auth/login' → ('POST', '/auth/login')"""
+    metodo, _, rota = endpoint.strip().partition(" ")
+    return metodo.upper(), rota.strip() or "/"
+
+
+class _No:
+    __slots__ = ("filhos", "rotas")
+
+    def __init__(self):
+        self.filhos = {}
+        # {método: [(serviço, endpoint original, ordem no serviço)]}
+        self.rotas = {}
+
+
+class IndiceRotas:
+    """Trie de rotas de todos os serviços"""
+
+    def __init__(self):
+        self.raiz = _No()
+        self.por_servico = {}
+
+    def adicionar(self, servico, endpoint):
+        metodo, rota = separar(endpoint)
+        no = self.raiz
+        for seg in normalizar(rota):
+            filho = no.filhos.get(seg)
+            if filho is None:
+                filho = no.filhos[seg] = _No()
+            no = filho
+        lista = self.por_servico.setdefault(servico, [])
+        no.rotas.setdefault(metodo, []).append((servico, endpoint, len(lista)))
+        lista.append((metodo, rota))
+
+    def contagem(self):
+        return {servico: len(rotas) for servico, rotas in self.por_servico.items()}
+
+    def dono(self, metodo, caminho):
+        """[(serviço, endpoint)] que atendem `caminho`, um por serviço
+
+        Em cada serviço responde a primeira rota declarada que casa o
+        caminho, como no Express: `:id` declarado antes de `stats` fica com
+        `/stats` (e `stats` aparece em problemas() como sombreada).
+        """
+        metodo = metodo.upper()
+        segmentos = [s for s in caminho.split("?")[0].strip("/").split("/") if s]
+        achados = []
+        self._casar(self.raiz, segmentos, 0, metodo, achados)
+        primeira = {}
+        for servico, endpoint, ordem in achados:
+            if servico not in primeira or ordem < primeira[servico][1]:
+                primeira[servico] = (endpoint, ordem)
+        return [(servico, primeira[servico][0]) for servico in self.por_servico
+                if servico in primeira]
+
+    def _casar(self, no, segmentos, i, metodo, saida):
+        """Todas as rotas cujo template casa o caminho concreto `segmentos`"""
+        if i == len(segmentos):
+            saida.extend(no.rotas.get(metodo, ()))
+            saida.extend(no.rotas.get("ALL", ()))
+            return
+        resto = no.filhos.get(CURINGA)
+        if resto is not None:
+            saida.extend(resto.rotas.get(metodo, ()))
+            saida.extend(resto.rotas.get("ALL", ()))
+        for chave in dict.fromkeys((segmentos[i], PARAMETRO)):
+            filho = no.filhos.get(chave)
+            if filho is not None:
+                self._casar(filho, segmentos, i + 1, metodo, saida)
+
+    def _cobrem(self, no, segmentos, i, metodos, saida):
+        """Rotas (de `metodos`) cujo template casa todos os caminhos do template `segmentos`"""
+        if CURINGA in no.filhos:
+            for metodo in metodos:
+                saida.extend(no.filhos[CURINGA].rotas.get(metodo, ()))
+        if i == len(segmentos):
+            for metodo in metodos:
+                saida.extend(no.rotas.get(metodo, ()))
+            return
+        seg = segmentos[i]
+        if seg != PARAMETRO and seg in no.filhos:
+            self._cobrem(no.filhos[seg], segmentos, i + 1, metodos, saida)
+        if PARAMETRO in no.filhos:
+            self._cobrem(no.filhos[PARAMETRO], segmentos, i + 1, metodos, saida)
+
+    def problemas(self):
+        """{"duplicadas": [...], "sombreadas": [...], "compartilhadas": [...]}"""
+        duplicadas, sombreadas, compartilhadas = [], [], []
+        pilha = [self.raiz]
+        while pilha:
+            no = pilha.pop()
+            pilha.extend(no.filhos.values())
+            for metodo, rotas in no.rotas.items():
+                servicos = {}
+                for servico, endpoint, _ in rotas:
+                    servicos.setdefault(servico, []).append(endpoint)
+                for servico, endpoints in servicos.items():
+                    if len(endpoints) > 1:
+                        duplicadas.append({"service": servico, "endpoints": endpoints})
+                if len(servicos) > 1:
+                    compartilhadas.append({"endpoint": rotas[0][1], "services": sorted(servicos)})
+
+        for servico, rotas in self.por_servico.items():
+            for ordem, (metodo, rota) in enumerate(rotas):
+                # ALL casa todo método (como em dono()), mas só ALL cobre ALL
+                metodos = (metodo,) if metodo == "ALL" else (metodo, "ALL")
+                cobrem = []
+                self._cobrem(self.raiz, normalizar(rota), 0, metodos, cobrem)
+                antes = []
+                for s, endpoint, o in cobrem:
+                    outro_metodo, outra_rota = separar(endpoint)
+                    # A mesma rota no mesmo método é duplicada, não sombreada
+                    if s == servico and o < ordem and (outro_metodo, normalizar(outra_rota)) \
+                            != (metodo, normalizar(rota)):
+                        antes.append((o, endpoint))
+                if antes:
+                    sombreadas.append({"service": servico, "endpoint": f"{metodo} {rota}",
+                                       "shadowed_by": min(antes)[1]})
+
+        chave = lambda p: json.dumps(p, sort_keys=True)
+        return {"duplicadas": sorted(duplicadas, key=chave),
+                "sombreadas": sorted(sombreadas, key=chave),
+                "compartilhadas": sorted(compartilhadas, key=chave)}
+
+
+def indexar(backends):
+    """IndiceRotas dos `endpoints` de cada backend validado (modelo.Servico)"""
+    indice = IndiceRotas()
+    for api in backends:
+        for endpoint in api.endpoints:
+            indice.adicionar(api.chave, endpoint)
+    return indice
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Índice de endpoints de um ECOSSISTEMA-INVISTTO.json")
+    parser.add_argument("json", help="ECOSYSTEM_DATA exportado (--json)")
+    parser.add_argument("metodo", nargs="?", help="método HTTP da rota a procurar")
+    parser.add_argument("caminho", nargs="?", help="caminho concreto, ex.: /bases/12/lojas")
+    args = parser.parse_args(argv)
+    if (args.metodo is None) != (args.caminho is None):
+        parser.error("informe MÉTODO e CAMINHO juntos")
+
+    with open(args.json, encoding="utf-8") as f:
+        try:
+            indice = indexar(modelo.validar_ecossistema(json.load(f)).backends)
+        except modelo.ErroValidacao as e:
+            parser.error(str(e))
+
+    if args.metodo:
+        donos = indice.dono(args.metodo, args.caminho)
+        for servico, endpoint in donos:
+            print(f"{servico:<24} {endpoint}")
+        if not donos:
+            print(f"❓ Nenhum serviço atende {args.metodo.upper()} {args.caminho}")
+            return 1
+        return 0
+
+    for servico, total in sorted(indice.contagem().items()):
+        print(f"🔗 {servico:<24} {total} endpoints")
+    for tipo, lista in indice.problemas().items():
+        for problema in lista:
+            print(f"⚠️  {tipo}: {json.dumps(problema, ensure_ascii=False)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
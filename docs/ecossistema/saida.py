@@ -0,0 +1,101 @@
+"""
+DESTINOS DOS ARTEFATOS (MODO HEADLESS)
+======================================
+Cada seletor de artefato (--html, --png, --json) aceita um destino opcional:
+
+    --html            arquivo padrão dentro de --out-dir
+    --html caminho    esse arquivo
+    --html -          stdout (para encadear com outras ferramentas)
+
+Só um artefato pode ir para o stdout; nesse caso as mensagens de
+progresso vão para o stderr. --no-open evita abrir o navegador.
+
+Arquivos são escritos num temporário ao lado e só trocam de lugar
+(os.replace) se a escrita terminar: uma falha no meio mantém o artefato
+anterior em vez de deixar um arquivo truncado.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+STDOUT = "-"
+
+# Valor do seletor usado sem destino explícito
+PADRAO = ""
+
+
+def adicionar_seletor(parser, nome, ajuda):
+    """--<nome> [DESTINO]: None se ausente, PADRAO se sem valor"""
+    parser.add_argument(f"--{nome}", nargs="?", const=PADRAO, default=None,
+                        metavar="DESTINO", help=f"{ajuda} (DESTINO '-' = stdout)")
+
+
+def adicionar_opcoes(parser, out_dir):
+    parser.add_argument("--out-dir", default=out_dir,
+                        help=f"diretório dos artefatos (padrão: {out_dir})")
+    parser.add_argument("--no-open", action="store_true",
+                        help="não abre o navegador ao final (CI, lotes)")
+
+
+def destino(valor, out_dir, arquivo):
+    """Caminho final de um artefato ("-" para stdout)"""
+    if valor == PADRAO:
+        return os.path.join(out_dir, arquivo)
+    return valor
+
+
+def eh_stdout(caminho):
+    return caminho == STDOUT
+
+
+def validar(parser, destinos):
+    """Erro de uso se mais de um artefato for para o stdout"""
+    no_stdout = [nome for nome, caminho in destinos.items() if eh_stdout(caminho)]
+    if len(no_stdout) > 1:
+        parser.error(f"só um artefato pode ir para o stdout (pedidos: {', '.join(no_stdout)})")
+
+
+def artefato_manifesto(arquivo, caminho, out_dir):
+    """Nome do artefato no manifesto de build: o arquivo padrão ou o caminho absoluto"""
+    if caminho == os.path.join(out_dir, arquivo):
+        return arquivo
+    return os.path.abspath(caminho)
+
+
+def log(destinos):
+    """Stream das mensagens de progresso: stderr se algum artefato usa o stdout"""
+    if any(eh_stdout(caminho) for caminho in destinos.values()):
+        return sys.stderr
+    return sys.stdout
+
+
+@contextmanager
+def abrir(caminho, binario=False):
+    """Arquivo de saída para `caminho`; o stdout não é fechado ao final"""
+    if eh_stdout(caminho):
+        f = sys.stdout.buffer if binario else sys.stdout
+        yield f
+        f.flush()
+        return
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        with open(temporario, "wb" if binario else "w",
+                  **({} if binario else {"encoding": "utf-8"})) as f:
+            yield f
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def abrir_navegador(caminho, args):
+    """Abre o HTML gerado, exceto com --no-open ou se ele foi para o stdout"""
+    if args.no_open or caminho is None or eh_stdout(caminho):
+        return
+    import webbrowser
+    webbrowser.open(f"file://{os.path.abspath(caminho)}")
+
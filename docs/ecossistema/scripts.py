@@ -0,0 +1,43 @@
+"""
+CARREGAMENTO DOS SCRIPTS GERADORES
+==================================
+DIAGRAMA-ECOSSISTEMA.py e ECOSSISTEMA-INVISTTO.py têm hífen no nome e não
+podem ser importados com `import`. Este módulo os carrega pelo caminho,
+uma única vez por processo.
+"""
+
+import importlib.util
+import os
+import sys
+
+DOCS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = {
+    "diagrama": ("diagrama_ecossistema", "DIAGRAMA-ECOSSISTEMA.py"),
+    "ecossistema": ("ecossistema_invistto", "ECOSSISTEMA-INVISTTO.py"),
+}
+
+
+def carregar(nome):
+    """Módulo do script `nome` ("diagrama" ou "ecossistema")"""
+    modulo, arquivo = SCRIPTS[nome]
+    if modulo in sys.modules:
+        return sys.modules[modulo]
+
+    caminho = os.path.join(DOCS_DIR, arquivo)
+
+    # Se o próprio script é o __main__, reaproveita em vez de executar de novo
+    principal = sys.modules.get("__main__")
+    if os.path.abspath(getattr(principal, "__file__", "") or "") == caminho:
+        sys.modules[modulo] = principal
+        return principal
+
+    spec = importlib.util.spec_from_file_location(modulo, caminho)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[modulo] = mod
+    try:
+        spec.loader.exec_module(mod)
+    except BaseException:
+        del sys.modules[modulo]
+        raise
+    return mod
@@ -0,0 +1,202 @@
+"""
+ECOSSISTEMA SINTÉTICO (GERADOR COM SEMENTE)
+===========================================
+Entradas no formato de PROJETOS (DIAGRAMA-ECOSSISTEMA.py) e de
+ECOSYSTEM_DATA (ECOSSISTEMA-INVISTTO.py) com n nós, para medir os
+geradores em escala (ecossistema.bench). A mesma semente gera sempre a
+mesma entrada.
+
+Proporções por tipo próximas das do ecossistema real (MIX) e ligações com
+o formato que ele tem:
+
+    frontend   → a API de autenticação (uma só, como o invistto-auth) + o
+                 próprio backend (às vezes dois)
+    backend    → 1 a 2 bancos, escolhidos com peso de Zipf (poucos bancos
+                 concentram quase todos os usuários, como o MySQL principal);
+                 às vezes outro backend ou um serviço externo
+    serviço    → 1 a 3 backends ou serviços e um banco
+    banco, externo: sem saída
+
+Uso:
+    from ecossistema import sintetico
+    projetos = sintetico.projetos(10_000, seed=1)
+    data = sintetico.ecosystem_data(10_000, seed=1)
+"""
+
+import bisect
+import itertools
+import random
+from datetime import datetime
+
+# Fração dos nós por tipo (a soma é 1)
+MIX = (("frontend", 0.30), ("backend", 0.40), ("service", 0.10),
+       ("database", 0.10), ("external", 0.10))
+
+CORES = {"frontend": "#10b981", "backend": "#8b5cf6", "service": "#f59e0b",
+         "database": "#6366f1", "external": "#94a3b8"}
+
+PORTA_BASE = 3000
+
+
+class _Zipf:
+    """Escolha com peso 1/(posição + 1): os primeiros concentram o uso"""
+
+    def __init__(self, itens):
+        self.itens = itens
+        self.acumulado = list(itertools.accumulate(1 / (i + 1) for i in range(len(itens))))
+
+    def escolher(self, rnd):
+        x = rnd.random() * self.acumulado[-1]
+        return self.itens[min(bisect.bisect_left(self.acumulado, x), len(self.itens) - 1)]
+
+
+def _quantidades(n):
+    """Nós por tipo somando n (arredondamento vai para backend)"""
+    quantos = {tipo: int(n * fracao) for tipo, fracao in MIX}
+    quantos["backend"] += n - sum(quantos.values())
+    # Sempre ao menos um backend e um banco, para as ligações existirem
+    for tipo in ("database", "backend"):
+        if quantos[tipo] == 0 and n > 1:
+            maior = max(quantos, key=quantos.get)
+            quantos[maior] -= 1
+            quantos[tipo] += 1
+    return quantos
+
+
+def topologia(n, seed=0):
+    """(tipos {chave: tipo}, ligações {chave: [destinos]}) com n nós"""
+    rnd = random.Random(seed)
+    quantos = _quantidades(n)
+    chaves = {tipo: [f"{tipo}-{i}" for i in range(quantos[tipo])] for tipo, _ in MIX}
+    tipos = {chave: tipo for tipo, lista in chaves.items() for chave in lista}
+
+    backends = chaves["backend"]
+    # Autenticação centralizada: em ECOSYSTEM_DATA todo frontend com "auth"
+    # liga em toda API de tier auth, então mais de uma multiplica as arestas
+    autenticacao = backends[:1]
+    apis = backends[len(autenticacao):] or backends
+    bancos = _Zipf(chaves["database"]) if chaves["database"] else None
+    externos = chaves["external"]
+    chamaveis = backends + chaves["service"]
+
+    ligacoes = {chave: [] for chave in tipos}
+    for chave in chaves["frontend"]:
+        alvos = ligacoes[chave]
+        if autenticacao:
+            alvos.append(rnd.choice(autenticacao))
+        for _ in range(2 if rnd.random() < 0.2 else 1):
+            if apis:
+                alvos.append(rnd.choice(apis))
+    for chave in backends:
+        alvos = ligacoes[chave]
+        for _ in range(rnd.randint(1, 2)):
+            if bancos:
+                alvos.append(bancos.escolher(rnd))
+        if rnd.random() < 0.1 and len(backends) > 1:
+            alvos.append(rnd.choice(backends))
+        if rnd.random() < 0.1 and externos:
+            alvos.append(rnd.choice(externos))
+    for chave in chaves["service"]:
+        alvos = ligacoes[chave]
+        for _ in range(rnd.randint(1, 3)):
+            if chamaveis:
+                alvos.append(rnd.choice(chamaveis))
+        if bancos:
+            alvos.append(bancos.escolher(rnd))
+    for chave, alvos in ligacoes.items():
+        # Sem laços e sem repetição, na ordem sorteada
+        ligacoes[chave] = [a for a in dict.fromkeys(alvos) if a != chave]
+    return tipos, ligacoes
+
+
+def _porta(i):
+    return PORTA_BASE + i % 60000
+
+
+def projetos(n, seed=0):
+    """Dict no formato de PROJETOS com n nós"""
+    tipos, ligacoes = topologia(n, seed)
+    resultado = {}
+    for i, (chave, tipo) in enumerate(tipos.items()):
+        resultado[chave] = {
+            "nome": chave.replace("-", " ").title(),
+            "tipo": tipo,
+            "porta": _porta(i) if tipo != "external" else "",
+            "path_prod": f"/{chave}/" if tipo == "frontend" else "",
+            "descricao": f"{tipo} sintético {i}",
+            "stack": {"frontend": "React 19 + Vite", "backend": "NestJS 11",
+                      "service": "Express.js"}.get(tipo, ""),
+            "status": "ativo",
+            "conecta": ligacoes[chave],
+            "cor": CORES[tipo],
+        }
+    return resultado
+
+
+def ecosystem_data(n, seed=0):
+    """Dict no formato de ECOSYSTEM_DATA com n nós (externos viram serviços)"""
+    tipos, ligacoes = topologia(n, seed)
+    rnd = random.Random(seed + 1)
+    portas = {chave: _porta(i) for i, chave in enumerate(tipos)}
+    backends = [c for c, t in tipos.items() if t == "backend"]
+    autenticacao = set(backends[:1])
+
+    data = {
+        "meta": {"generated_at": datetime(2026, 1, 1).isoformat(), "total_projects": n,
+                 "active_projects": n, "databases": 0, "total_tables": 0},
+        "frontends": {}, "backends": {}, "services": {}, "shared_packages": {},
+        "databases": {},
+        "standardization_issues": {"critical": [], "warnings": [], "improvements": []},
+        "ports_map": {},
+    }
+    usuarios = {}
+    for chave, tipo in tipos.items():
+        porta = portas[chave]
+        base = {"name": chave.replace("-", " ").title(),
+                "description": f"{tipo} sintético", "port": porta}
+        alvos = ligacoes[chave]
+        if tipo == "frontend":
+            apis = [a for a in alvos if a not in autenticacao]
+            data["frontends"][chave] = {
+                **base, "production_path": f"/{chave}/",
+                "react_version": rnd.choice(("18.3.1", "19.1.0", "19.2.0")),
+                "state_management": "TanStack Query v5",
+                "auth": "@invistto/auth-react",
+                **({"backend_port": portas[apis[0]]} if apis else {}),
+            }
+        elif tipo == "backend":
+            recurso = chave.split("-")[-1]
+            data["backends"][chave] = {
+                **base, "framework": rnd.choice(("NestJS 10.x", "NestJS 11.x", "Express.js")),
+                "orm": rnd.choice(("Prisma", "TypeORM", "MySQL2 (raw queries)")),
+                **({"tier": "auth"} if chave in autenticacao else {}),
+                "endpoints": [f"GET /r{recurso}", f"GET /r{recurso}/:id", f"POST /r{recurso}"],
+            }
+        elif tipo in ("service", "external"):
+            data["services"][chave] = {
+                **base, "framework": "Express.js",
+                "integrates_with": [f"{a} ({portas[a]})" for a in alvos if tipos[a] != "database"],
+            }
+        elif tipo == "database":
+            data["databases"][chave] = {"name": base["name"], "host": "localhost", "port": porta,
+                                        "used_by": []}
+            data["meta"]["databases"] += 1
+            data["meta"]["total_tables"] += 10
+        for alvo in alvos:
+            if tipos[alvo] == "database":
+                usuarios.setdefault(alvo, []).append(chave)
+        data["ports_map"][porta] = chave
+    for banco, lista in usuarios.items():
+        data["databases"][banco]["used_by"] = lista
+
+    for i in range(max(2, n // 50)):
+        data["shared_packages"][f"@sintetico/pacote-{i}"] = {
+            "name": f"Pacote {i}", "description": "Pacote compartilhado sintético",
+            "exports": [f"Export{i}A", f"Export{i}B"],
+        }
+    for nivel, quantos in (("critical", 3), ("warnings", 5), ("improvements", 5)):
+        data["standardization_issues"][nivel] = [
+            {"issue": f"{nivel} {i}", "details": "sintético", "recommendation": "nenhuma"}
+            for i in range(quantos)
+        ]
+    return data
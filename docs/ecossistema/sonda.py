@@ -0,0 +1,218 @@
+"""
+SONDA DE SAÚDE (ASYNCIO)
+========================
+Verifica ao vivo cada nó com porta: todos ao mesmo tempo, limitados por um
+BoundedSemaphore, e cada verificação com prazo próprio. Uma varredura de
+500 alvos termina em cerca de um TIMEOUT_S, não em 500.
+
+    HTTP   frontends, backends e serviços: HEAD no path_prod (ou "/"), com
+           conexões keep-alive reaproveitadas por (host, porta)
+    TCP    os demais (bancos, externos): só a abertura da conexão
+
+Estado de cada nó:
+
+    ok         respondeu dentro de LENTO_MS
+    lento      respondeu, mas acima de LENTO_MS
+    degradado  HTTP 5xx ou resposta que não é HTTP
+    fora       recusou, não resolveu ou estourou o prazo
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.sonda [--host HOST] [--timeout S]   (nós de PROJETOS)
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+TIMEOUT_S = 1.0
+CONCORRENCIA = 512
+LENTO_MS = 300.0
+
+OK = "ok"
+LENTO = "lento"
+DEGRADADO = "degradado"
+FORA = "fora"
+
+CORES = {OK: "#22c55e", LENTO: "#eab308", DEGRADADO: "#f97316", FORA: "#ef4444"}
+
+TIPOS_HTTP = ("frontend", "backend", "service")
+
+
+class Alvo:
+    """O que sondar: caminho None = só TCP"""
+
+    __slots__ = ("chave", "host", "porta", "caminho")
+
+    def __init__(self, chave, host, porta, caminho=None):
+        self.chave = chave
+        self.host = host
+        self.porta = porta
+        self.caminho = caminho
+
+
+class Resultado:
+    __slots__ = ("estado", "latencia_ms", "codigo", "erro")
+
+    def __init__(self, estado, latencia_ms=None, codigo=None, erro=None):
+        self.estado = estado
+        self.latencia_ms = latencia_ms
+        self.codigo = codigo
+        self.erro = erro
+
+    @property
+    def cor(self):
+        return CORES[self.estado]
+
+    def para_dict(self):
+        return {"estado": self.estado,
+                "latencia_ms": None if self.latencia_ms is None else round(self.latencia_ms, 1),
+                "codigo": self.codigo, "erro": self.erro}
+
+
+class _Conexoes:
+    """Conexões keep-alive livres por (host, porta)"""
+
+    def __init__(self):
+        self.livres = {}
+
+    async def abrir(self, host, porta):
+        """(leitor, escritor, reaproveitada)"""
+        livres = self.livres.get((host, porta))
+        while livres:
+            leitor, escritor = livres.pop()
+            if not escritor.is_closing() and not leitor.at_eof():
+                return leitor, escritor, True
+            escritor.close()
+        leitor, escritor = await asyncio.open_connection(host, porta)
+        return leitor, escritor, False
+
+    def devolver(self, host, porta, leitor, escritor):
+        self.livres.setdefault((host, porta), []).append((leitor, escritor))
+
+    def fechar(self):
+        for livres in self.livres.values():
+            for _, escritor in livres:
+                escritor.close()
+        self.livres.clear()
+
+
+async def _head(leitor, escritor, host, caminho):
+    """(código HTTP, conexão pode ser reaproveitada)"""
+    escritor.write(f"HEAD {caminho} HTTP/1.1\r\nHost: {host}\r\n"
+                   f"User-Agent: ecossistema-sonda\r\nConnection: keep-alive\r\n\r\n".encode("latin1"))
+    await escritor.drain()
+    status = await leitor.readline()
+    if not status:
+        raise ConnectionResetError("conexão fechada sem resposta")
+    versao, codigo = status.split()[:2]
+    if not versao.startswith(b"HTTP/"):
+        raise ValueError("resposta não é HTTP")
+    manter = versao == b"HTTP/1.1"
+    while True:
+        linha = await leitor.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            break
+        nome, _, valor = linha.decode("latin1").partition(":")
+        if nome.strip().lower() == "connection":
+            manter = valor.strip().lower() != "close"
+    return int(codigo), manter
+
+
+async def _verificar(conexoes, alvo):
+    """Código HTTP (None no TCP); OSError/ValueError se falhar"""
+    for tentativa in range(2):
+        leitor, escritor, reaproveitada = await conexoes.abrir(alvo.host, alvo.porta)
+        if alvo.caminho is None:
+            escritor.close()
+            return None
+        try:
+            codigo, manter = await _head(leitor, escritor, alvo.host, alvo.caminho)
+        except (OSError, ValueError, IndexError):
+            escritor.close()
+            # O servidor pode ter fechado a conexão ociosa: tenta uma nova
+            if reaproveitada and tentativa == 0:
+                continue
+            raise
+        except BaseException:
+            escritor.close()
+            raise
+        if manter:
+            conexoes.devolver(alvo.host, alvo.porta, leitor, escritor)
+        else:
+            escritor.close()
+        return codigo
+
+
+async def _sondar(alvos, timeout, concorrencia, lento_ms):
+    limite = asyncio.BoundedSemaphore(concorrencia)
+    conexoes = _Conexoes()
+
+    async def um(alvo):
+        async with limite:
+            inicio = time.perf_counter()
+            try:
+                codigo = await asyncio.wait_for(_verificar(conexoes, alvo), timeout)
+            except asyncio.TimeoutError:
+                return Resultado(FORA, erro="timeout")
+            except (ValueError, IndexError) as e:
+                return Resultado(DEGRADADO, (time.perf_counter() - inicio) * 1000,
+                                 erro=str(e) or "resposta inválida")
+            except OSError as e:
+                return Resultado(FORA, erro=e.strerror or type(e).__name__)
+            ms = (time.perf_counter() - inicio) * 1000
+            if codigo is not None and codigo >= 500:
+                return Resultado(DEGRADADO, ms, codigo)
+            return Resultado(LENTO if ms > lento_ms else OK, ms, codigo)
+
+    try:
+        resultados = await asyncio.gather(*(um(alvo) for alvo in alvos))
+    finally:
+        conexoes.fechar()
+    return {alvo.chave: r for alvo, r in zip(alvos, resultados)}
+
+
+def sondar(alvos, timeout=TIMEOUT_S, concorrencia=CONCORRENCIA, lento_ms=LENTO_MS):
+    """{chave: Resultado} de todos os alvos, verificados ao mesmo tempo"""
+    return asyncio.run(_sondar(list(alvos), timeout, concorrencia, lento_ms))
+
+
+def alvos_do_grafo(grafo, host="localhost"):
+    """Um Alvo por Projeto com porta (HTTP nos TIPOS_HTTP, TCP nos demais)"""
+    return [Alvo(proj.chave, host, proj.porta,
+                 (proj.path_prod or "/") if proj.tipo in TIPOS_HTTP else None)
+            for proj in grafo.projetos if proj.porta != ""]
+
+
+def contagem(resultados):
+    total = {estado: 0 for estado in CORES}
+    for r in resultados.values():
+        total[r.estado] += 1
+    return total
+
+
+def main(argv=None):
+    from ecossistema import scripts
+
+    parser = argparse.ArgumentParser(description="Sonda ao vivo os nós de PROJETOS")
+    parser.add_argument("--host", default="localhost", help="host dos serviços (padrão: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT_S,
+                        help="prazo de cada verificação em segundos (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+
+    diagrama = scripts.carregar("diagrama")
+    grafo = diagrama.compilar_grafo(diagrama.PROJETOS)
+    inicio = time.perf_counter()
+    resultados = sondar(alvos_do_grafo(grafo, args.host), args.timeout)
+    for chave, r in resultados.items():
+        detalhe = f"{r.latencia_ms:.0f}ms" if r.latencia_ms is not None else r.erro
+        codigo = f" HTTP {r.codigo}" if r.codigo else ""
+        print(f"  {r.estado:<10} {chave:<24} {detalhe}{codigo}")
+    total = contagem(resultados)
+    print(f"📡 {len(resultados)} alvos em {time.perf_counter() - inicio:.2f}s: "
+          + ", ".join(f"{n} {estado}" for estado, n in total.items()))
+    return 1 if total[FORA] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+TEMPLATES PRÉ-COMPILADOS
+========================
+Compilador mínimo de templates HTML: o texto é analisado uma única vez em
+uma lista de trechos literais e slots, e cada renderização só preenche os
+slots. Slots usam a sintaxe {{nome}}; chaves simples de CSS/JS ficam
+literais, sem escape.
+
+Os templates compilados ficam em cache pelo hash do texto, então compilar
+o mesmo template de novo (outro tenant, outro processo do lote) não
+reanalisa nada.
+"""
+
+import hashlib
+import re
+
+_SLOT = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+_CACHE = {}
+
+
+def _slot(name):
+    def fill(context):
+        return str(context[name])
+    fill.slot_name = name
+    return fill
+
+
+class CompiledTemplate:
+    """Template já analisado: trechos literais (str) intercalados com slots"""
+
+    __slots__ = ("key", "chunks", "slots")
+
+    def __init__(self, key, chunks):
+        self.key = key
+        self.chunks = chunks
+        self.slots = tuple(c.slot_name for c in chunks if not isinstance(c, str))
+
+    def render(self, context):
+        """Preenche os slots com `context` (KeyError se faltar algum)"""
+        return "".join([c if c.__class__ is str else c(context) for c in self.chunks])
+
+    def render_to(self, write, context):
+        """Como render(), mas envia cada trecho para `write` (ex.: f.write)"""
+        for c in self.chunks:
+            write(c if c.__class__ is str else c(context))
+
+
+def template_key(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def compile_template(text):
+    """Compila `text` (ou devolve a versão em cache para o mesmo conteúdo)"""
+    key = template_key(text)
+    compiled = _CACHE.get(key)
+    if compiled is not None:
+        return compiled
+
+    chunks = []
+    pos = 0
+    for match in _SLOT.finditer(text):
+        if match.start() > pos:
+            chunks.append(text[pos:match.start()])
+        chunks.append(_slot(match.group(1)))
+        pos = match.end()
+    if pos < len(text):
+        chunks.append(text[pos:])
+
+    compiled = _CACHE[key] = CompiledTemplate(key, chunks)
+    return compiled
+
+
+def clear_cache():
+    _CACHE.clear()
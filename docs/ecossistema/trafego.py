@@ -0,0 +1,371 @@
+"""
+TRÁFEGO REAL A PARTIR DOS ACCESS LOGS DO NGINX
+==============================================
+Lê access logs de qualquer tamanho em uma passada e memória constante:
+arquivos comuns são mapeados com mmap (as páginas vêm do cache do sistema,
+nada é copiado para o heap) e .gz é detectado pelo cabeçalho e lido em
+stream. Cada linha passa por um tokenizador de bytes (find/split, sem regex
+nem decode) e só atualiza contadores:
+
+    por projeto  requisições, bytes e histograma do tempo de upstream em
+                 baldes logarítmicos de tamanho fixo (p50/p99 sem guardar
+                 amostras); req/s pelo intervalo entre a primeira e a
+                 última linha
+    por aresta   as mesmas métricas para frontend → upstream, quando a
+                 ligação existe no grafo
+
+Atribuição: o caminho da requisição casa com o path_prod mais longo
+("/admin/..." → admin-panel-frontend) e o $upstream_addr com a porta do
+projeto; portas repetidas (5173, 3002) são desempatadas pela ligação que o
+projeto do caminho já tem no grafo.
+
+Formato esperado (combined + três campos ao final; no combined puro só não
+há tempo nem upstream):
+
+    log_format ecossistema '$remote_addr - $remote_user [$time_local] '
+                           '"$request" $status $body_bytes_sent '
+                           '"$http_referer" "$http_user_agent" '
+                           '$request_time $upstream_response_time $upstream_addr';
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.trafego access.log [access.log.1.gz ...]
+"""
+
+import argparse
+import gzip
+import math
+import mmap
+import os
+import sys
+from array import array
+from datetime import datetime
+
+# Histograma: balde i cobre BASE_MS * 2**(i / POR_OITAVA) ms (~9% de largura)
+BASE_MS = 0.1
+POR_OITAVA = 8
+BALDES = 200
+
+# Renderizadores: peso = sqrt(requisições / máximo), em [0, 1]; a aresta
+# vai de LARGURA_ARESTA a + LARGURA_EXTRA e o raio do nó de 1x a ESCALA_MAX
+LARGURA_ARESTA = 1.5
+LARGURA_EXTRA = 6.0
+ESCALA_MAX = 2.0
+
+# Trecho do arquivo mapeado de cada vez (múltiplo de ALLOCATIONGRANULARITY)
+JANELA = 64 * 1024 * 1024
+
+_GZIP = b"\x1f\x8b"
+
+
+class Metricas:
+    """Contadores de um projeto ou aresta (tamanho fixo, qualquer volume)"""
+
+    __slots__ = ("requisicoes", "bytes", "com_tempo", "baldes")
+
+    def __init__(self):
+        self.requisicoes = 0
+        self.bytes = 0
+        self.com_tempo = 0
+        self.baldes = array("q", bytes(8 * BALDES))
+
+    def adicionar(self, nbytes, balde):
+        """Uma requisição; `balde` vem de balde(segundos), None sem tempo"""
+        self.requisicoes += 1
+        self.bytes += nbytes
+        if balde is not None:
+            self.baldes[balde] += 1
+            self.com_tempo += 1
+
+    def percentil(self, q):
+        """Tempo de upstream (ms) no quantil q, pelo limite do balde; None sem tempos"""
+        if not self.com_tempo:
+            return None
+        alvo = q * self.com_tempo
+        acumulado = 0
+        for i, n in enumerate(self.baldes):
+            acumulado += n
+            if acumulado >= alvo and n:
+                return BASE_MS * 2 ** (i / POR_OITAVA)
+        return BASE_MS * 2 ** ((BALDES - 1) / POR_OITAVA)
+
+    def para_dict(self, duracao):
+        p50, p99 = self.percentil(0.5), self.percentil(0.99)
+        return {
+            "requisicoes": self.requisicoes,
+            "req_s": round(self.requisicoes / duracao, 3) if duracao else None,
+            "bytes": self.bytes,
+            "p50_ms": None if p50 is None else round(p50, 1),
+            "p99_ms": None if p99 is None else round(p99, 1),
+        }
+
+
+class Trafego:
+    """Resultado da ingestão: métricas por chave de projeto e por aresta (ids)"""
+
+    def __init__(self, grafo):
+        self.grafo = grafo
+        self.nos = {}
+        self.arestas = {}
+        self.linhas = 0
+        self.ignoradas = 0
+        self.sem_projeto = 0
+        self.inicio = None
+        self.fim = None
+
+    @property
+    def duracao(self):
+        """Segundos entre a primeira e a última linha (0 se não houver)"""
+        if self.inicio is None:
+            return 0
+        return (self.fim - self.inicio).total_seconds()
+
+    def pesos_nos(self):
+        """{chave: peso em [0, 1]} pela raiz das requisições"""
+        return _pesos(self.nos)
+
+    def pesos_arestas(self):
+        """{(origem, destino): peso em [0, 1]} pela raiz das requisições"""
+        return _pesos(self.arestas)
+
+    def escalas_nos(self):
+        """{chave: fator do raio} para os renderizadores"""
+        return {chave: 1 + (ESCALA_MAX - 1) * p for chave, p in self.pesos_nos().items()}
+
+    def larguras_arestas(self):
+        """{(origem, destino): espessura} para os renderizadores"""
+        return {a: LARGURA_ARESTA + LARGURA_EXTRA * p for a, p in self.pesos_arestas().items()}
+
+    def para_dict(self):
+        """Forma serializável (JSON exportado e hash do cache de build)"""
+        chaves = self.grafo.chaves
+        return {
+            "linhas": self.linhas,
+            "ignoradas": self.ignoradas,
+            "sem_projeto": self.sem_projeto,
+            "inicio": self.inicio and self.inicio.isoformat(),
+            "fim": self.fim and self.fim.isoformat(),
+            "nos": {chave: m.para_dict(self.duracao) for chave, m in self.nos.items()},
+            "arestas": [{"origem": chaves[o], "destino": chaves[d], **m.para_dict(self.duracao)}
+                        for (o, d), m in self.arestas.items()],
+        }
+
+
+def balde(segundos):
+    """Índice do balde do histograma para um tempo em segundos"""
+    ms = segundos * 1000
+    if ms <= BASE_MS:
+        return 0
+    return min(int(math.log2(ms / BASE_MS) * POR_OITAVA) + 1, BALDES - 1)
+
+
+def _pesos(metricas):
+    maximo = max((m.requisicoes for m in metricas.values()), default=0)
+    if not maximo:
+        return {}
+    return {chave: math.sqrt(m.requisicoes / maximo) for chave, m in metricas.items()}
+
+
+def ler_linhas(caminho, janela=JANELA):
+    """Linhas (bytes) do log: mmap em janelas nos comuns, stream no gzip
+
+    Cada janela é desmapeada antes da próxima, então o residente fica em
+    `janela` bytes seja qual for o tamanho do arquivo.
+    """
+    with open(caminho, "rb") as f:
+        if f.read(2) == _GZIP:
+            f.seek(0)
+            with gzip.GzipFile(fileobj=f) as g:
+                yield from g
+            return
+        tamanho = os.fstat(f.fileno()).st_size
+        pos = 0
+        while pos < tamanho:
+            base = pos - pos % mmap.ALLOCATIONGRANULARITY
+            comprimento = min(janela, tamanho - base)
+            with mmap.mmap(f.fileno(), comprimento, offset=base, access=mmap.ACCESS_READ) as mapa:
+                if hasattr(mapa, "madvise"):
+                    mapa.madvise(mmap.MADV_SEQUENTIAL)
+                fim = comprimento
+                if base + comprimento < tamanho:
+                    # Termina na última quebra de linha; o resto vai para a próxima janela
+                    fim = mapa.rfind(b"\n", pos - base) + 1
+                    if fim <= 0:
+                        janela *= 2  # linha maior que a janela
+                        continue
+                mapa.seek(pos - base)
+                while mapa.tell() < fim:
+                    yield mapa.readline()
+            pos = base + fim
+
+
+def tokenizar(linha):
+    """(caminho, status, bytes, segundos de upstream, porta do upstream) ou None
+
+    Só bytes: a primeira aspa abre o request e a última fecha o user agent
+    (o nginx escapa aspas internas como \\x22); o resto é separado por espaço.
+    """
+    a = linha.find(b'"')
+    b = linha.find(b'"', a + 1)
+    if a < 0 or b < 0:
+        return None
+    request = linha[a + 1:b].split(b" ")
+    if len(request) != 3:
+        return None
+    s1 = linha.find(b" ", b + 2)
+    s2 = linha.find(b" ", s1 + 1)
+    try:
+        status = int(linha[b + 2:s1])
+        nbytes = linha[s1 + 1:s2] if s2 >= 0 else linha[s1 + 1:]
+        nbytes = int(nbytes) if nbytes != b"-" else 0
+    except ValueError:
+        return None
+
+    segundos = porta = None
+    fim_ua = linha.rfind(b'"')
+    if fim_ua > b:
+        # "$request_time $upstream_response_time $upstream_addr"; vários
+        # upstreams vêm como "a, b" ou "a : b" (redirecionamento interno)
+        cauda = linha[fim_ua + 1:].replace(b", ", b",").replace(b" : ", b",").split()
+        if len(cauda) >= 3:
+            tempos = [t for t in cauda[1].split(b",") if t != b"-"]
+            if tempos:
+                try:
+                    segundos = sum(map(float, tempos))
+                except ValueError:
+                    segundos = None
+            _, dois_pontos, numero = cauda[2].rpartition(b":")
+            if dois_pontos and numero.isdigit():
+                porta = int(numero)
+    return request[1], status, nbytes, segundos, porta
+
+
+def _carimbo(linha):
+    a = linha.find(b"[")
+    b = linha.find(b"]", a + 1)
+    if a < 0 or b < 0:
+        return None
+    try:
+        return datetime.strptime(linha[a + 1:b].decode("ascii"), "%d/%b/%Y:%H:%M:%S %z")
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+class _Atribuidor:
+    """Caminho → projeto (path_prod mais longo) e porta → projeto (ids)"""
+
+    def __init__(self, grafo):
+        self.grafo = grafo
+        self.prefixos = {}
+        self.portas = {}
+        for i, proj in enumerate(grafo.projetos):
+            if proj.path_prod:
+                self.prefixos.setdefault(proj.path_prod.encode("utf-8"), i)
+            if proj.porta != "":
+                self.portas.setdefault(proj.porta, []).append(i)
+        self.tamanhos = sorted({len(p) for p in self.prefixos}, reverse=True)
+        self.cache = {}
+
+    def por_caminho(self, caminho):
+        for n in self.tamanhos:
+            i = self.prefixos.get(caminho[:n])
+            if i is not None:
+                return i
+        return None
+
+    def por_porta(self, porta, origem):
+        """Projeto na porta; havendo vários, o que `origem` já liga no grafo"""
+        chave = (porta, origem)
+        if chave not in self.cache:
+            candidatos = self.portas.get(porta, ())
+            escolhido = candidatos[0] if candidatos else None
+            if len(candidatos) > 1 and origem is not None:
+                ligados = [c for c in candidatos
+                           if c == origem or c in self.grafo.sucessores(origem)]
+                if ligados:
+                    escolhido = ligados[-1]
+            self.cache[chave] = escolhido
+        return self.cache[chave]
+
+
+def ingerir(caminhos, grafo):
+    """Lê os logs (na ordem) e agrega o tráfego sobre os nós de `grafo`"""
+    t = Trafego(grafo)
+    atribuir = _Atribuidor(grafo)
+    chaves = grafo.chaves
+    ligadas = set(grafo.arestas())
+    nos, arestas = t.nos, t.arestas
+
+    for caminho in caminhos:
+        primeira = ultima = None
+        for linha in ler_linhas(caminho):
+            t.linhas += 1
+            campos = tokenizar(linha)
+            if campos is None:
+                t.ignoradas += 1
+                continue
+            if primeira is None:
+                primeira = linha
+            ultima = linha
+            url, _, nbytes, segundos, porta = campos
+
+            origem = atribuir.por_caminho(url)
+            destino = atribuir.por_porta(porta, origem) if porta is not None else None
+            if origem is None and destino is None:
+                t.sem_projeto += 1
+                continue
+            b = balde(segundos) if segundos is not None else None
+            for i in (origem, destino) if origem != destino else (origem,):
+                if i is None:
+                    continue
+                m = nos.get(chaves[i])
+                if m is None:
+                    m = nos[chaves[i]] = Metricas()
+                m.adicionar(nbytes, b)
+            if origem is not None and destino is not None and (origem, destino) in ligadas:
+                m = arestas.get((origem, destino))
+                if m is None:
+                    m = arestas[(origem, destino)] = Metricas()
+                m.adicionar(nbytes, b)
+
+        for carimbo in (primeira and _carimbo(primeira), ultima and _carimbo(ultima)):
+            if carimbo is not None:
+                t.inicio = carimbo if t.inicio is None else min(t.inicio, carimbo)
+                t.fim = carimbo if t.fim is None else max(t.fim, carimbo)
+    return t
+
+
+def _bytes_legiveis(n):
+    for unidade in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f}{unidade}"
+        n /= 1024
+    return f"{n:.1f}TB"
+
+
+def imprimir(t, saida=sys.stdout):
+    """Tabela por projeto, do mais requisitado ao menos"""
+    duracao = t.duracao
+    print(f"📈 {t.linhas} linhas ({t.ignoradas} ignoradas, {t.sem_projeto} sem projeto) "
+          f"em {duracao:.0f}s de log", file=saida)
+    for chave, m in sorted(t.nos.items(), key=lambda item: -item[1].requisicoes):
+        d = m.para_dict(duracao)
+        tempos = "" if d["p50_ms"] is None else f"  p50 {d['p50_ms']}ms  p99 {d['p99_ms']}ms"
+        taxa = "" if d["req_s"] is None else f"  {d['req_s']} req/s"
+        print(f"  {chave:<24} {m.requisicoes:>10}{taxa}  {_bytes_legiveis(m.bytes)}{tempos}",
+              file=saida)
+
+
+def main(argv=None):
+    from ecossistema import scripts
+
+    parser = argparse.ArgumentParser(description="Agrega access logs do nginx por projeto")
+    parser.add_argument("logs", nargs="+", help="access logs (texto ou .gz)")
+    args = parser.parse_args(argv)
+
+    diagrama = scripts.carregar("diagrama")
+    imprimir(ingerir(args.logs, diagrama.compilar_grafo(diagrama.PROJETOS)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,423 @@
+"""
+VARREDURA DO CÓDIGO-FONTE (ECOSYSTEM_DATA A PARTIR DOS REPOSITÓRIOS)
+====================================================================
+Percorre um diretório de trabalho com os repositórios do ecossistema e
+extrai, em paralelo (uma tarefa por pacote apps/* e packages/*):
+
+    - package.json        versões de React, NestJS, TanStack Query, axios, ORM
+    - prisma/schema.prisma modelos, campos e relações (ecossistema.prisma)
+    - *.controller.ts     endpoints (@Controller + @Get/@Post/...)
+    - ecosystem.config.js portas (env.PORT de cada app do PM2)
+    - vite.config.*       porta do dev server; main.ts: porta padrão da API
+    - src/index.ts        exports dos pacotes compartilhados
+
+Cada extrator recebe o texto de um arquivo e devolve fatos serializáveis
+em JSON; a montagem das entradas fica separada, para que os fatos possam
+ser cacheados por arquivo.
+
+A raiz pode ser um monorepo (com apps/ e packages/) ou um diretório com
+vários repositórios; um repositório sem apps/packages conta como um pacote.
+
+Execução (a partir de docs/):
+    python3 -m ecossistema.varredura <raiz> [--workers N] [--cache ARQUIVO]
+                                                            (JSON no stdout)
+    python3 ECOSSISTEMA-INVISTTO.py --scan <raiz>           (mescla e gera)
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ecossistema import prisma
+
+# Versão dos extratores: entra no cache de fatos (mudou um extrator, mude aqui)
+VERSAO_EXTRATORES = "2"
+
+IGNORAR = {"node_modules", "dist", "build", ".git", ".turbo", "coverage", ".next"}
+
+METODOS_HTTP = ("Get", "Post", "Put", "Patch", "Delete", "Options", "Head", "All")
+
+_RE_CONTROLLER = re.compile(r"@Controller\(\s*(?:['\"`]([^'\"`]*)['\"`])?[^)]*\)")
+_RE_ROTA = re.compile(r"@(%s)\(\s*(?:['\"`]([^'\"`]*)['\"`])?\s*\)" % "|".join(METODOS_HTTP))
+_RE_APP_PM2 = re.compile(r"\bname\s*:\s*['\"]([^'\"]+)['\"]")
+_RE_PORTA_ENV = re.compile(r"\bPORT\s*:\s*['\"]?(\d+)")
+_RE_PORTA_VITE = re.compile(r"\bport\s*:\s*(\d+)")
+_RE_PORTA_MAIN = re.compile(r"process\.env\.PORT\s*(?:\|\||\?\?)\s*['\"]?(\d+)")
+_RE_EXPORT_LISTA = re.compile(r"export\s+(?:type\s+)?\{([^}]*)\}")
+_RE_REEXPORT = re.compile(r"export\s+\*\s+(?:as\s+\w+\s+)?from\s+['\"](\.[^'\"]*)['\"]")
+_RE_EXPORT_DECL = re.compile(
+    r"export\s+(?:default\s+)?(?:abstract\s+)?(?:const|let|function|class|interface|type|enum)\s+(\w+)")
+
+
+# ==============================================================================
+# EXTRATORES (texto de um arquivo → fatos)
+# ==============================================================================
+
+def _versao(spec):
+    """'^18.2.0' → '18.2.0'; 'workspace:*' e afins ficam como estão"""
+    return spec.lstrip("^~>=< ") if spec else ""
+
+
+def extrair_package_json(texto):
+    dados = json.loads(texto)
+    deps = {**dados.get("devDependencies", {}), **dados.get("dependencies", {})}
+    return {
+        "name": dados.get("name", ""),
+        "description": dados.get("description", ""),
+        "dependencies": {nome: _versao(spec) for nome, spec in deps.items()},
+    }
+
+
+def extrair_controller(texto):
+    """Endpoints "MÉTODO /prefixo/rota" de um arquivo de controller Nest"""
+    endpoints = []
+    prefixo = ""
+    # Decorators na ordem do arquivo: cada @Controller define o prefixo
+    # das rotas seguintes
+    for m in re.finditer(r"%s|%s" % (_RE_CONTROLLER.pattern, _RE_ROTA.pattern), texto):
+        if m.group(0).startswith("@Controller"):
+            prefixo = (m.group(1) or "").strip("/")
+            continue
+        metodo, rota = m.group(2).upper(), (m.group(3) or "").strip("/")
+        caminho = "/".join(p for p in (prefixo, rota) if p)
+        endpoints.append(f"{metodo} /{caminho}")
+    return {"endpoints": endpoints}
+
+
+def extrair_prisma(texto):
+    esquema = prisma.analisar(texto)
+    return {"models": esquema.modelos, "schema": esquema.para_dict()}
+
+
+def extrair_ecosystem(texto):
+    """{app PM2: porta} de um ecosystem.config.js (env.PORT de cada app)"""
+    portas = {}
+    nomes = [(m.start(), m.group(1)) for m in _RE_APP_PM2.finditer(texto)]
+    for n, (inicio, nome) in enumerate(nomes):
+        fim = nomes[n + 1][0] if n + 1 < len(nomes) else len(texto)
+        m = _RE_PORTA_ENV.search(texto, inicio, fim)
+        if m:
+            portas[nome] = int(m.group(1))
+    return {"ports": portas}
+
+
+def extrair_vite(texto):
+    m = _RE_PORTA_VITE.search(texto)
+    return {"port": int(m.group(1)) if m else None}
+
+
+def extrair_main(texto):
+    m = _RE_PORTA_MAIN.search(texto)
+    return {"port": int(m.group(1)) if m else None}
+
+
+def extrair_exports(texto):
+    nomes = []
+    for m in _RE_EXPORT_LISTA.finditer(texto):
+        for parte in m.group(1).split(","):
+            nome = parte.split(" as ")[-1].strip()
+            if nome:
+                nomes.append(nome)
+    nomes.extend(_RE_EXPORT_DECL.findall(texto))
+    # `export * from './x'`: módulos relativos a seguir
+    return {"exports": list(dict.fromkeys(nomes)), "reexports": _RE_REEXPORT.findall(texto)}
+
+
+def aplicar_extrator(extrator, dados):
+    """Fatos do conteúdo (bytes) de um arquivo; None se não for legível"""
+    try:
+        return extrator(dados.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+def ler_fatos(caminho, extrator):
+    """Fatos de um arquivo; None se ele não existe ou não pôde ser lido"""
+    try:
+        with open(caminho, "rb") as f:
+            dados = f.read()
+    except OSError:
+        return None
+    return aplicar_extrator(extrator, dados)
+
+
+# ==============================================================================
+# DESCOBERTA
+# ==============================================================================
+
+def _subdirs(caminho):
+    try:
+        return sorted(e.path for e in os.scandir(caminho)
+                      if e.is_dir() and e.name not in IGNORAR and not e.name.startswith("."))
+    except OSError:
+        return []
+
+
+def descobrir_pacotes(raiz):
+    """[(repositório, pacote)] para apps/* e packages/* de cada repositório"""
+    raiz = os.path.abspath(raiz)
+    repos = [raiz] if _eh_monorepo(raiz) or os.path.exists(os.path.join(raiz, "package.json")) \
+        else _subdirs(raiz)
+    pacotes = []
+    for repo in repos:
+        if _eh_monorepo(repo):
+            for grupo in ("apps", "packages"):
+                pacotes.extend((repo, p) for p in _subdirs(os.path.join(repo, grupo))
+                               if os.path.exists(os.path.join(p, "package.json")))
+        elif os.path.exists(os.path.join(repo, "package.json")):
+            pacotes.append((repo, repo))
+    return pacotes
+
+
+def _eh_monorepo(caminho):
+    return any(os.path.isdir(os.path.join(caminho, g)) for g in ("apps", "packages"))
+
+
+def _arquivos(raiz, sufixo):
+    """Arquivos sob `raiz` terminados em `sufixo` (sem node_modules e afins)"""
+    pilha = [raiz]
+    while pilha:
+        try:
+            entradas = list(os.scandir(pilha.pop()))
+        except OSError:
+            continue
+        for e in entradas:
+            if e.is_dir(follow_symlinks=False):
+                if e.name not in IGNORAR:
+                    pilha.append(e.path)
+            elif e.name.endswith(sufixo):
+                yield e.path
+
+
+def _primeiro(pasta, nomes):
+    for nome in nomes:
+        caminho = os.path.join(pasta, nome)
+        if os.path.exists(caminho):
+            return caminho
+    return None
+
+
+# ==============================================================================
+# VARREDURA POR PACOTE
+# ==============================================================================
+
+def escanear_pacote(repo, pasta, ler=ler_fatos):
+    """Fatos brutos de um pacote (uma tarefa do pool)"""
+    fatos = {"repo": repo, "path": pasta,
+             "package": ler(os.path.join(pasta, "package.json"), extrair_package_json)}
+    if fatos["package"] is None:
+        return None
+
+    src = os.path.join(pasta, "src")
+    endpoints = []
+    for caminho in sorted(_arquivos(src, ".controller.ts")):
+        extraido = ler(caminho, extrair_controller)
+        if extraido:
+            endpoints.extend(extraido["endpoints"])
+    fatos["endpoints"] = endpoints
+
+    schema = _primeiro(pasta, ("prisma/schema.prisma", "schema.prisma"))
+    extraido = (ler(schema, extrair_prisma) or {}) if schema else {}
+    fatos["models"] = extraido.get("models", [])
+    fatos["schema"] = extraido.get("schema")
+
+    vite = _primeiro(pasta, ("vite.config.ts", "vite.config.js", "vite.config.mjs"))
+    main = _primeiro(pasta, ("src/main.ts", "src/main.js"))
+    fatos["dev_port"] = (ler(vite, extrair_vite) or {}).get("port") if vite else None
+    fatos["main_port"] = (ler(main, extrair_main) or {}).get("port") if main else None
+
+    indice = _primeiro(pasta, ("src/index.ts", "src/index.js", "index.ts", "index.js"))
+    fatos["exports"] = _exports(indice, ler) if indice else []
+    return fatos
+
+
+def _exports(indice, ler):
+    """Exports de `indice`, seguindo os `export * from` relativos"""
+    nomes = []
+    visitados = set()
+    pilha = [indice]
+    while pilha:
+        caminho = pilha.pop()
+        if caminho in visitados:
+            continue
+        visitados.add(caminho)
+        extraido = ler(caminho, extrair_exports)
+        if not extraido:
+            continue
+        nomes.extend(extraido["exports"])
+        base = os.path.dirname(caminho)
+        for modulo in reversed(extraido["reexports"]):
+            alvo = os.path.normpath(os.path.join(base, modulo))
+            if os.path.isdir(alvo):
+                resolvido = _primeiro(alvo, ("index.ts", "index.js"))
+            else:
+                resolvido = _primeiro(os.path.dirname(alvo), [os.path.basename(alvo) + ext
+                                                              for ext in (".ts", ".tsx", ".js")])
+            if resolvido:
+                pilha.append(resolvido)
+    return list(dict.fromkeys(nomes))
+
+
+def _portas_pm2(repo, ler=ler_fatos):
+    portas = {}
+    for nome in ("ecosystem.config.js", "ecosystem.production.config.js"):
+        extraido = ler(os.path.join(repo, nome), extrair_ecosystem)
+        if extraido:
+            for app, porta in extraido["ports"].items():
+                portas.setdefault(app, porta)
+    return portas
+
+
+# ==============================================================================
+# MONTAGEM DAS ENTRADAS
+# ==============================================================================
+
+def chave_pacote(nome):
+    """'@admin-panel/api' → 'admin-panel-api'"""
+    return nome.lstrip("@").replace("/", "-")
+
+
+def _orm(deps):
+    orms = [rotulo for dep, rotulo in (("@prisma/client", "Prisma"), ("typeorm", "TypeORM"),
+                                       ("knex", "Knex.js"), ("mysql2", "MySQL2"),
+                                       ("node-firebird", "Firebird"))
+            if dep in deps]
+    return " + ".join(orms) or "N/A"
+
+
+def _banco(deps):
+    bancos = [rotulo for dep, rotulo in (("pg", "PostgreSQL"), ("mysql2", "MySQL"),
+                                         ("node-firebird", "Firebird"), ("sqlite3", "SQLite"))
+              if dep in deps]
+    return " + ".join(bancos) or "N/A"
+
+
+def _porta_api(fatos, pm2):
+    """Porta do PM2 (pelo nome do app, ou a única do repositório) ou do main.ts"""
+    chave = chave_pacote(fatos["package"]["name"])
+    for app, porta in pm2.items():
+        if app == chave or chave.startswith(app + "-") or app.startswith(chave):
+            return porta
+    if len(pm2) == 1:
+        return next(iter(pm2.values()))
+    return fatos["main_port"]
+
+
+def montar_entrada(fatos, pm2):
+    """(seção de ECOSYSTEM_DATA, chave, entrada) para os fatos de um pacote"""
+    pkg = fatos["package"]
+    deps = pkg["dependencies"]
+    nome = pkg["name"] or os.path.basename(fatos["path"])
+    base = {"name": nome, "package": nome, "description": pkg["description"],
+            "location": os.path.relpath(fatos["path"], os.path.dirname(fatos["repo"]))}
+
+    if "react" in deps:
+        entrada = {
+            **base,
+            "port": fatos["dev_port"] or "",
+            "react_version": deps["react"],
+            "state_management": (f"TanStack Query v{deps['@tanstack/react-query']}"
+                                 if "@tanstack/react-query" in deps else "N/A"),
+            "ui_framework": "TailwindCSS" if "tailwindcss" in deps else "N/A",
+            "http_client": f"axios {deps['axios']}" if "axios" in deps else "fetch",
+        }
+        return "frontends", chave_pacote(nome), entrada
+
+    if "@nestjs/core" in deps or "express" in deps:
+        framework = (f"NestJS {deps['@nestjs/core'].split('.')[0]}.x"
+                     if "@nestjs/core" in deps else "Express.js")
+        entrada = {**base, "port": _porta_api(fatos, pm2) or "", "framework": framework,
+                   "orm": _orm(deps), "database": _banco(deps)}
+        if fatos["endpoints"]:
+            entrada["endpoints"] = fatos["endpoints"]
+        if fatos["models"]:
+            entrada["models"] = fatos["models"]
+            entrada["schema"] = fatos["schema"]
+        return "backends", chave_pacote(nome), entrada
+
+    return "shared_packages", nome, {**base, "exports": fatos["exports"]}
+
+
+def escanear(raiz, workers=None, ler=ler_fatos):
+    """ECOSYSTEM_DATA parcial (frontends, backends, shared_packages, ports_map)"""
+    pacotes = descobrir_pacotes(raiz)
+    repos = sorted({repo for repo, _ in pacotes})
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pm2 = dict(zip(repos, pool.map(lambda r: _portas_pm2(r, ler), repos)))
+        todos = list(pool.map(lambda rp: escanear_pacote(rp[0], rp[1], ler), pacotes))
+
+    dados = {"frontends": {}, "backends": {}, "shared_packages": {}, "ports_map": {}}
+    for fatos in todos:
+        if fatos is None:
+            continue
+        secao, chave, entrada = montar_entrada(fatos, pm2[fatos["repo"]])
+        dados[secao][chave] = entrada
+        if secao != "shared_packages" and entrada["port"]:
+            dados["ports_map"].setdefault(entrada["port"], []).append(chave)
+    dados["ports_map"] = {porta: " / ".join(chaves)
+                          for porta, chaves in sorted(dados["ports_map"].items())}
+    return dados
+
+
+def mesclar(base, escaneado):
+    """ECOSYSTEM_DATA com os fatos escaneados por cima dos dados manuais
+
+    Entradas são casadas pela chave ou pelo campo "package"; campos que só
+    existem à mão (descrição, features, ...) são mantidos. Descrições vazias
+    do package.json não apagam as manuais.
+    """
+    dados = {**base}
+    for secao in ("frontends", "backends", "shared_packages"):
+        atual = dict(base.get(secao, {}))
+        por_pacote = {v.get("package"): k for k, v in atual.items() if v.get("package")}
+        for chave, entrada in escaneado.get(secao, {}).items():
+            alvo = por_pacote.get(entrada["package"], chave)
+            existente = atual.get(alvo)
+            if existente is None:
+                atual[alvo] = entrada
+                continue
+            novo = {**existente, **{k: v for k, v in entrada.items() if v not in ("", None)}}
+            # Nome e descrição curados à mão têm precedência
+            novo["name"] = existente.get("name", novo["name"])
+            novo["description"] = existente.get("description") or novo["description"]
+            atual[alvo] = novo
+        dados[secao] = atual
+
+    portas = dict(base.get("ports_map", {}))
+    for porta, desc in escaneado.get("ports_map", {}).items():
+        portas.setdefault(porta, desc)
+    dados["ports_map"] = dict(sorted(portas.items()))
+    return dados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extrai ECOSYSTEM_DATA do código-fonte")
+    parser.add_argument("raiz", help="monorepo ou diretório com os repositórios")
+    parser.add_argument("--workers", type=int, default=None, help="threads (padrão: do Python)")
+    parser.add_argument("--cache", metavar="ARQUIVO",
+                        help="cache SQLite dos fatos por arquivo (só relê o que mudou)")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    if args.cache:
+        from ecossistema.cache_fatos import CacheFatos
+        cache = CacheFatos(args.cache)
+        dados = escanear(args.raiz, args.workers, cache.ler)
+        cache.salvar()
+        print(f"🗃️  {cache.extraidos} arquivos extraídos, {cache.reaproveitados} do cache",
+              file=sys.stderr)
+    else:
+        dados = escanear(args.raiz, args.workers)
+    total = sum(len(dados[s]) for s in ("frontends", "backends", "shared_packages"))
+    json.dump(dados, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+    print(f"🔎 {total} pacotes em {time.perf_counter() - inicio:.3f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())